@@ -1,4 +1,5 @@
-import re
+import re, os
+from joblib import Parallel, delayed, effective_n_jobs
 from xil_res.node import Node as nd
 from dataclasses import dataclass, field
 from typing import List, Set
@@ -23,48 +24,130 @@ class DeviceModel:
     name                    :   str     = field(default_factory=str)
 
 
-    def parse(self, viv_rpt_path):
-        self.set_name(viv_rpt_path)
-        with open(viv_rpt_path) as lines:
-            lines = filter(lambda x: x.startswith('R='), lines)
-            for line in lines:
-                line = line.rstrip('\n')
-                fields  = self.get_fields(line)
-                tile    = self.get_tile(fields)
-                self.tiles.add(tile)
-
-                if f'Name={cfg.HCS_tile_label}' in line:
-                    CR = self.get_CR(fields)
-                    if CR != '' and CR not in self.CR_HCS_Y_dict:
-                        self.CR_HCS_Y_dict[CR] = nd.get_y_coord(tile)
+    def parse(self, viv_rpt_path, n_jobs=1):
+        """This function parses the specified vivado report file in a single streaming pass
 
-        with open(viv_rpt_path) as lines:
-            lines = filter(self.is_clb_line, lines)
-            for line in lines:
-                line = line.rstrip('\n')
-                fields  = self.get_fields(line)
-                clb     = self.get_tile(fields)
-                site    = self.get_site(fields)
-                CR      = self.get_CR(fields)
-                self.clb_site_dict[clb] = site
-                self.update_dict(self.CR_tiles_dict, CR, nd.get_coordinate(clb))
+        :param viv_rpt_path: Path to the vivado report file
+        :type viv_rpt_path: str
+        :param n_jobs: Number of shards parsed in a process pool, defaults to 1
+        :type n_jobs: int, optional
+        """
+        # the pipjuncs of the INT pips are known before the wires are streamed, so that only valid wires are kept
+        self.pips = self.format_pips(self.extract_pips(self.get_pips_line(viv_rpt_path)))
+        self.set_pipjuncs()
 
-        with open(viv_rpt_path) as lines:
-            line = next(filter(lambda x: x.startswith('Pips=INT_X'), lines))
-            if not self.pips:
-                    pips = self.extract_pips(line)
-                    self.pips = self.format_pips(pips)
+        n_jobs = effective_n_jobs(n_jobs)
+        if n_jobs == 1:
+            shards = [self.parse_shard(viv_rpt_path, 0, None, self.pipjuncs)]
+        else:
+            bounds = self.get_shard_bounds(viv_rpt_path, n_jobs)
+            shards = Parallel(n_jobs=n_jobs)(delayed(self.parse_shard)(viv_rpt_path, start, end, self.pipjuncs) for start, end in bounds)
 
-        self.set_pipjuncs()
+        # shards are merged in file order, so that first occurrences win like in a sequential scan
+        for shard in shards:
+            self.merge_shard(shard)
+
+    @staticmethod
+    def get_pips_line(viv_rpt_path):
         with open(viv_rpt_path) as lines:
-            lines = filter(lambda x: x.startswith('Wire='), lines)
+            return next(line.rstrip('\n') for line in lines if line.startswith('Pips=INT_X'))
+
+    @classmethod
+    def parse_shard(cls, viv_rpt_path, start, end, pipjuncs):
+        """This function parses the lines beginning in the specified byte range of the vivado report file.
+        Wires are filtered while they are streamed.
+
+        :param viv_rpt_path: Path to the vivado report file
+        :type viv_rpt_path: str
+        :param start: Start byte offset (at a line beginning)
+        :type start: int
+        :param end: End byte offset (exclusive) or None for the end of file
+        :type end: int|None
+        :param pipjuncs: Ports of the INT pips
+        :type pipjuncs: Set[str]
+        :return: A partial device model
+        :rtype: DeviceModel
+        """
+        shard = cls()
+        shard.pipjuncs = pipjuncs
+        valid_tiles_pattern = re.compile(f'{cfg.INT_pattern.pattern}|{cfg.CLB_pattern.pattern}')
+
+        with open(viv_rpt_path, 'rb') as file:
+            file.seek(start)
+            position = start
+            for raw_line in file:
+                if end is not None and position >= end:
+                    break
+
+                position += len(raw_line)
+                line = raw_line.decode().rstrip('\n')
+                if line.startswith('Wire='):
+                    wire = shard.format_wire(line)
+                    if shard.has_valid_ends(wire, valid_tiles_pattern) and shard.has_valid_pipjuncs(wire):
+                        shard.add_wire(wire)
+
+                elif line.startswith('R='):
+                    shard.parse_tile_line(line)
+
+                elif not shard.name and line.startswith('Device'):
+                    shard.name = line.rstrip().split('=')[1].split('-')[0]
 
-            for line in lines:
-                wire = self.format_wire(line)
-                if self.valid_wire(wire):
-                    self.update_dict(self.wires_dict, nd.get_tile(wire[0]), wire)
-                    self.update_dict(self.wires_dict, nd.get_tile(wire[1]), wire)
+        # the pipjuncs are shared by all shards and need not be sent back
+        del shard.pipjuncs
+        return shard
 
+    def parse_tile_line(self, line):
+        fields  = self.get_fields(line)
+        tile    = self.get_tile(fields)
+        self.tiles.add(tile)
+
+        if f'Name={cfg.HCS_tile_label}' in line:
+            CR = self.get_CR(fields)
+            if CR != '' and CR not in self.CR_HCS_Y_dict:
+                self.CR_HCS_Y_dict[CR] = nd.get_y_coord(tile)
+
+        if self.is_clb_line(line):
+            site    = self.get_site(fields)
+            CR      = self.get_CR(fields)
+            self.clb_site_dict[tile] = site
+            self.update_dict(self.CR_tiles_dict, CR, nd.get_coordinate(tile))
+
+    def merge_shard(self, shard):
+        if not self.name:
+            self.name = shard.name
+
+        self.tiles.update(shard.tiles)
+        self.clb_site_dict.update(shard.clb_site_dict)
+        for CR, Y in shard.CR_HCS_Y_dict.items():
+            self.CR_HCS_Y_dict.setdefault(CR, Y)
+
+        for CR, coords in shard.CR_tiles_dict.items():
+            self.CR_tiles_dict.setdefault(CR, set()).update(coords)
+
+        for tile, wires in shard.wires_dict.items():
+            self.wires_dict.setdefault(tile, set()).update(wires)
+
+    @staticmethod
+    def get_shard_bounds(viv_rpt_path, n_shards):
+        """This function splits the vivado report file into byte ranges aligned to line beginnings
+
+        :param viv_rpt_path: Path to the vivado report file
+        :type viv_rpt_path: str
+        :param n_shards: Number of shards
+        :type n_shards: int
+        :return: List of (start, end) byte offsets
+        :rtype: List[Tuple[int, int]]
+        """
+        size = os.path.getsize(viv_rpt_path)
+        offsets = [0]
+        with open(viv_rpt_path, 'rb') as file:
+            for idx in range(1, n_shards):
+                file.seek(max(size * idx // n_shards - 1, offsets[-1]))
+                file.readline()
+                offsets.append(max(file.tell(), offsets[-1]))
+
+        offsets.append(size)
+        return [(start, end) for start, end in zip(offsets, offsets[1:]) if start < end]
 
     def set_name(self, viv_rpt_path):
         with open(viv_rpt_path) as lines:
@@ -97,20 +180,18 @@ class DeviceModel:
 
     def valid_wire(self, wire):
         valid_tiles_pattern = f'{cfg.INT_pattern.pattern}|{cfg.CLB_pattern.pattern}'
+        return self.has_valid_ends(wire, valid_tiles_pattern) and self.has_valid_pipjuncs(wire)
+
+    @staticmethod
+    def has_valid_ends(wire, valid_tiles_pattern):
         cond_valid_tile = all(map(lambda x: re.match(valid_tiles_pattern, nd.get_tile(x)), wire))
         cond_self_loop = wire[0] != wire[1]
-        cond_middle_wire = True
-        for node in wire:
-            if node.startswith(cfg.INT_label):
-                if nd.get_port(node) not in self.pipjuncs:
-                    cond_middle_wire = False
-                    break
+        cond_clb_port = all(nd.get_port(node).startswith(cfg.CLB_label) for node in wire if not node.startswith(cfg.INT_label))
 
-            elif not nd.get_port(node).startswith(cfg.CLB_label):
-                cond_middle_wire = False
-                break
+        return cond_valid_tile and cond_self_loop and cond_clb_port
 
-        return cond_valid_tile and cond_self_loop and cond_middle_wire
+    def has_valid_pipjuncs(self, wire):
+        return all(nd.get_port(node) in self.pipjuncs for node in wire if node.startswith(cfg.INT_label))
 
     @staticmethod
     def format_pips(pips):
@@ -135,8 +216,11 @@ class DeviceModel:
         else:
             dct[key].add(value)
 
+    def add_wire(self, wire):
+        self.update_dict(self.wires_dict, nd.get_tile(wire[0]), wire)
+        self.update_dict(self.wires_dict, nd.get_tile(wire[1]), wire)
+
     def func_1(self, line):
         wire = self.format_wire(line)
         if self.valid_wire(wire):
-            self.update_dict(self.wires_dict, nd.get_tile(wire[0]), wire)
-            self.update_dict(self.wires_dict, nd.get_tile(wire[1]), wire)
+            self.add_wire(wire)
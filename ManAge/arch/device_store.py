@@ -0,0 +1,369 @@
+import json, mmap
+from pathlib import Path
+from collections.abc import Mapping
+import numpy as np
+from xil_res.node import Node as nd
+
+class StringTable:
+    """
+    This class provides an interned, read-only table of names stored as a UTF-8 blob and an offsets array.
+    """
+    __slots__ = ('blob', 'offsets', '_index')
+    def __init__(self, blob, offsets):
+        self.blob       = blob
+        self.offsets    = offsets
+        self._index     = None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, idx: int) -> str:
+        return str(self.blob[int(self.offsets[idx]): int(self.offsets[idx + 1])], 'utf-8')
+
+    def __iter__(self):
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield str(self.blob[start: end], 'utf-8')
+
+    def index(self, name: str) -> int:
+        """This function returns the ID of the specified name
+
+        :param name: The interned name
+        :type name: str
+        :raises KeyError: When the name does not exist in the table
+        :return: ID of the name
+        :rtype: int
+        """
+        if self._index is None:
+            self._index = {value: idx for idx, value in enumerate(self)}
+
+        return self._index[name]
+
+    @staticmethod
+    def encode(names):
+        """This function encodes a sequence of names into a blob and an offsets array
+
+        :param names: Sequence of names
+        :type names: List[str]
+        :return: The blob and offsets arrays
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        encoded = [name.encode() for name in names]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(name) for name in encoded], out=offsets[1:])
+        blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+        return blob, offsets
+
+class WiresView(Mapping):
+    """
+    This class provides a lazy, read-only view of the wires dictionary (tile -> set of wires) of a DeviceStore.
+    Wires of a tile are decoded on first access and cached afterwards.
+    """
+    def __init__(self, store):
+        self.store  = store
+        self._cache = {}
+
+    def __getitem__(self, tile: str):
+        if tile not in self._cache:
+            self._cache[tile] = self.store.get_tile_wires(tile)
+
+        return self._cache[tile]
+
+    def __iter__(self):
+        return iter(self.store.get_wired_tiles())
+
+    def __len__(self):
+        return len(self.store.get_wired_tiles())
+
+    def __contains__(self, tile):
+        return tile in self.store.get_wired_tiles()
+
+    def __reduce__(self):
+        return (WiresView, (self.store, ))
+
+class DeviceStore:
+    """
+    This class provides the memory-mapped, integer-ID based device model.
+
+    The file consists of a JSON header followed by 64-byte aligned arrays:
+        - tile and port name tables (interned strings)
+        - nodes as (tile_id, port_id) pairs sorted by tile, with a tile -> node range CSR pointer
+        - wires as forward and reverse CSR adjacency arrays over node IDs
+        - the INT tile PIP template as a CSR adjacency array over port IDs
+    """
+    magic       = b'MANAGEDS'
+    version     = 1
+    extension   = '.dev'
+    alignment   = 64
+
+    def __init__(self, path):
+        self.path   = str(path)
+        self._file  = open(self.path, 'rb')
+        self._mm    = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.arrays = {}
+        self.meta   = {}
+        self._offsets = {}
+        self._wired_tiles = None
+        self._open()
+
+    def __repr__(self):
+        return f'DeviceStore(name={self.name}, path={self.path})'
+
+    def __reduce__(self):
+        # reopen the file in other processes, so that they share the mapped pages
+        return (DeviceStore, (self.path, ))
+
+    def _open(self):
+        if self._mm[: len(self.magic)] != self.magic:
+            raise ValueError(f'{self.path}: invalid device store file!')
+
+        offset = len(self.magic)
+        version, header_len = np.frombuffer(self._mm, dtype=np.uint64, count=2, offset=offset).tolist()
+        if version != self.version:
+            raise ValueError(f'{self.path}: unsupported device store version {version}!')
+
+        offset += 16
+        header = json.loads(self._mm[offset: offset + header_len].decode())
+        self.meta = header['meta']
+        for key, desc in header['arrays'].items():
+            self.arrays[key] = np.frombuffer(self._mm, dtype=np.dtype(desc['dtype']), count=desc['count'], offset=desc['offset'])
+            self._offsets[key] = desc['offset']
+
+        self.tile_names = StringTable(self._get_blob('tile_blob'), self.arrays['tile_offsets'])
+        self.port_names = StringTable(self._get_blob('port_blob'), self.arrays['port_offsets'])
+
+    def _get_blob(self, key):
+        desc = self.arrays[key]
+        start = self._offsets[key]
+        return memoryview(self._mm)[start: start + len(desc)]
+
+    ########## DeviceModel interface ##########
+    @property
+    def name(self) -> str:
+        return self.meta['name']
+
+    @property
+    def CR_tiles_dict(self) -> dict:
+        return {CR: set(coords) for CR, coords in self.meta['CR_tiles_dict'].items()}
+
+    @property
+    def CR_HCS_Y_dict(self) -> dict:
+        return self.meta['CR_HCS_Y_dict']
+
+    @property
+    def clb_site_dict(self) -> dict:
+        return self.meta['clb_site_dict']
+
+    @property
+    def tiles(self):
+        return set(self.tile_names)
+
+    @property
+    def pips(self):
+        return self.get_pip_template()
+
+    @property
+    def wires_dict(self):
+        return WiresView(self)
+
+    def __getattr__(self, item):
+        # the optional PIP sets of the interface tiles (pips_INTF_R, ...)
+        if item.startswith('pips_') and item in self.__dict__.get('meta', {}).get('extra_pips', {}):
+            return set(map(tuple, self.meta['extra_pips'][item]))
+
+        raise AttributeError(item)
+
+    ########## Decoding ##########
+    def get_node_name(self, node_id: int) -> str:
+        """This function returns the name of the specified node ID
+
+        :param node_id: Node ID
+        :type node_id: int
+        :return: Node name
+        :rtype: str
+        """
+        tile_id = int(self.arrays['node_tile'][node_id])
+        port_id = int(self.arrays['node_port'][node_id])
+        return f'{self.tile_names[tile_id]}/{self.port_names[port_id]}'
+
+    def get_node_range(self, tile: str):
+        """This function returns the range of node IDs within the specified tile
+
+        :param tile: Tile name
+        :type tile: str
+        :return: Range of node IDs
+        :rtype: range
+        """
+        try:
+            tile_id = self.tile_names.index(tile)
+        except KeyError:
+            return range(0)
+
+        ptr = self.arrays['tile_node_ptr']
+        return range(int(ptr[tile_id]), int(ptr[tile_id + 1]))
+
+    def get_wired_tiles(self):
+        """This function returns the tiles having at least one wire (keys of the wires dictionary)
+
+        :return: Tiles with wires
+        :rtype: List[str]
+        """
+        if self._wired_tiles is None:
+            ptr = self.arrays['tile_node_ptr']
+            wired_ids = np.flatnonzero(ptr[1:] > ptr[:-1]).tolist()
+            self._wired_tiles = dict.fromkeys(self.tile_names[tile_id] for tile_id in wired_ids)
+
+        return self._wired_tiles
+
+    def get_tile_wires(self, tile: str):
+        """This function decodes the wires whose either end is located in the specified tile
+
+        :param tile: Tile name
+        :type tile: str
+        :raises KeyError: When the tile has no wires
+        :return: A set of wires
+        :rtype: Set[Tuple[str, str]]
+        """
+        nodes = self.get_node_range(tile)
+        if not nodes:
+            raise KeyError(tile)
+
+        wire_ptr, wire_dst = self.arrays['wire_ptr'], self.arrays['wire_dst']
+        rev_ptr, rev_src = self.arrays['wire_rev_ptr'], self.arrays['wire_rev_src']
+        names = {}
+        get_name = lambda node_id: names[node_id] if node_id in names else names.setdefault(node_id, self.get_node_name(node_id))
+
+        wires = set()
+        for node_id in nodes:
+            for dst in wire_dst[wire_ptr[node_id]: wire_ptr[node_id + 1]].tolist():
+                wires.add((get_name(node_id), get_name(dst)))
+
+            for src in rev_src[rev_ptr[node_id]: rev_ptr[node_id + 1]].tolist():
+                wires.add((get_name(src), get_name(node_id)))
+
+        return wires
+
+    def get_pip_template(self):
+        """This function decodes the PIPs of INT tiles as a set of port pairs
+
+        :return: A set of PIPs (port names)
+        :rtype: Set[Tuple[str, str]]
+        """
+        pip_ptr, pip_dst = self.arrays['pip_ptr'].tolist(), self.arrays['pip_dst'].tolist()
+        ports = list(self.port_names)
+        return {(ports[u], ports[v]) for u in range(len(ports)) for v in pip_dst[pip_ptr[u]: pip_ptr[u + 1]]}
+
+    ########## Encoding ##########
+    @classmethod
+    def write(cls, device, store_path):
+        """This function writes the specified device model into the device store format
+
+        :param device: The parsed device model
+        :type device: DeviceModel
+        :param store_path: Path of the output file
+        :type store_path: str
+        """
+        wires = {wire for wires in device.wires_dict.values() for wire in wires}
+        nodes = {node for wire in wires for node in wire}
+
+        tiles = sorted(set(device.tiles) | {nd.get_tile(node) for node in nodes})
+        ports = sorted({port for pip in device.pips for port in pip} | {nd.get_port(node) for node in nodes})
+        tile_ids = {tile: idx for idx, tile in enumerate(tiles)}
+        port_ids = {port: idx for idx, port in enumerate(ports)}
+
+        # nodes sorted by tile, so that each tile owns a contiguous range of node IDs
+        nodes = sorted(nodes, key=lambda node: (tile_ids[nd.get_tile(node)], port_ids[nd.get_port(node)]))
+        node_ids = {node: idx for idx, node in enumerate(nodes)}
+        node_tile = np.array([tile_ids[nd.get_tile(node)] for node in nodes], dtype=np.int32)
+        node_port = np.array([port_ids[nd.get_port(node)] for node in nodes], dtype=np.int32)
+        tile_node_ptr = np.searchsorted(node_tile, np.arange(len(tiles) + 1), side='left').astype(np.int64)
+
+        wire_array = np.array([(node_ids[u], node_ids[v]) for u, v in wires], dtype=np.int32).reshape(-1, 2)
+        wire_ptr, wire_dst = cls.to_csr(wire_array[:, 0], wire_array[:, 1], len(nodes))
+        wire_rev_ptr, wire_rev_src = cls.to_csr(wire_array[:, 1], wire_array[:, 0], len(nodes))
+
+        pip_array = np.array([(port_ids[u], port_ids[v]) for u, v in device.pips], dtype=np.int32).reshape(-1, 2)
+        pip_ptr, pip_dst = cls.to_csr(pip_array[:, 0], pip_array[:, 1], len(ports))
+
+        tile_blob, tile_offsets = StringTable.encode(tiles)
+        port_blob, port_offsets = StringTable.encode(ports)
+
+        arrays = {'tile_blob': tile_blob, 'tile_offsets': tile_offsets, 'port_blob': port_blob, 'port_offsets': port_offsets,
+                  'node_tile': node_tile, 'node_port': node_port, 'tile_node_ptr': tile_node_ptr,
+                  'wire_ptr': wire_ptr, 'wire_dst': wire_dst, 'wire_rev_ptr': wire_rev_ptr, 'wire_rev_src': wire_rev_src,
+                  'pip_ptr': pip_ptr, 'pip_dst': pip_dst}
+
+        extra_pips = {key: sorted(value) for key, value in vars(device).items() if key.startswith('pips_') and value}
+        meta = {'name': device.name,
+                'CR_tiles_dict': {CR: sorted(coords) for CR, coords in device.CR_tiles_dict.items()},
+                'CR_HCS_Y_dict': device.CR_HCS_Y_dict,
+                'clb_site_dict': device.clb_site_dict,
+                'extra_pips': extra_pips}
+
+        cls.dump(store_path, arrays, meta)
+
+    @classmethod
+    def dump(cls, store_path, arrays, meta):
+        """This function lays out the header and the aligned arrays in the specified file
+
+        :param store_path: Path of the output file
+        :type store_path: str
+        :param arrays: Arrays to be stored
+        :type arrays: dict
+        :param meta: JSON serializable metadata
+        :type meta: dict
+        """
+        descriptors = {key: {'dtype': array.dtype.str, 'count': int(array.size), 'offset': 0} for key, array in arrays.items()}
+
+        # the header length depends on the offsets, so it is encoded twice with enough room reserved
+        header = json.dumps({'meta': meta, 'arrays': descriptors})
+        reserved = len(header.encode()) + 32 * len(arrays) + 64
+        offset = cls.align(len(cls.magic) + 16 + reserved)
+        for key, array in arrays.items():
+            descriptors[key]['offset'] = offset
+            offset = cls.align(offset + array.nbytes)
+
+        header = json.dumps({'meta': meta, 'arrays': descriptors}).encode().ljust(reserved)
+        with open(store_path, 'wb') as file:
+            file.write(cls.magic)
+            file.write(np.array([cls.version, len(header)], dtype=np.uint64).tobytes())
+            file.write(header)
+            for key, array in arrays.items():
+                file.seek(descriptors[key]['offset'])
+                file.write(np.ascontiguousarray(array).tobytes())
+
+    @classmethod
+    def align(cls, offset):
+        return (offset + cls.alignment - 1) // cls.alignment * cls.alignment
+
+    @staticmethod
+    def to_csr(src, dst, n_rows):
+        """This function converts an edge list into CSR adjacency arrays
+
+        :param src: Tail IDs
+        :type src: np.ndarray
+        :param dst: Head IDs
+        :type dst: np.ndarray
+        :param n_rows: Number of rows (IDs)
+        :type n_rows: int
+        :return: Row pointer and column indices arrays
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        order = np.lexsort((dst, src))
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n_rows), out=indptr[1:])
+
+        return indptr, dst[order].astype(np.int32)
+
+    @classmethod
+    def get_file_name(cls, name: str) -> str:
+        return f'device_{name}{cls.extension}'
+
+    @classmethod
+    def exists(cls, model_dir, name: str) -> bool:
+        return (Path(model_dir) / cls.get_file_name(name)).exists()
+
+    @classmethod
+    def load(cls, model_dir, name: str):
+        return cls(Path(model_dir) / cls.get_file_name(name))
@@ -0,0 +1,146 @@
+import argparse, os, re, shutil
+from pathlib import Path
+from tqdm import tqdm
+from xil_res.architecture import Arch
+import utility.config as cfg
+import utility.utility_functions as util
+import utility.tc_index as tc_index
+
+# create parser
+parser = argparse.ArgumentParser(prog='consolidate_TCs', description='Move the CUTs of the sparsest minimal configurations into other ones and renumber them')
+
+# add arguments
+parser.add_argument('device_name', choices=Arch.get_models(), help='Specify the fabric of the FPGA')
+parser.add_argument('minimal_config_dir', help='Specify the directory of stored minimal configurations')
+parser.add_argument('store_dir', help='Specify the directory to store the consolidated minimal configurations')
+
+def get_TC_idx(file: Path) -> int:
+    return int(re.findall(r'\d+', file.stem)[0])
+
+def load_TC(store_dir, TC_idx, TCs):
+    if TC_idx not in TCs:
+        TCs[TC_idx] = util.load_data(store_dir, f'TC{TC_idx}.data')
+
+    return TCs[TC_idx]
+
+def move_CUTs(test_collection, store_dir, source_idx, targets, n_CUTs, capacity):
+    """This function moves all CUTs of the source TC into the target TCs. Nothing is stored unless every CUT is moved.
+
+    :param test_collection: Test collection of the minimal configurations
+    :type test_collection: TestCollection
+    :param store_dir: Directory of the minimal configurations
+    :type store_dir: str
+    :param source_idx: Index of the source TC
+    :type source_idx: int
+    :param targets: Indices of the target TCs in the order they are tried
+    :type targets: List[int]
+    :param n_CUTs: Number of CUTs of each TC
+    :type n_CUTs: dict
+    :param capacity: Maximum number of CUTs of each TC
+    :type capacity: dict
+    :return: Indices of the TCs that received CUTs, or None if the source TC is not emptied
+    :rtype: Set[int]|None
+    """
+    source_TC = util.load_data(store_dir, f'TC{source_idx}.data')
+    TCs, moved = {}, {}
+    for cut in source_TC.CUTs:
+        for target_idx in targets:
+            if n_CUTs[target_idx] + moved.get(target_idx, 0) >= capacity[target_idx]:
+                continue
+
+            # the clock groups of the test collection must be the ones of the TC
+            TC = load_TC(store_dir, target_idx, TCs)
+            test_collection.TC, test_collection.clock_groups = TC, TC.CD
+            if TC.merge_CUT(test_collection, cut):
+                moved[target_idx] = moved.get(target_idx, 0) + 1
+                break
+        else:
+            return None
+
+    for target_idx in moved:
+        tc_index.store_TC(store_dir, f'TC{target_idx}.data', TCs[target_idx])
+        n_CUTs[target_idx] += moved[target_idx]
+
+    return set(moved)
+
+def remove_TC(store_dir, TC_idx):
+    os.remove(os.path.join(store_dir, f'TC{TC_idx}.data'))
+    index_path = os.path.join(store_dir, tc_index.get_index_name(f'TC{TC_idx}.data'))
+    if os.path.exists(index_path):
+        os.remove(index_path)
+
+def renumber_TCs(store_dir, TC_indices, first_idx):
+    """This function renumbers the specified TCs consecutively from the first index
+
+    :param store_dir: Directory of the minimal configurations
+    :type store_dir: str
+    :param TC_indices: Indices of the TCs
+    :type TC_indices: List[int]
+    :param first_idx: New index of the first TC
+    :type first_idx: int
+    """
+    # new indices never exceed the old ones, so no TC is overwritten
+    for new_idx, TC_idx in enumerate(sorted(TC_indices), start=first_idx):
+        if new_idx == TC_idx:
+            continue
+
+        TC = util.load_data(store_dir, f'TC{TC_idx}.data')
+        TC.TC_idx = new_idx
+        tc_index.store_TC(store_dir, f'TC{new_idx}.data', TC)
+        remove_TC(store_dir, TC_idx)
+
+if __name__ == '__main__':
+
+    # parse arguments
+    args = parser.parse_args()
+
+    # copy the minimal configurations
+    util.create_folder(args.store_dir)
+    for file in Path(args.minimal_config_dir).iterdir():
+        shutil.copy2(file, args.store_dir)
+
+    test_collection = util.load_data(args.store_dir, 'test_collection.data')
+    # merging CUTs neither routes nor updates the costs and the queue, so the graph of the device is not prepared
+    test_collection.device = Arch(args.device_name)
+
+    # TCs extending the configurations of previous iterations keep their indices
+    if test_collection.prev_config_dir is not None:
+        first_idx = len(list(Path(test_collection.prev_config_dir).glob('TC*')))
+    else:
+        first_idx = 0
+
+    files = list(Path(args.store_dir).glob('TC*'))
+    n_CUTs = {get_TC_idx(file): tc_index.load_index(args.store_dir, file.name)['n_CUTs'] for file in files}
+
+    # the CUTs of previous iterations at the origin reduce the capacity like in TestCollection.create_TC
+    capacity = dict.fromkeys(n_CUTs, cfg.max_capacity)
+    for TC_idx in filter(lambda TC_idx: TC_idx < first_idx, n_CUTs):
+        index = tc_index.load_index(test_collection.prev_config_dir, f'TC{TC_idx}.data')
+        capacity[TC_idx] -= index['origins'].get(test_collection.origin, 0)
+
+    sources = sorted((TC_idx for TC_idx in n_CUTs if TC_idx >= first_idx), key=lambda TC_idx: (n_CUTs[TC_idx], -TC_idx))
+
+    # the sparsest TCs are emptied into the densest ones that still have capacity
+    # TCs that have received CUTs are kept, so that the moved CUTs are not moved again
+    pbar = tqdm(total=len(sources))
+    removed, received = set(), set()
+    for source_idx in sources:
+        if source_idx in received:
+            pbar.update(1)
+            continue
+
+        targets = sorted((TC_idx for TC_idx in n_CUTs if TC_idx != source_idx and TC_idx not in removed), key=lambda TC_idx: (-n_CUTs[TC_idx], TC_idx))
+        targets_moved = move_CUTs(test_collection, args.store_dir, source_idx, targets, n_CUTs, capacity)
+        if targets_moved is not None:
+            remove_TC(args.store_dir, source_idx)
+            removed.add(source_idx)
+            received.update(targets_moved)
+            n_CUTs.pop(source_idx)
+
+        pbar.set_postfix_str(f'Removed TCs: {len(removed)}')
+        pbar.update(1)
+
+    renumber_TCs(args.store_dir, [TC_idx for TC_idx in n_CUTs if TC_idx >= first_idx], first_idx)
+    test_collection.TC_idx = first_idx + len([TC_idx for TC_idx in n_CUTs if TC_idx >= first_idx])
+    util.store_data(args.store_dir, 'test_collection.data', test_collection)
+    print(f'TCs: {len(files)} -> {len(n_CUTs)}')
@@ -1,5 +1,7 @@
 import time, argparse
+from pathlib import Path
 from arch.arch_model import DeviceModel
+from arch.device_store import DeviceStore
 from utility.utility_functions import store_data
 import utility.config as cfg
 
@@ -9,6 +11,8 @@ parser = argparse.ArgumentParser(prog='generate_arch_model', description="Genera
 # Arguments
 parser.add_argument('viv_rpt_file', help="Specify the path to the vivado report file")
 parser.add_argument('store_dir', help="Specify the directory to which the output file will be stored")
+parser.add_argument('--n_jobs', type=int, default=1, help="Number of byte-range shards of the report parsed in parallel")
+parser.add_argument('--legacy', action='store_true', help="Store the pickled model instead of the memory-mapped device store")
 
 if __name__ == '__main__':
 
@@ -17,7 +21,12 @@ if __name__ == '__main__':
 
     start_time = time.time()
     device = DeviceModel()
-    device.parse(args.viv_rpt_file)
+    device.parse(args.viv_rpt_file, n_jobs=args.n_jobs)
+
+    if args.legacy:
+        store_data(args.store_dir, f'device_{device.name}.data', device)
+    else:
+        Path(args.store_dir).mkdir(parents=True, exist_ok=True)
+        DeviceStore.write(device, Path(args.store_dir) / DeviceStore.get_file_name(device.name))
 
-    store_data(args.store_dir, f'device_{device.name}.data', device)
     print(f'Elapsed time: {time.time() - start_time}')
\ No newline at end of file
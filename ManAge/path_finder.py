@@ -1,7 +1,9 @@
 import argparse
+from pathlib import Path
 from xil_res.test_storage import TestCollection
 from xil_res.architecture import Arch
 from xil_res.path import PathOut, PathIn
+import xil_res.pip_order as pip_order
 import utility.config as cfg
 import utility.utility_functions as util
 
@@ -17,26 +19,34 @@ parser.add_argument('minimal_config_dir', help='Specify the directory to store m
 parser.add_argument('-l', '--local', action='store_true', help='Find only local CUTs in minimal configurations')
 parser.add_argument('-q', '--quad', action='store_true', help='Cover only quad PIP in minimal configurations')
 parser.add_argument('-p', '--prev_config_dir', help='Specify the directory of previous stored configurations')
+parser.add_argument('-s', '--search', choices=['dijkstra', 'astar'], default=cfg.search_method, help='Specify the path search algorithm')
+parser.add_argument('-o', '--order', choices=list(pip_order.orders), default=cfg.pip_order, help='Specify the order in which the uncovered PIPs are picked')
+parser.add_argument('-r', '--resume', action='store_true', help='Resume the path search from the last checkpoint in the minimal configurations directory')
+parser.add_argument('-b', '--budget', choices=['time', 'expanded', 'searches'], default=cfg.budget, help='Specify the measure of the budget of each TC')
+parser.add_argument('-c', '--candidates', type=int, default=cfg.n_candidates, help='Specify the number of candidate PIPs routed in parallel for each CUT')
 
 if __name__ == "__main__":
 
     # Parse Arguments
     args = parser.parse_args()
 
-    Empty_TC = False
     if args.local:
         cfg.long_TC_process_time = cfg.long_TC_process_time_local
+        cfg.long_TC_process_work = cfg.long_TC_process_work_local
 
     if args.prev_config_dir:
         cfg.first_iteration = False
 
+    cfg.search_method = args.search
+    cfg.n_candidates = args.candidates
+    cfg.pip_order = args.order
+    cfg.budget = args.budget
+
     # init device
     device = Arch(args.device_name)
 
-    # set compressed graph
-    device.set_compressed_graph(args.origin)
-    device.reform_cost()
-    device.remove_untested_edges()
+    # set compressed graph (loaded if prepared by prepare_graphs.py)
+    device.prepare(args.origin)
     device.weight = PathIn.weight_function(device.G, 'weight')
 
     if args.quad:
@@ -44,11 +54,18 @@ if __name__ == "__main__":
     else:
         pips = device.get_pips(args.origin, local=args.local)
 
-    test_collection = TestCollection(args.iteration, args.origin, args.minimal_config_dir, prev_config_dir=args.prev_config_dir, queue=pips)
+    test_collection = TestCollection(args.iteration, args.origin, args.minimal_config_dir, prev_config_dir=args.prev_config_dir, queue=pips, resume=args.resume)
+
+    # restore the queue, the costs and the interrupted TC
+    resumed_TC = test_collection.load_checkpoint(device) if args.resume else False
 
     #create a TC
     while test_collection.queue:
-        test_collection.create_TC(device)
+        if resumed_TC:
+            resumed_TC = False
+        else:
+            test_collection.create_TC(device)
+
         TC = test_collection.TC
         TC.fill(test_collection)
 
@@ -56,10 +73,10 @@ if __name__ == "__main__":
             test_collection.store_TC()
         elif test_collection.prev_config_files:
             pass
-        elif not Empty_TC:
+        elif not test_collection.empty_TC:
             device.reset_costs(test_collection)
             device.reform_cost()
-            Empty_TC = True
+            test_collection.empty_TC = True
         else:
             break
 
@@ -68,4 +85,8 @@ if __name__ == "__main__":
             device.reset_costs(test_collection)
             device.reform_cost()
 
+        test_collection.store_checkpoint(finished=True, force=True)
+
     util.store_data(args.minimal_config_dir, 'test_collection.data', test_collection)
+    Path(args.minimal_config_dir, 'checkpoint.data').unlink(missing_ok=True)
+    print(f"Search: {cfg.search_method}, Searches: {PathIn.search_stats['searches']}, Expanded nodes: {PathIn.search_stats['expanded']}, Cached failures: {PathIn.search_stats['cached']}")
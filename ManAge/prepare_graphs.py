@@ -0,0 +1,53 @@
+import argparse, time
+from joblib import Parallel, delayed
+from xil_res.architecture import Arch
+import utility.config as cfg
+
+# Create the main parser
+parser = argparse.ArgumentParser(prog='prepare_graphs', description='Prepare the compressed graphs and PIP length tables of origins for path finding')
+subparser = parser.add_subparsers(title='subcommands', dest='subcommand', required=True)
+
+# Create a parent parser for shared arguments
+parent_parser = argparse.ArgumentParser(add_help=False)
+parent_parser.add_argument('device_name', choices=Arch.get_models(), help='Specify the fabric of the FPGA')
+parent_parser.add_argument('-j', '--n_jobs', type=int, default=cfg.n_jobs, help='Number of parallel processes')
+parent_parser.add_argument('-f', '--force', action='store_true', help='Prepare the origins already listed in the manifest again')
+
+# Subcommand: origin
+parser_origin = subparser.add_parser('origin', parents=[parent_parser], help='Prepare the specified origins')
+parser_origin.add_argument('origins', nargs='+', help='Origins (e.g., X2Y3)')
+
+# Subcommand: clock_region
+parser_CR = subparser.add_parser('clock_region', parents=[parent_parser], help='Prepare all origins of the specified clock regions')
+parser_CR.add_argument('clock_regions', nargs='+', help='Clock regions (e.g., X0Y1)')
+
+def prepare_origin(device_name, origin):
+    start_time = time.time()
+    device = Arch(device_name)
+    device.prepare(origin, use_prepared=False)
+    entry = device.store_prepared(origin)
+    entry['elapsed_time'] = round(time.time() - start_time, 3)
+
+    return f'{cfg.INT_label}_{origin}', entry
+
+if __name__ == '__main__':
+
+    # Parse the arguments
+    args = parser.parse_args()
+    device = Arch(args.device_name)
+
+    if args.subcommand == 'origin':
+        origins = args.origins
+    else:
+        coords = {coord for CR in args.clock_regions for coord in device.get_CR(CR).coords}
+        origins = sorted(coord for coord in coords if device.tiles_map.get(coord, {}).get(cfg.INT_label))
+
+    graph_cache = device.get_graph_cache()
+    if not args.force:
+        manifest = graph_cache.load_manifest()
+        origins = [origin for origin in origins if f'{cfg.INT_label}_{origin}' not in manifest]
+
+    start_time = time.time()
+    results = Parallel(n_jobs=args.n_jobs, verbose=10)(delayed(prepare_origin)(args.device_name, origin) for origin in origins)
+    graph_cache.update_manifest(dict(results))
+    print(f'Prepared origins: {len(results)}, Elapsed time: {time.time() - start_time}')
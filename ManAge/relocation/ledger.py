@@ -0,0 +1,85 @@
+import os
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, List
+import utility.utility_functions as util
+
+
+@dataclass
+class Chain:
+    """
+    This class keeps the state of the path finding and relocation iterations of a campaign within one clock region.
+    """
+    CR              :   str
+    iteration       :   int     = field(default = 0)
+    origins         :   list    = field(default_factory = list)
+    exhausted       :   set     = field(default_factory = set)
+    coverage        :   dict    = field(default_factory = dict)
+    done            :   bool    = field(default = False)
+
+    def get_config_dir(self, data_path, iteration=None):
+        iteration = self.iteration if iteration is None else iteration
+        return Path(data_path) / self.CR / 'Configurations' / f'iter{iteration}'
+
+    def get_minimal_config_dir(self, data_path, iteration=None):
+        iteration = self.iteration if iteration is None else iteration
+        return Path(data_path) / self.CR / 'Minimal_Configurations' / f'iter{iteration}'
+
+
+@dataclass
+class CoverageLedger:
+    """
+    This class records the merged iterations and the PIP coverage of each chain of a campaign. It is stored after each
+    relocation merge, so that an interrupted campaign resumes from the last merged iteration of each chain.
+    """
+    device_name     :   str
+    data_path       :   str
+    target_coverage :   float
+    chains          :   Dict[str, Chain]    = field(default_factory = dict)
+    file_name       :   str                 = field(default = 'campaign_ledger.data')
+
+    def __post_init__(self):
+        Path(self.data_path).mkdir(parents=True, exist_ok=True)
+
+    def add_chain(self, CR: str):
+        if CR not in self.chains:
+            self.chains[CR] = Chain(CR)
+
+    def get_open_chains(self) -> List[Chain]:
+        return [chain for chain in self.chains.values() if not chain.done]
+
+    def merge(self, chain: Chain, origin: str, coverage: dict):
+        """This function records a relocated iteration of the specified chain
+
+        :param chain: Chain of the iteration
+        :type chain: Chain
+        :param origin: Origin of the iteration
+        :type origin: str
+        :param coverage: Number of covered PIPs of each INT tile within the clock region of the chain
+        :type coverage: dict
+        """
+        if sum(coverage.values()) <= sum(chain.coverage.values()):
+            chain.exhausted.add(origin)
+
+        chain.iteration += 1
+        chain.origins.append(origin)
+        chain.coverage = coverage
+        self.store()
+
+    def store(self):
+        # the ledger is replaced at once, so that an interruption never leaves a partial ledger
+        util.store_data(self.data_path, f'{self.file_name}.tmp', self)
+        os.replace(os.path.join(self.data_path, f'{self.file_name}.tmp'), os.path.join(self.data_path, self.file_name))
+
+    @classmethod
+    def load(cls, data_path: str, file_name: str = 'campaign_ledger.data') -> 'CoverageLedger':
+        """This function loads the ledger of a campaign
+
+        :param data_path: Directory of the campaign
+        :type data_path: str
+        :param file_name: Name of the ledger file, defaults to 'campaign_ledger.data'
+        :type file_name: str, optional
+        :return: Ledger
+        :rtype: CoverageLedger
+        """
+        return util.load_data(str(data_path), file_name)
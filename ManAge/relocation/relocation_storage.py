@@ -6,6 +6,7 @@ from xil_res.architecture import Arch
 from relocation.configuration import Config
 from xil_res.node import Node as nd
 import utility.utility_functions as util
+import utility.tc_index as tc_index
 import utility.config as cfg
 
 
@@ -103,7 +104,7 @@ class RLOC_Collection:
         minimal_TC = util.load_data(str(file.parent), file.name)
         TC = self.create_TC(file.name)
         TC.fill_D_CUTs(self, minimal_TC)
-        util.store_data(self.config_dir, f'TC{self.TC_idx}.data', TC)
+        tc_index.store_TC(self.config_dir, f'TC{self.TC_idx}.data', TC)
         self.update_pbar()
 
     def update_coverage(self, edges):
@@ -153,4 +154,5 @@ class RLOC_Collection:
             for file in missing_files:
                 src = os.path.join(self.prev_config_dir, file)
                 dst = os.path.join(self.config_dir, file)
-                shutil.copy(src, dst)
\ No newline at end of file
+                # the modification time is kept, so that the sidecar indices of the copied configurations remain valid
+                shutil.copy2(src, dst)
\ No newline at end of file
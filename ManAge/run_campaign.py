@@ -0,0 +1,169 @@
+import argparse, subprocess, threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+from joblib import effective_n_jobs
+from xil_res.architecture import Arch
+from xil_res.node import Node as nd
+from relocation.ledger import CoverageLedger, Chain
+import utility.config as cfg
+import utility.utility_functions as util
+
+# create parser
+parser = argparse.ArgumentParser(prog='run_campaign', description='Run path finding and relocation iterations on several clock regions concurrently')
+
+# add arguments
+parser.add_argument('device_name', choices=Arch.get_models(), help='Specify the fabric of the FPGA')
+parser.add_argument('data_path', help='Specify the directory of the campaign')
+parser.add_argument('clock_regions', nargs='+', help='Specify the clock regions (one independent chain of iterations per clock region)')
+
+parser.add_argument('-w', '--workers', type=int, default=cfg.n_campaign_workers, help='Specify the number of concurrent path finding processes')
+parser.add_argument('-t', '--target', type=float, default=cfg.target_coverage, help='Specify the minimum coverage of each INT tile of a clock region')
+parser.add_argument('-o', '--origins', nargs='+', default=[], help='Specify the origins of the first iterations (one per clock region)')
+parser.add_argument('-c', '--candidates', type=int, default=cfg.n_candidates, help='Specify the number of candidate PIPs routed in parallel for each CUT')
+parser.add_argument('-r', '--resume', action='store_true', help='Resume the campaign from its ledger')
+
+# serializes the relocation merges and the ledger updates
+ledger_lock = threading.Lock()
+
+def get_pips_length_dict(device: Arch, CR: str):
+    """This function returns the number of PIPs to be covered at each INT tile within the specified clock region
+
+    :param device: Device under test
+    :type device: Arch
+    :param CR: Name of the clock region
+    :type CR: str
+    :return: A dictionary with INT tiles as keys and the number of PIPs to be covered as values
+    :rtype: dict
+    """
+    pips_length_dict = {}
+    for coordinate in device.get_CR(CR).coords:
+        N_pips = cfg.n_pips_two_CLB if all(map(lambda tile: tile is not None, device.tiles_map[coordinate].values())) else cfg.n_pips_one_CLB
+        pips_length_dict[f'{cfg.INT_label}_{coordinate}'] = N_pips
+
+    return pips_length_dict
+
+def get_next_origin(chain: Chain, pips_length_dict: dict, target_coverage: float):
+    """This function returns the origin of the next iteration of the specified chain, i.e., the least covered INT tile
+
+    :param chain: Chain of iterations
+    :type chain: Chain
+    :param pips_length_dict: Number of PIPs to be covered at each INT tile of the chain's clock region
+    :type pips_length_dict: dict
+    :param target_coverage: Minimum coverage of each INT tile
+    :type target_coverage: float
+    :return: Origin of the next iteration or None when the chain is finished
+    :rtype: str|None
+    """
+    coverage = {tile: chain.coverage.get(tile, 0) / N_pips for tile, N_pips in pips_length_dict.items()
+                if nd.get_coordinate(tile) not in chain.exhausted}
+    coverage = {tile: covered for tile, covered in coverage.items() if covered < target_coverage}
+    if not coverage:
+        return None
+
+    # tiles with two CLBs are preferred among equally covered tiles
+    INT_tile = min(coverage, key=lambda tile: (coverage[tile], -pips_length_dict[tile], tile))
+    return nd.get_coordinate(INT_tile)
+
+def run_iteration(ledger: CoverageLedger, chain: Chain, origin: str, pips_length_dict: dict, candidates: int):
+    """This function runs the path finding of the next iteration of the specified chain and merges its relocated CUTs
+    into the previous configurations of the chain
+
+    :param ledger: Ledger of the campaign
+    :type ledger: CoverageLedger
+    :param chain: Chain of iterations
+    :type chain: Chain
+    :param origin: Origin of the iteration
+    :type origin: str
+    :param pips_length_dict: Number of PIPs to be covered at each INT tile of the chain's clock region
+    :type pips_length_dict: dict
+    :param candidates: Number of candidate PIPs routed in parallel for each CUT
+    :type candidates: int
+    """
+    iteration = chain.iteration + 1
+    minimal_config_dir = chain.get_minimal_config_dir(ledger.data_path, iteration)
+    config_dir = chain.get_config_dir(ledger.data_path, iteration)
+    prev_config_dir = chain.get_config_dir(ledger.data_path) if chain.iteration else None
+
+    command = [cfg.python, 'path_finder.py', ledger.device_name, origin, f'{iteration}', str(minimal_config_dir), '-c', f'{candidates}']
+    if prev_config_dir is not None:
+        command += ['-p', str(prev_config_dir)]
+
+    result = subprocess.run(command, capture_output=False, text=True)
+    with ledger_lock:
+        if result.returncode != 0:
+            print(f'{chain.CR}: path finding at {origin} failed!')
+            chain.exhausted.add(origin)
+            ledger.store()
+            return
+
+        command = [cfg.python, 'relocate_CUTs.py', ledger.device_name, origin, str(minimal_config_dir), str(config_dir), '-c', chain.CR]
+        if prev_config_dir is not None:
+            command += ['-p', str(prev_config_dir)]
+
+        result = subprocess.run(command, capture_output=False, text=True)
+        if result.returncode != 0:
+            print(f'{chain.CR}: relocation of {origin} failed!')
+            chain.exhausted.add(origin)
+            ledger.store()
+            return
+
+        rloc_collection = util.load_data(str(config_dir), 'rloc_collection.data')
+        coverage = {tile: len(rloc_collection.covered_pips.get(tile, ())) for tile in pips_length_dict}
+        ledger.merge(chain, origin, coverage)
+
+if __name__ == '__main__':
+
+    # parse arguments
+    args = parser.parse_args()
+
+    # init device
+    device = Arch(args.device_name)
+
+    # create or load the ledger
+    if args.resume and (Path(args.data_path) / 'campaign_ledger.data').exists():
+        ledger = CoverageLedger.load(args.data_path)
+    else:
+        ledger = CoverageLedger(args.device_name, args.data_path, args.target)
+
+    ledger.target_coverage = args.target
+    for CR in args.clock_regions:
+        # finished chains are reopened, since the target coverage may be raised on resume
+        ledger.add_chain(CR)
+        ledger.chains[CR].done = False
+
+    pips_length_dicts = {CR: get_pips_length_dict(device, CR) for CR in ledger.chains}
+    first_origins = dict(zip(args.clock_regions, args.origins))
+    ledger.store()
+
+    # run the chains concurrently; the iterations of a chain are sequential, since each one extends the previous configurations
+    n_workers = min(effective_n_jobs(args.workers), len(ledger.chains))
+    with ThreadPoolExecutor(max_workers=max(n_workers, 1)) as executor:
+        running = {}
+        while True:
+            for chain in ledger.get_open_chains():
+                if chain.CR in running.values():
+                    continue
+
+                if chain.iteration == 0 and chain.CR in first_origins and first_origins[chain.CR] not in chain.exhausted:
+                    origin = first_origins[chain.CR]
+                else:
+                    origin = get_next_origin(chain, pips_length_dicts[chain.CR], ledger.target_coverage)
+
+                if origin is None:
+                    with ledger_lock:
+                        chain.done = True
+                        ledger.store()
+
+                    print(f'{chain.CR}: finished after {chain.iteration} iterations')
+                    continue
+
+                future = executor.submit(run_iteration, ledger, chain, origin, pips_length_dicts[chain.CR], args.candidates)
+                running[future] = chain.CR
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                running.pop(future)
+                future.result()
@@ -0,0 +1,73 @@
+import os, sys, time, re, argparse, tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+os.chdir(str(Path(__file__).parent.parent))
+import pandas as pd
+import utility.utility_functions as util
+import utility.serialization as serialization
+
+# artifact types recognized by their file names
+artifact_patterns = {
+    'minimal TC'        : r'^TC\d+\.data$',
+    'test collection'   : r'^test_collection\.data$',
+    'rloc collection'   : r'^rloc_collection\.data$',
+    'compressed graph'  : r'^G_.*\.data$',
+    'device model'      : r'^device_.*\.data$',
+}
+
+def get_artifact_type(file: Path) -> str:
+    return next((artifact for artifact, pattern in artifact_patterns.items() if re.match(pattern, file.name)), 'other')
+
+def collect_samples(paths, n_samples):
+    samples = {}
+    for path in map(Path, paths):
+        files = sorted(path.rglob('*.data')) if path.is_dir() else [path]
+        for file in files:
+            artifact = get_artifact_type(file)
+            if len(samples.setdefault(artifact, [])) < n_samples:
+                samples[artifact].append(file)
+
+    return samples
+
+def benchmark(file: Path, codecs, tmp_dir):
+    with open(file, 'rb') as ifile:
+        stored_codec = serialization.detect_codec(ifile)
+
+    start_time = time.perf_counter()
+    data = util.load_data(file.parent, file.name)
+    results = [{'codec': f'{stored_codec} (on disk)', 'store (s)': None, 'load (s)': time.perf_counter() - start_time, 'size (MB)': file.stat().st_size / 2 ** 20}]
+
+    for codec in codecs:
+        start_time = time.perf_counter()
+        util.store_data(tmp_dir, file.name, data, codec=codec)
+        store_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        util.load_data(tmp_dir, file.name)
+        load_time = time.perf_counter() - start_time
+
+        results.append({'codec': codec, 'store (s)': store_time, 'load (s)': load_time, 'size (MB)': (Path(tmp_dir) / file.name).stat().st_size / 2 ** 20})
+
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog='benchmark_serialization', description='Report the load and store time of stored artifacts for each registered codec')
+    parser.add_argument('paths', nargs='+', help='Artifact files or directories searched recursively for *.data files')
+    parser.add_argument('-n', '--n_samples', type=int, default=3, help='Maximum number of files benchmarked per artifact type')
+    parser.add_argument('-c', '--codecs', nargs='+', default=list(serialization.codecs), help='Codecs to be benchmarked')
+    parser.add_argument('-o', '--output', help='Path of the CSV file to which the results are written')
+    args = parser.parse_args()
+
+    records = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for artifact, files in collect_samples(args.paths, args.n_samples).items():
+            for file in files:
+                for result in benchmark(file, args.codecs, tmp_dir):
+                    records.append({'artifact': artifact, 'file': file.name, **result})
+
+    df = pd.DataFrame(records)
+    summary = df.groupby(['artifact', 'codec'])[['store (s)', 'load (s)', 'size (MB)']].mean()
+    print(summary.to_string(float_format=lambda x: f'{x:.4f}'))
+
+    if args.output:
+        df.to_csv(args.output, index=False)
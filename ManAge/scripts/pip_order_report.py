@@ -0,0 +1,51 @@
+import os, sys, time, argparse, subprocess
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+os.chdir(str(Path(__file__).parent.parent))
+import pandas as pd
+import utility.config as cfg
+import utility.utility_functions as util
+import xil_res.pip_order as pip_order
+
+def run_path_finder(device_name, origin, minimal_config_dir, order, extra_args):
+    command = [cfg.python, 'path_finder.py', device_name, origin, '1', str(minimal_config_dir), '-o', order, *extra_args]
+    # the configurations of earlier runs would be resumed and counted
+    util.create_folder(minimal_config_dir)
+    start_time = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True)
+    wall_time = time.perf_counter() - start_time
+
+    # Check for errors
+    if result.returncode != 0:
+        print("Error:", result.stderr)
+        sys.exit(result.returncode)
+
+    TCs = [util.load_data(str(minimal_config_dir), file.name) for file in Path(minimal_config_dir).glob('TC*')]
+    CUTs_per_TC = [len(TC.CUTs) for TC in TCs]
+    test_collection = util.load_data(str(minimal_config_dir), 'test_collection.data')
+
+    return {'order': order, 'TCs': len(TCs), 'CUTs': sum(CUTs_per_TC), 'min CUTs/TC': min(CUTs_per_TC, default=0),
+            'coverage (%)': 100 * (test_collection.n_pips - len(test_collection.queue)) / test_collection.n_pips,
+            'wall time (s)': wall_time}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog='pip_order_report', description='Report the number of TCs and the wall time of path_finder.py for each PIP order')
+    parser.add_argument('device_name', help='Specify the fabric of the FPGA')
+    parser.add_argument('origin', help='Specify the origin of CUTs')
+    parser.add_argument('store_dir', help='Directory in which the minimal configurations of each PIP order are stored')
+    parser.add_argument('-r', '--orders', nargs='+', default=list(pip_order.orders), help='PIP orders to be compared')
+    parser.add_argument('-o', '--output', help='Path of the CSV file to which the results are written')
+    parser.add_argument('-a', '--path_finder_args', nargs=argparse.REMAINDER, default=[], help='Further arguments of path_finder.py (e.g., -a -l). It must be the last option, since all following arguments are passed to path_finder.py')
+    args = parser.parse_args()
+
+    records = []
+    for order in args.orders:
+        minimal_config_dir = Path(args.store_dir) / order
+        records.append(run_path_finder(args.device_name, args.origin, minimal_config_dir, order, args.path_finder_args))
+
+    # every TC costs a bitstream and a board run
+    df = pd.DataFrame(records).set_index('order')
+    print(df.to_string(float_format=lambda x: f'{x:.2f}'))
+
+    if args.output:
+        df.to_csv(args.output)
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+# the modules of the repository are imported from its root, like the scripts do
+sys.path.insert(0, str(Path(__file__).absolute().parents[1]))
+
+import networkx as nx
+import pytest
+from xil_res.architecture import Arch
+from xil_res.edge_weights import EdgeWeights
+from xil_res.test_storage import TestCollection
+
+ORIGIN = 'X2Y3'
+PIP = ('INT_X2Y3/SS_END3', 'INT_X2Y3/NN_BEG1')
+# a path through the PIP ending at a LUT input and a path from its head to an FF
+NOT_PATH = ['INT_X2Y4/LOGIC_OUTS_E29', 'INT_X2Y4/SS_BEG3', 'INT_X2Y3/SS_END3', 'INT_X2Y3/NN_BEG1', 'INT_X2Y4/NN_END1', 'INT_X2Y4/IMUX_E57', 'CLEL_R_X2Y4/CLE_CLE_L_SITE_0_H2']
+OUT_PATH = ['INT_X2Y3/NN_BEG1', 'INT_X2Y3/IMUX_E14', 'CLEL_R_X2Y3/CLE_CLE_L_SITE_0_BX']
+
+def get_device(reverse=False) -> Arch:
+    """This function creates a device of two INT tiles and their East CLBs with the edges of the test paths
+
+    :param reverse: Add the edges in reverse order, so that their IDs differ, defaults to False
+    :type reverse: bool, optional
+    :return: Device
+    :rtype: Arch
+    """
+    edges = list(zip(NOT_PATH, NOT_PATH[1:])) + list(zip(OUT_PATH, OUT_PATH[1:]))
+    edges.append(('INT_X2Y3/SS_END3', 'INT_X2Y3/NN_BEG2'))
+    for y in (3, 4):
+        for label in 'ABCDEFGH':
+            edges.append((f'INT_X2Y{y}/IMUX_E{ord(label)}', f'CLEL_R_X2Y{y}/CLE_CLE_L_SITE_0_{label}X'))
+            edges.append((f'CLEL_R_X2Y{y}/CLE_CLE_L_SITE_0_{label}Q', f'INT_X2Y{y}/LOGIC_OUTS_E{ord(label)}'))
+
+    G = nx.DiGraph()
+    G.add_edges_from(reversed(edges) if reverse else edges, weight=1)
+    EdgeWeights.attach(G)
+
+    device = Arch.__new__(Arch)
+    device.G = G
+    device.wires_dict = dict.fromkeys(('INT_X2Y3', 'INT_X2Y4', 'CLEL_R_X2Y3', 'CLEL_R_X2Y4'), ())
+    device.tiles_map = {}
+    device.init_tiles_map()
+    return device
+
+@pytest.fixture
+def device():
+    return get_device()
+
+@pytest.fixture
+def collection(device, tmp_path):
+    collection = TestCollection(1, ORIGIN, str(tmp_path / 'minimal'), queue={PIP, ('INT_X2Y3/SS_END3', 'INT_X2Y3/NN_BEG2')})
+    collection.create_TC(device)
+    return collection
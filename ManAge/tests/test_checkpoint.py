@@ -0,0 +1,78 @@
+import os
+import numpy as np
+import pytest
+import utility.config as cfg
+from conftest import ORIGIN, PIP, NOT_PATH, get_device
+from xil_res.cut import CUT
+from xil_res.edge_weights import EdgeWeights
+from xil_res.path import Path
+import xil_res.test_storage as test_storage
+
+def get_weights(G) -> dict:
+    weights = EdgeWeights.attach(G)
+    return {edge: weights.get(G, edge) for edge in weights.edges if G.has_edge(*edge)}
+
+def commit_CUT(collection):
+    main_path = Path()
+    main_path.nodes = list(NOT_PATH)
+    main_path.type = 'main_path'
+    main_path.pip = PIP
+    cut = CUT(ORIGIN)
+    cut.main_path = main_path
+    cut.paths = [main_path]
+    collection.TC.commit_CUT(collection, PIP[1], cut)
+
+def resume(collection) -> tuple:
+    # the device is rebuilt with other edge IDs, as by another version of the graph
+    resumed = test_storage.TestCollection(1, ORIGIN, collection.minimal_config_dir, queue={PIP, ('INT_X2Y3/SS_END3', 'INT_X2Y3/NN_BEG2')}, resume=True)
+    return resumed, resumed.load_checkpoint(get_device(reverse=True))
+
+def test_checkpoint_of_TC(collection, device):
+    commit_CUT(collection)
+    collection.record_failure('INT_X2Y3/NN_BEG2')
+    EdgeWeights.attach(device.G).array += 0.5
+    collection.store_checkpoint(force=True)
+
+    resumed, resumed_TC = resume(collection)
+    assert resumed_TC
+    TC, resumed_TC = collection.TC, resumed.TC
+    assert resumed.queue == collection.queue and resumed.removed_pips == {PIP}
+    assert resumed.pip_failures == collection.pip_failures
+    assert resumed.pbar.n == 1
+    assert len(resumed_TC.CUTs) == 1 and resumed_TC.CUTs[0].main_path.pip == PIP
+    assert set(resumed_TC.G.edges) == set(TC.G.edges)
+    assert get_weights(resumed.device.G) == get_weights(device.G)
+    assert get_weights(resumed_TC.G) == get_weights(TC.G)
+
+def test_checkpoint_of_finished_TC(collection, device):
+    commit_CUT(collection)
+    collection.TC_idx = 1
+    collection.store_checkpoint(finished=True, force=True)
+
+    resumed, resumed_TC = resume(collection)
+    assert not resumed_TC
+    assert resumed.TC is None and resumed.TC_idx == 1
+    assert resumed.queue == collection.queue
+
+def test_checkpoint_interval(collection, monkeypatch):
+    monkeypatch.setattr(cfg, 'checkpoint_interval', 300)
+    collection.store_checkpoint(force=True)
+    os.remove(os.path.join(collection.minimal_config_dir, 'checkpoint.data'))
+
+    collection.store_checkpoint()
+    assert not os.path.exists(os.path.join(collection.minimal_config_dir, 'checkpoint.data'))
+    assert resume(collection)[1] is False
+
+def test_weights_of_other_graph(device):
+    state = EdgeWeights.attach(device.G).get_state()
+    state['array'] = np.arange(len(state['array']), dtype=np.float64)
+
+    # the weights are restored by edge
+    G = get_device(reverse=True).G
+    EdgeWeights.attach(G).set_state(state)
+    assert get_weights(G) == dict(zip(state['edges'], state['array']))
+
+    G.remove_edge(*state['edges'][0])
+    del G.graph['weights']
+    with pytest.raises(ValueError):
+        EdgeWeights.attach(G).set_state(state)
@@ -0,0 +1,70 @@
+import re
+from types import SimpleNamespace
+import networkx as nx
+import pytest
+import utility.config as cfg
+from xil_res.graph_cache import GraphCache
+
+def shift(node: str, dx: int, dy: int) -> str:
+    return re.sub(r'X(\d+)Y(\d+)', lambda match: f'X{int(match[1]) + dx}Y{int(match[2]) + dy}', node)
+
+@pytest.fixture
+def grid_device():
+    # a uniform grid of INT tiles with East CLBs, so that the windows away from the borders are identical
+    wires_dict, tiles_map = {}, {}
+    for x in range(10):
+        for y in range(10):
+            INT, CLB = f'INT_X{x}Y{y}', f'CLEL_R_X{x}Y{y}'
+            wires_dict[INT] = {(f'{INT}/EE2_BEG0', f'INT_X{x + 1}Y{y}/EE2_END0'), (f'{INT}/NN1_BEG0', f'INT_X{x}Y{y + 1}/NN1_END0')}
+            wires_dict[CLB] = {(f'{CLB}/CLE_CLE_L_SITE_0_A_O', f'{INT}/LOGIC_OUTS_E0'), (f'{INT}/IMUX_E0', f'{CLB}/CLE_CLE_L_SITE_0_A1')}
+            tiles_map[f'X{x}Y{y}'] = {'CLB_W': None, 'INT': INT, 'CLB_E': CLB}
+
+    return SimpleNamespace(name='test', wires_dict=wires_dict, tiles_map=tiles_map)
+
+@pytest.fixture
+def graph_cache(grid_device, tmp_path, monkeypatch):
+    monkeypatch.setattr(cfg, 'graph_path', str(tmp_path))
+    return GraphCache(grid_device, radius=2)
+
+def get_window_graph(device, x: int, y: int) -> nx.DiGraph:
+    G = nx.DiGraph()
+    for tile in (f'INT_X{x}Y{y}', f'CLEL_R_X{x}Y{y}', f'INT_X{x + 1}Y{y}'):
+        G.add_edges_from(device.wires_dict[tile], weight=1)
+
+    return G
+
+def test_stored_graph(grid_device, graph_cache):
+    G = get_window_graph(grid_device, 4, 4)
+    graph_cache.add_graph('INT_X4Y4', G)
+
+    assert graph_cache.has_graph('INT_X4Y4')
+    assert nx.utils.graphs_equal(graph_cache.get_graph('INT_X4Y4'), G)
+
+def test_relocated_graph(grid_device, graph_cache):
+    graph_cache.add_graph('INT_X4Y4', get_window_graph(grid_device, 4, 4))
+
+    assert graph_cache.get_signature('INT_X5Y6') == graph_cache.get_signature('INT_X4Y4')
+    assert not graph_cache.has_graph('INT_X5Y6')
+    G = graph_cache.get_graph('INT_X5Y6')
+    expected = nx.relabel_nodes(get_window_graph(grid_device, 4, 4), lambda node: shift(node, 1, 2))
+    assert nx.utils.graphs_equal(G, expected)
+    assert nx.utils.graphs_equal(G, get_window_graph(grid_device, 5, 6))
+
+def test_different_window(grid_device, graph_cache):
+    graph_cache.add_graph('INT_X4Y4', get_window_graph(grid_device, 4, 4))
+
+    # the window of a border tile includes missing coordinates
+    assert graph_cache.get_signature('INT_X0Y4') != graph_cache.get_signature('INT_X4Y4')
+    assert graph_cache.get_graph('INT_X0Y4') is None
+
+def test_index_is_shared(grid_device, graph_cache):
+    graph_cache.add_graph('INT_X4Y4', get_window_graph(grid_device, 4, 4))
+    graph_cache.add_graph('INT_X5Y5', get_window_graph(grid_device, 5, 5))
+
+    # the signature keeps pointing to the first stored tile, also for a new cache of the grid_device
+    assert GraphCache(grid_device, radius=2).index == {graph_cache.get_signature('INT_X4Y4'): 'INT_X4Y4'}
+
+def test_not_dislocated(grid_device, graph_cache):
+    # a node whose tile is missing at the target origin cannot be relocated
+    G = get_window_graph(grid_device, 4, 4)
+    assert graph_cache.relocate(G, 'INT_X4Y4', 'INT_X9Y4') is None
@@ -0,0 +1,76 @@
+import pickle
+from xil_res.node_bitmap import NodeBitmap, NodeIndex, get_flags
+
+NODES = ['INT_X2Y3/EE2_BEG0', 'INT_X2Y3/NN1_BEG0', 'INT_X3Y3/EE2_END0', 'CLEL_R_X2Y3/CLE_CLE_L_SITE_0_A1']
+
+def test_members():
+    bitmap = NodeBitmap(NodeIndex(NODES), NODES[:2])
+
+    assert set(bitmap) == set(NODES[:2])
+    assert len(bitmap) == 2 and bitmap
+    assert NODES[0] in bitmap and NODES[2] not in bitmap
+    assert 'INT_X9Y9/EE2_BEG0' not in bitmap
+
+    bitmap -= NODES[:2]
+    assert not bitmap and bitmap.state == 0
+
+def test_copy_on_write():
+    bitmap = NodeBitmap(NodeIndex(NODES), NODES[:2])
+    copy = bitmap.copy()
+    assert copy.bits is bitmap.bits
+
+    copy.add(NODES[2])
+    copy.discard(NODES[0])
+    assert copy.bits is not bitmap.bits
+    assert set(bitmap) == set(NODES[:2])
+    assert set(copy) == {NODES[1], NODES[2]}
+
+    # the original is detached as well when it is modified first
+    copy = bitmap.copy()
+    bitmap.add(NODES[3])
+    assert set(copy) == set(NODES[:2])
+    assert set(bitmap) == set(NODES[:2] + NODES[3:])
+
+def test_union_and_difference():
+    bitmap = NodeBitmap(NodeIndex(NODES), NODES[:2])
+
+    assert set(bitmap | [NODES[2]]) == set(NODES[:3])
+    assert set(bitmap - [NODES[0]]) == {NODES[1]}
+    assert set(bitmap) == set(NODES[:2])
+
+def test_new_nodes():
+    # nodes interned after a copy are added to the copy only
+    bitmap = NodeBitmap(NodeIndex(NODES), NODES[:1])
+    copy = bitmap.copy()
+    copy.add('INT_X9Y9/EE2_BEG0')
+
+    assert 'INT_X9Y9/EE2_BEG0' in copy
+    assert 'INT_X9Y9/EE2_BEG0' not in bitmap
+    ids, flags = get_flags(bitmap)
+    assert flags[ids.get('INT_X9Y9/EE2_BEG0', 0)] == 0
+
+def test_state():
+    index = NodeIndex(NODES)
+    bitmap = NodeBitmap(index, NODES[:2])
+
+    # equal members have equal states regardless of the order of the changes
+    other = NodeBitmap(index, reversed(NODES))
+    other -= NODES[2:]
+    assert other.state == bitmap.state
+    assert bitmap.copy().state == bitmap.state
+    assert (bitmap | NODES[2:3]).state != bitmap.state
+
+def test_flags():
+    bitmap = NodeBitmap(NodeIndex(NODES), NODES[:2])
+    ids, flags = get_flags(bitmap)
+    assert [flags[ids.get(node, 0)] for node in NODES] == [1, 1, 0, 0]
+
+    ids, flags = get_flags(set(NODES[:2]))
+    assert [flags[ids.get(node, 0)] for node in NODES] == [1, 1, 0, 0]
+
+def test_pickle():
+    bitmap = NodeBitmap(NodeIndex(NODES), NODES[1:3])
+    loaded = pickle.loads(pickle.dumps(bitmap))
+
+    assert set(loaded) == set(bitmap)
+    assert loaded.state == bitmap.state
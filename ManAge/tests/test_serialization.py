@@ -0,0 +1,57 @@
+import io, bz2, pickle, hashlib
+import pytest
+import utility.serialization as serialization
+import utility.utility_functions as util
+
+DATA = {'pips': {('INT_X2Y3/EE2_BEG0', 'INT_X2Y3/EE2_END0')}, 'weights': [0.5, 1.0, 25], 'name': 'TC0'}
+
+@pytest.mark.parametrize('codec', sorted(serialization.codecs))
+def test_round_trip(tmp_path, codec):
+    content_hash = util.store_data(str(tmp_path), 'TC0.data', DATA, codec=codec)
+
+    assert util.load_data(str(tmp_path), 'TC0.data') == DATA
+    with open(tmp_path / 'TC0.data', 'rb') as file:
+        assert serialization.detect_codec(file) == codec
+
+    with open(tmp_path / 'TC0.data', 'rb') as file:
+        assert hashlib.sha1(serialization.load_payload(file)).hexdigest() == content_hash
+
+def test_uncompressed(tmp_path):
+    util.store_data(str(tmp_path), 'TC0.data', DATA, compress=False)
+    with open(tmp_path / 'TC0.data', 'rb') as file:
+        assert serialization.detect_codec(file) == 'raw'
+
+    assert util.load_data(str(tmp_path), 'TC0.data') == DATA
+
+@pytest.mark.parametrize('legacy, codec', [(bz2.compress, 'bz2 (legacy)'), (lambda payload: payload, 'raw (legacy)')])
+def test_legacy_files(tmp_path, legacy, codec):
+    with open(tmp_path / 'TC0.data', 'wb') as file:
+        file.write(legacy(pickle.dumps(DATA)))
+
+    with open(tmp_path / 'TC0.data', 'rb') as file:
+        assert serialization.detect_codec(file) == codec
+
+    assert util.load_data(str(tmp_path), 'TC0.data') == DATA
+
+def test_registered_codec():
+    codec = serialization.Codec('rev', lambda payload: payload[::-1], lambda payload: payload[::-1])
+    serialization.register_codec(codec)
+    try:
+        file = io.BytesIO()
+        serialization.dump(file, DATA, serialization.get_codec('rev'))
+        file.seek(0)
+        assert serialization.load(file) == DATA
+    finally:
+        del serialization.codecs['rev']
+
+def test_invalid_codecs():
+    with pytest.raises(ValueError):
+        serialization.get_codec('zstd')
+
+    with pytest.raises(ValueError):
+        serialization.register_codec(serialization.Codec('zstd1', bytes, bytes))
+
+    # a file of an unknown codec is not mistaken for a legacy file
+    file = io.BytesIO(serialization.MAGIC + b'zstd' + b'payload')
+    with pytest.raises(ValueError):
+        serialization.load(file)
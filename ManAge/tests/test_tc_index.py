@@ -0,0 +1,74 @@
+import os, json, hashlib
+from types import SimpleNamespace
+import networkx as nx
+import pytest
+import utility.serialization as serialization
+import utility.tc_index as tc_index
+import utility.utility_functions as util
+
+def get_TC(origins, **attributes):
+    CUTs = [SimpleNamespace(origin=origin, G=nx.DiGraph([(f'INT_{origin}/EE2_BEG0', f'INT_{origin}/EE2_END0')])) for origin in origins]
+    LUTs = {'CLEL_R_X2Y3/ALUT': SimpleNamespace(usage='used'), 'CLEL_R_X2Y3/BLUT': SimpleNamespace(usage='free')}
+    FFs = {'CLEL_R_X2Y3/AFF': SimpleNamespace(usage='blocked')}
+    return SimpleNamespace(CUTs=CUTs, LUTs=LUTs, subLUTs={}, FFs=FFs, **attributes)
+
+def test_stored_index(tmp_path):
+    tc_index.store_TC(str(tmp_path), 'TC0.data', get_TC(['X2Y3', 'X2Y3', 'X4Y3']))
+
+    index_file = tmp_path / tc_index.get_index_name('TC0.data')
+    assert index_file.name == 'meta_TC0.json'
+    assert list(tmp_path.glob('TC*')) == [tmp_path / 'TC0.data']
+    with open(index_file) as file:
+        assert tc_index.load_index(tmp_path, 'TC0.data') == json.load(file)
+
+    index = tc_index.load_index(tmp_path, 'TC0.data')
+    assert index['n_CUTs'] == 3 and index['origins'] == {'X2Y3': 2, 'X4Y3': 1}
+    assert index['n_used_nodes'] == 4
+    assert index['LUTs'] == {'used': 1, 'free': 1} and index['FFs'] == {'blocked': 1}
+
+def test_index_is_read_without_the_TC(tmp_path, monkeypatch):
+    tc_index.store_TC(str(tmp_path), 'TC0.data', get_TC(['X2Y3']))
+
+    def load_payload(file):
+        raise AssertionError('the TC is loaded')
+
+    monkeypatch.setattr(serialization, 'load_payload', load_payload)
+    assert tc_index.load_index(tmp_path, 'TC0.data')['n_CUTs'] == 1
+
+def test_stale_index(tmp_path):
+    tc_index.store_TC(str(tmp_path), 'TC0.data', get_TC(['X2Y3']))
+
+    # the TC is replaced without its index
+    content_hash = util.store_data(str(tmp_path), 'TC0.data', get_TC(['X2Y3', 'X4Y3', 'X6Y3']))
+    index = tc_index.load_index(tmp_path, 'TC0.data')
+    assert index['n_CUTs'] == 3 and index['hash'] == content_hash
+
+    # the rebuilt index is stored
+    stat = os.stat(tmp_path / 'TC0.data')
+    with open(tmp_path / 'meta_TC0.json') as file:
+        assert json.load(file) == index
+
+    assert (index['size'], index['mtime_ns']) == (stat.st_size, stat.st_mtime_ns)
+
+def test_missing_index(tmp_path):
+    content_hash = util.store_data(str(tmp_path), 'TC0.data', get_TC(['X2Y3', 'X2Y3']))
+    assert not (tmp_path / 'meta_TC0.json').exists()
+
+    index = tc_index.load_index(tmp_path, 'TC0.data')
+    assert index['origins'] == {'X2Y3': 2} and index['hash'] == content_hash
+    assert (tmp_path / 'meta_TC0.json').exists()
+    with open(tmp_path / 'TC0.data', 'rb') as file:
+        assert hashlib.sha1(serialization.load_payload(file)).hexdigest() == content_hash
+
+def test_relocated_TC(tmp_path):
+    # relocated configurations (Config) count the used nodes of their tiles
+    TC = get_TC([], D_CUTs=[SimpleNamespace(origin='X2Y3'), SimpleNamespace(origin='X4Y3')],
+                used_nodes={'INT_X2Y3': {'EE2_BEG0', 'NN1_BEG0'}, 'INT_X4Y3': {'EE2_BEG0'}})
+    tc_index.store_TC(str(tmp_path), 'TC0.data', TC)
+
+    index = tc_index.load_index(tmp_path, 'TC0.data')
+    assert index['n_CUTs'] == 2 and index['n_used_nodes'] == 3
+
+def test_missing_TC(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        tc_index.load_index(tmp_path, 'TC0.data')
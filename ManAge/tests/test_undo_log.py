@@ -0,0 +1,68 @@
+import networkx as nx
+from conftest import ORIGIN, PIP, NOT_PATH, OUT_PATH
+from xil_res.overlay_graph import OverlayGraph
+from xil_res.path import NotPath, PathOut
+from xil_res.undo_log import UndoLog
+
+def get_state(TC) -> tuple:
+    # the restored edges are appended to the adjacency rows, so the edges are compared regardless of their order
+    edges = sorted((u, v, sorted(data.items())) for u, v, data in TC.G.edges(data=True))
+    LUTs = {name: (LUT.usage, LUT.capacity, len(LUT.subLUTs)) for name, LUT in TC.LUTs.items()}
+    subLUTs = {name: (subLUT.usage, frozenset(subLUT.inputs), subLUT.output) for name, subLUT in TC.subLUTs.items()}
+    FFs = {name: FF.usage for name, FF in TC.FFs.items()}
+    CGs = [(CG.name, CG.is_free, set(CG.FFs)) for CG in TC.CD]
+    return edges, set(TC.blocked_nodes), LUTs, subLUTs, FFs, CGs
+
+def fill_CUT(collection):
+    TC = collection.TC
+    TC.create_CUT(ORIGIN)
+    TC.CUTs[-1].G.add_edge(*PIP)
+    for path_type, nodes in ((PathOut, OUT_PATH), (NotPath, NOT_PATH)):
+        path = path_type()
+        path.nodes = list(nodes)
+        TC.fill_CUT(collection, path)
+
+def test_rollback_of_fill_CUT(collection):
+    TC = collection.TC
+    state = get_state(TC)
+
+    fill_CUT(collection)
+    filled_state = get_state(TC)
+    assert len(TC.undo_log)
+    assert all(node in TC.blocked_nodes for node in NOT_PATH + OUT_PATH)
+    assert filled_state[0] != state[0] and filled_state[2:] != state[2:]
+
+    TC.remove_CUT(collection)
+    assert not TC.CUTs and not len(TC.undo_log)
+    assert get_state(TC) == state
+
+    # the CUT is filled again as if it had not been rolled back
+    fill_CUT(collection)
+    assert get_state(TC) == filled_state
+
+def test_finalized_CUT_is_kept(collection):
+    TC = collection.TC
+    fill_CUT(collection)
+    TC.finalize_CUT(collection, update_search=False)
+
+    assert not len(TC.undo_log)
+    assert all(node not in TC.G for node in NOT_PATH + OUT_PATH)
+    assert len(TC.CUTs) == 1
+
+def test_rollback_of_graph():
+    base = nx.DiGraph([('a', 'b'), ('b', 'c'), ('c', 'a')])
+    base.add_node('c', tile='INT_X2Y3')
+    G = OverlayGraph(base)
+    undo_log = G.undo_log = UndoLog()
+    G.add_edge('a', 'c', weight=2)
+    G.add_edge('a', 'b', weight=3)
+    G.remove_edge('b', 'c')
+    G.remove_node('c')
+    G.add_node('d', tile=None)
+
+    # the log is detached before the rollback, like in MinConfig.fill_CUT
+    G.undo_log = None
+    assert undo_log.rollback() == 7
+    assert nx.utils.graphs_equal(G, base)
+    assert G.nodes['c'] == {'tile': 'INT_X2Y3'}
+    assert base.edges['a', 'b'] == {}
@@ -30,6 +30,7 @@ LUT_Capacity = config['General']['LUT_Capacity']
 subLUT_inputs = config['General']['subLUT_inputs']
 block_mode = config['General']['block_mode']   #global|local
 route_thru = config['General']['route_thru']
+node_cache_size = config['General']['node_cache_size']
 pips_length_dict = {}
 
 
@@ -75,11 +76,20 @@ n_pips_one_CLB = config['PIPs']['n_pips_one_CLB']
 
 ####### Path
 max_path_length = config['Path']['max_path_length']
+search_method = config['Path']['search_method']     #dijkstra|astar
 
 ###### TC
 max_capacity = config['TC']['max_capacity']
 long_TC_process_time = config['TC']['long_TC_process_time']
 long_TC_process_time_local = config['TC']['long_TC_process_time_local']
+budget = config['TC']['budget']     #time|expanded|searches: the TC is finished after a wall time or a number of expanded nodes|path searches
+long_TC_process_work = config['TC']['long_TC_process_work']     #expanded nodes|path searches of a TC under budget expanded|searches, the defaults equal long_TC_process_time(_local) at the ~20000 expanded nodes per second of the router
+long_TC_process_work_local = config['TC']['long_TC_process_work_local']
+wall_time_limit = config['TC']['wall_time_limit']   #long_TC_process_time bounds the TC under budget expanded|searches as well
+n_candidates = config['TC']['n_candidates']   #1: sequential|>1: candidate PIPs routed in parallel
+checkpoint_interval = config['TC']['checkpoint_interval']    #seconds between checkpoints of path_finder.py (see --resume)
+pip_order = config['TC']['pip_order']    #cheapest|hardest|interleaved (see xil_res/pip_order.py)
+pip_order_weight = config['TC']['pip_order_weight']  #weight of pip_v edges to the easiest PIPs under hardest|interleaved
 
 ##### Iteration
 first_iteration = True
@@ -100,6 +110,13 @@ python = 'python' if platform.system() == 'Windows' else 'python3'
 ##### parallel
 n_jobs = config['Parallel']['n_jobs']
 
+##### campaign
+n_campaign_workers = config['Campaign']['n_workers']    #number of clock regions searched concurrently by run_campaign.py
+target_coverage = config['Campaign']['target_coverage']  #minimum coverage of each INT tile
+
+##### serialization
+codec = config['Serialization']['codec']  #raw|zlib|bz2|lz4
+
 ##### CM
 fin = config['CM']['fin']
 D1 = config['CM']['D1']
@@ -0,0 +1,125 @@
+import pickle, bz2, zlib, hashlib
+import utility.config as cfg
+
+try:
+    import lz4.frame as lz4
+except ImportError:
+    lz4 = None
+
+class Codec:
+    """
+    This class describes a compression codec applied to pickled artifacts.
+    """
+    __slots__ = ('name', 'compress', 'decompress')
+    def __init__(self, name: str, compress, decompress):
+        self.name       = name
+        self.compress   = compress
+        self.decompress = decompress
+
+    def __repr__(self):
+        return self.name
+
+    @property
+    def tag(self) -> bytes:
+        return self.name.encode().ljust(4)
+
+# Files written by store_data begin with MAGIC followed by the 4-byte codec tag. The leading null byte can
+# neither begin a bz2 stream (b'BZh') nor a pickle stream (b'\x80'), so the files of older versions are still detected.
+MAGIC = b'\x00MNG'
+HEADER_SIZE = len(MAGIC) + 4
+LEGACY_BZ2 = b'BZh'
+
+codecs = {}
+
+def register_codec(codec: Codec):
+    """This function registers a codec under its name
+
+    :param codec: The codec
+    :type codec: Codec
+    """
+    if len(codec.tag) != 4:
+        raise ValueError(f'Codec name {codec.name} must not exceed 4 characters!')
+
+    codecs[codec.name] = codec
+
+def get_codec(name: str | None = None) -> Codec:
+    """This function returns the specified codec or the configured default one
+
+    :param name: Codec name, defaults to None
+    :type name: str | None, optional
+    :raises ValueError: When the codec is not registered
+    :return: The codec
+    :rtype: Codec
+    """
+    name = cfg.codec if name is None else name
+    if name not in codecs:
+        raise ValueError(f'Unsupported codec: {name}! Available codecs: {list(codecs)}')
+
+    return codecs[name]
+
+def dump(file, data, codec: Codec):
+    """This function pickles the data and writes it to the specified file object with the codec header
+
+    :param file: Writable binary file object
+    :type file: BinaryIO
+    :param data: Data to be stored
+    :type data: Any
+    :param codec: The codec
+    :type codec: Codec
+    :return: SHA-1 hash of the pickled data
+    :rtype: str
+    """
+    payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    file.write(MAGIC + codec.tag)
+    file.write(codec.compress(payload))
+    return hashlib.sha1(payload).hexdigest()
+
+def load(file):
+    """This function reads a file object written by dump or by older versions (bz2 or plain pickle)
+
+    :param file: Readable binary file object
+    :type file: BinaryIO
+    :return: The unpickled data
+    :rtype: Any
+    """
+    return pickle.loads(load_payload(file))
+
+def load_payload(file) -> bytes:
+    """This function reads the pickled data of a file object written by dump or by older versions (bz2 or plain pickle).
+    The SHA-1 hash of the payload is the one returned by dump.
+
+    :param file: Readable binary file object
+    :type file: BinaryIO
+    :return: The pickled data
+    :rtype: bytes
+    """
+    header = file.read(HEADER_SIZE)
+    if header.startswith(MAGIC):
+        tag = header[len(MAGIC):].decode().rstrip()
+        return get_codec(tag).decompress(file.read())
+
+    payload = header + file.read()
+    if payload.startswith(LEGACY_BZ2):
+        payload = bz2.decompress(payload)
+
+    return payload
+
+def detect_codec(file) -> str:
+    """This function detects the codec of the specified file object
+
+    :param file: Readable binary file object
+    :type file: BinaryIO
+    :return: Codec name
+    :rtype: str
+    """
+    header = file.read(HEADER_SIZE)
+    if header.startswith(MAGIC):
+        return header[len(MAGIC):].decode().rstrip()
+
+    return 'bz2 (legacy)' if header.startswith(LEGACY_BZ2) else 'raw (legacy)'
+
+register_codec(Codec('raw', lambda payload: payload, lambda payload: payload))
+register_codec(Codec('zlib', lambda payload: zlib.compress(payload, 1), zlib.decompress))
+register_codec(Codec('bz2', bz2.compress, bz2.decompress))
+if lz4 is not None:
+    register_codec(Codec('lz4', lz4.compress, lz4.decompress))
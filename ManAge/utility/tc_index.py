@@ -0,0 +1,106 @@
+import os, json, pickle, hashlib
+from collections import Counter
+import utility.utility_functions as util
+import utility.serialization as serialization
+
+# the sidecar of TC<idx>.data is meta_TC<idx>.json, so that it is not matched by the TC* patterns of the stored configurations
+PREFIX = 'meta_'
+
+# the index answers queries on the summary of the configurations (e.g., TestCollection.get_num_occupied_CUTs and
+# consolidate_TCs.py); readers of the CUTs themselves (gen_constraint.py, RLOC_Collection.fill_TC) load the configurations
+
+def get_index_name(file_name: str) -> str:
+    """This function returns the name of the sidecar index of the specified configuration file
+
+    :param file_name: Name of the configuration file (e.g., TC0.data)
+    :type file_name: str
+    :return: Name of the sidecar index
+    :rtype: str
+    """
+    return f'{PREFIX}{os.path.splitext(file_name)[0]}.json'
+
+def create_index(TC, data_path: str, content_hash: str) -> dict:
+    """This function summarizes a minimal (MinConfig) or relocated (Config) configuration
+
+    :param TC: Test configuration
+    :type TC: MinConfig|Config
+    :param data_path: Path to the stored configuration file
+    :type data_path: str
+    :param content_hash: SHA-1 hash of the stored payload (see serialization.dump)
+    :type content_hash: str
+    :return: Index of the configuration
+    :rtype: dict
+    """
+    if hasattr(TC, 'D_CUTs'):
+        CUTs = TC.D_CUTs
+        n_used_nodes = sum(len(ports) for ports in TC.used_nodes.values())
+    else:
+        CUTs = TC.CUTs
+        n_used_nodes = len({node for cut in CUTs for node in cut.G})
+
+    stat = os.stat(data_path)
+    return {
+        'type'          : type(TC).__name__,
+        'size'          : stat.st_size,
+        'mtime_ns'      : stat.st_mtime_ns,
+        'hash'          : content_hash,
+        'n_CUTs'        : len(CUTs),
+        'origins'       : dict(Counter(cut.origin for cut in CUTs)),
+        'n_used_nodes'  : n_used_nodes,
+        'LUTs'          : dict(Counter(LUT.usage for LUT in TC.LUTs.values())),
+        'subLUTs'       : dict(Counter(subLUT.usage for subLUT in TC.subLUTs.values())),
+        'FFs'           : dict(Counter(FF.usage for FF in TC.FFs.values()))
+    }
+
+def store_index(Path, FileName, index: dict):
+    # the index is replaced atomically, so that an interrupted store leaves the previous one
+    index_path = os.path.join(Path, get_index_name(FileName))
+    with open(f'{index_path}.{os.getpid()}.tmp', 'w') as file:
+        json.dump(index, file)
+
+    os.replace(f'{index_path}.{os.getpid()}.tmp', index_path)
+
+def store_TC(Path, FileName, TC):
+    """This function stores a configuration with its sidecar index
+
+    :param Path: Directory of the configuration
+    :type Path: str
+    :param FileName: Name of the configuration file
+    :type FileName: str
+    :param TC: Test configuration
+    :type TC: MinConfig|Config
+    """
+    content_hash = util.store_data(Path, FileName, TC)
+    store_index(Path, FileName, create_index(TC, os.path.join(Path, FileName), content_hash))
+
+def load_index(Path, FileName) -> dict:
+    """This function returns the sidecar index of a stored configuration. The index is rebuilt from the configuration
+    if it is missing or the configuration has been modified since the index was stored.
+
+    :param Path: Directory of the configuration
+    :type Path: str
+    :param FileName: Name of the configuration file
+    :type FileName: str
+    :return: Index of the configuration
+    :rtype: dict
+    """
+    Path = str(Path)
+    stat = os.stat(os.path.join(Path, FileName))
+    index_path = os.path.join(Path, get_index_name(FileName))
+    if os.path.exists(index_path):
+        with open(index_path) as file:
+            index = json.load(file)
+
+        if (index['size'], index['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+            return index
+
+    # the hash is the one of the stored payload, since pickling the loaded configuration again may not reproduce it
+    with open(os.path.join(Path, FileName), 'rb') as file:
+        payload = serialization.load_payload(file)
+
+    TC = pickle.loads(payload)
+    content_hash = hashlib.sha1(payload).hexdigest()
+    index = create_index(TC, os.path.join(Path, FileName), content_hash)
+    store_index(Path, FileName, index)
+
+    return index
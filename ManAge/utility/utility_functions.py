@@ -1,5 +1,6 @@
-import pickle, os, bz2, shutil
+import os, shutil
 from pathlib import Path
+import utility.serialization as serialization
 
 def create_folder(FolderPath):
     try:
@@ -9,19 +10,15 @@ def create_folder(FolderPath):
         shutil.rmtree(FolderPath)
         os.mkdir(FolderPath)
 
-def load_data(Path, FileName, compress=True):
+def load_data(Path, FileName):
+    # the codec is detected from the file header
     data_path = os.path.join(Path, FileName)
-    if compress:
-        ifile = bz2.BZ2File(data_path, 'rb')
-        data = pickle.load(ifile)
-        ifile.close()
-    else:
-        with open(data_path, 'rb') as file:
-            data = pickle.load(file)
+    with open(data_path, 'rb') as file:
+        data = serialization.load(file)
 
     return data
 
-def store_data(Path, FileName, data, SubFolder=False, FolderName=None, compress=True):
+def store_data(Path, FileName, data, SubFolder=False, FolderName=None, compress=True, codec=None):
     if SubFolder:
         folder_path = os.path.join(Path, FolderName)
         try:
@@ -33,13 +30,11 @@ def store_data(Path, FileName, data, SubFolder=False, FolderName=None, compress=
     else:
         data_path = os.path.join(Path, FileName)
 
-    if compress:
-        ofile = bz2.BZ2File(data_path, 'wb')
-        pickle.dump(data, ofile)
-        ofile.close()
-    else:
-        with open(data_path, 'wb') as file:
-            pickle.dump(data, file)
+    codec = serialization.get_codec(codec if compress else 'raw')
+    with open(data_path, 'wb') as file:
+        content_hash = serialization.dump(file, data, codec)
+
+    return content_hash
 
 def extend_dict(dict_name, key, value, extend=False, value_type='list'):
     if value_type == 'set':
@@ -2,6 +2,7 @@ import copy
 import re
 import sys, time, os
 from pathlib import Path
+import numpy as np
 import networkx as nx
 #sys.path.insert(0, r'..\utility')
 from typing import Set, Tuple, List
@@ -11,8 +12,12 @@ import utility.config as cfg
 from xil_res.node import Node as nd
 from xil_res.edge import Edge
 from xil_res.clock_region import CR
-from xil_res.router import path_finder, weight_function
+from xil_res.router import path_finder, weight_function, dijkstra_tree, get_reachable_nodes
 from xil_res.primitive import FF, LUT, SubLUT
+from xil_res.pip_template import PipTemplate
+from xil_res.graph_cache import GraphCache
+from xil_res.edge_weights import EdgeWeights
+from arch.device_store import DeviceStore
 
 class Arch:
 
@@ -20,12 +25,16 @@ class Arch:
     def __init__(self, name: str, non_clb_tiles=False, constraint=False):
         self.name               = name.lower()
         self.pips               = set()
+        self.pip_template       = None
         self.wires_dict         = {}
         self.tiles_map          = {}
         self.CRs                = set()
         self.site_dict          = {}
         self.G                  = nx.DiGraph()
         self.pips_length_dict   = {}
+        self.length_tiles       = set()
+        self.blocking_candidates = None
+        self.graph_cache        = None
         self.init(non_clb_tiles, constraint)
         self.weight             = weight_function(self.G, 'weight')
 
@@ -36,20 +45,25 @@ class Arch:
         state = self.__dict__.copy()  # Copy the dict to avoid modifying the original
         # Remove the attribute that should not be pickled
         del state['weight']
+        state.pop('blocking_candidates', None)
+        state.pop('graph_cache', None)
         return state
 
     def __setstate__(self, state):
         # Restore instance attributes (temp_value will be missing)
         self.__dict__.update(state)
+        self.blocking_candidates = None
+        self.graph_cache = None
 
 
     def init(self, non_clb_tiles, constraint):
-        device = util.load_data(cfg.model_path, f'device_{self.name}.data')
+        device = self.load_device()
         if constraint:
             self.site_dict = device.clb_site_dict
             return
 
         self.pips = device.pips
+        self.pip_template = PipTemplate(self.pips)
         self.site_dict = device.clb_site_dict
         self.wires_dict = device.wires_dict
         self.init_tiles_map()
@@ -69,6 +83,17 @@ class Arch:
             except:
                 pass
 
+    def load_device(self):
+        """This function loads the device model. The memory-mapped device store is preferred over the pickled model.
+
+        :return: Device model
+        :rtype: DeviceStore|DeviceModel
+        """
+        if DeviceStore.exists(cfg.model_path, self.name):
+            return DeviceStore.load(cfg.model_path, self.name)
+
+        return util.load_data(cfg.model_path, f'device_{self.name}.data')
+
     def init_tiles_map(self):
         """This function sets the tiles_map of he device under test
         key: coordinate
@@ -193,16 +218,34 @@ class Arch:
         :return: A set of nodes which must be excluded in routing    
         :rtype: Set[str]
         """
-        #these are out mode nodes that have pips back to the INT tile
-        out_mode_nodes = (node for node in self.G if nd.get_INT_node_mode(self.G, node) == 'out')
-        blocking_nodes = {node for node in out_mode_nodes if self.G.out_degree(node) > 1}
         valid_blocking_nodes = set()
-        for node in blocking_nodes:
-            if any(map(lambda x: nd.get_clb_node_type(x) == 'FF_in' and TC.get_clock_domain(x).name != 'launch', self.G.neighbors(node))):
+        for node, FF_ins in self.get_blocking_candidates().items():
+            if any(map(lambda x: TC.get_clock_domain(x).name != 'launch', FF_ins)):
                 valid_blocking_nodes.add(node)
 
         return valid_blocking_nodes
 
+    def get_blocking_candidates(self):
+        """This function extracts the out mode nodes with downstream PIPs and their FF inputs (X|I). They only depend on
+        the structure of the architecture graph, so they are extracted once per graph rather than for each NotPath.
+
+        :return: A dictionary with the out mode nodes as keys and their FF_in neighbors as values
+        :rtype: dict
+        """
+        if self.blocking_candidates is None or self.blocking_candidates[0] is not self.G:
+            #these are out mode nodes that have pips back to the INT tile
+            out_mode_nodes = (node for node in self.G if nd.get_INT_node_mode(self.G, node) == 'out')
+            blocking_nodes = {node for node in out_mode_nodes if self.G.out_degree(node) > 1}
+            candidates = {}
+            for node in blocking_nodes:
+                FF_ins = [neigh for neigh in self.G.neighbors(node) if nd.get_clb_node_type(neigh) == 'FF_in']
+                if FF_ins:
+                    candidates[node] = FF_ins
+
+            self.blocking_candidates = (self.G, candidates)
+
+        return self.blocking_candidates[1]
+
 
     ############ Graph Generation ###############
     def gen_pips(self, tile: str) -> Set[Tuple[str, str]]:
@@ -213,7 +256,7 @@ class Arch:
         :return: A set of PIPs
         :rtype: Set[Tuple[str, str]]
         """
-        pips = {(f'{tile}/{pip[0]}', f'{tile}/{pip[1]}') for pip in self.pips}
+        pips = set(self.pip_template.iter_pips(tile))
 
         return pips
 
@@ -251,24 +294,20 @@ class Arch:
         :rtype: nx.DiGraph
         """
         G = nx.DiGraph()
-        edges = set()
         desired_tiles = set(filter(lambda tile: xlim_down <= nd.get_x_coord(tile) <= xlim_up and ylim_down <= nd.get_y_coord(tile) <= ylim_up, self.wires_dict))
         desired_INTs = set(filter(lambda tile: nd.get_tile_type(tile) == cfg.INT_label, desired_tiles))
         desired_CLBs = desired_tiles - desired_INTs
 
         # wires
         for tile in desired_tiles:
-            edges.update(self.wires_dict[tile])
+            G.add_edges_from(self.wires_dict[tile], weight=default_weight)
 
-        # pips
-        for tile in desired_INTs:
-            edges.update(self.gen_pips(tile))
+        # pips are expanded from the template tile by tile
+        self.pip_template.add_to_graph(G, desired_INTs, weight=default_weight)
 
         # site pips
         for tile in desired_CLBs:
-            edges.update(self.gen_site_pips(tile))
-
-        G.add_edges_from(edges, weight=default_weight)
+            G.add_edges_from(self.gen_site_pips(tile), weight=default_weight)
 
         return G
 
@@ -283,14 +322,17 @@ class Arch:
         if re.match('X\d+Y\d+', tile):
             tile = f'{cfg.INT_label}_{tile}'
 
-        if not (f'G_{self.name}_{tile}.data' in os.listdir(cfg.graph_path)):
+        # graphs of origins with identical windows are relocated instead of being rebuilt
+        graph_cache = self.get_graph_cache()
+        stored = graph_cache.has_graph(tile)
+        G = graph_cache.get_graph(tile)
+        new_graph = G is None
+        if new_graph:
             x, y = nd.get_x_coord(tile), nd.get_y_coord(tile)
             xlim_down, xlim_up, ylim_down, ylim_up = (x - 12 - 4), (x + 12 + 4), (y - 12 - 4), (y + 12 + 4)
             G = self.get_graph(default_weight=default_weight, xlim_down=xlim_down, xlim_up=xlim_up, ylim_down=ylim_down, ylim_up=ylim_up)
-        else:
-            G = util.load_data(cfg.graph_path, f'G_{self.name}_{tile}.data')
 
-        pipjuncs = {node for pip in self.gen_pips(tile) for node in pip}
+        pipjuncs = self.pip_template.get_pipjuncs(tile)
         in_ports = set(filter(lambda node: nd.get_INT_node_mode(G, node) == 'in', pipjuncs))
         out_ports = set(filter(lambda node: nd.get_INT_node_mode(G, node) == 'out', pipjuncs))
 
@@ -302,40 +344,51 @@ class Arch:
         G.add_edges_from(edges, weight=0)
 
         # search for paths to/from in/out ports
-        used_tiles = set()
-        path_in_length_dict = {}
-        path_out_length_dict = {}
-        for pipjunc in in_ports:
-            try:
-                path = path_finder(G, 's', pipjunc, weight='weight', dummy_nodes=['s', 't'], conflict_free=False)[1:]
-                path_in_length_dict[pipjunc] = len(path)
-                used_tiles.update([nd.get_tile(node) for node in path])
-            except:
-                pass
-
-        for pipjunc in out_ports:
-            try:
-                path = path_finder(G, pipjunc, 't', weight='weight', dummy_nodes=['s', 't'], conflict_free=False)[:-1]
-                path_out_length_dict[pipjunc] = len(path)
-                used_tiles.update([nd.get_tile(node) for node in path])
-            except:
-                pass
+        pips_length_dict, used_tiles = self.get_pips_path_length(G, tile, in_ports, out_ports)
 
         # remove nodes whose tiles have not been used
         G.remove_nodes_from({'s', 't'})
         unused_tile_nodes = {node for node in G if nd.get_tile(node) not in used_tiles}
         G.remove_nodes_from(unused_tile_nodes)
 
-        self.G = copy.deepcopy(G)
+        self.G = self.get_sorted_graph(G)
+        nd.preload(self.G)
 
         # set pips_length_dict
-        pips = self.gen_pips(tile)
-        for pip in pips:
-            if pip[0] in path_in_length_dict and pip[1] in path_out_length_dict:
-                self.pips_length_dict[pip] = path_in_length_dict[pip[0]] + path_out_length_dict[pip[1]]
+        self.pips_length_dict.update(pips_length_dict)
+
+        # relocated graphs are stored under this origin as well, so that they are not relocated again
+        if not stored:
+            graph_cache.add_graph(tile, G)
+
+    @staticmethod
+    def get_sorted_graph(G: nx.DiGraph) -> nx.DiGraph:
+        """This function returns a copy of the specified graph whose nodes and edges are added in sorted order.
+        The graphs are built from sets, so the order of their edges, which sets the edge IDs and breaks the ties of the path
+        searches, would otherwise depend on the hash seed.
+
+        :param G: Architecture graph
+        :type G: nx.DiGraph
+        :return: Sorted architecture graph
+        :rtype: nx.DiGraph
+        """
+        sorted_G = nx.DiGraph()
+        sorted_G.graph.update(copy.deepcopy(G.graph))
+        sorted_G.add_nodes_from(sorted(G.nodes(data=True)))
+        sorted_G.add_edges_from((u, v, dict(data)) for u, v, data in sorted(G.edges(data=True), key=lambda edge: edge[:2]))
+
+        return sorted_G
+
+    def get_graph_cache(self) -> GraphCache:
+        """This function returns the graph cache of the device, which is created at the first use
+
+        :return: Graph cache
+        :rtype: GraphCache
+        """
+        if self.graph_cache is None:
+            self.graph_cache = GraphCache(self)
 
-        if not (f'G_{self.name}_{tile}.data' in os.listdir(cfg.graph_path)):
-            util.store_data(cfg.graph_path, f'G_{self.name}_{tile}.data', G)
+        return self.graph_cache
 
     def set_pips_length_dict(self, tile: str):
         """This function calculates the length of shortest path for covering all PIPs of the specified int tile
@@ -349,17 +402,87 @@ class Arch:
         edges.update(set(product(sinks, {'t'})))
         self.G.add_edges_from(edges, weight=0)
 
-        pips = self.gen_pips(tile)
-        for pip in pips:
-            try:
-                path_in = nx.shortest_path(self.G, 's', pip[0], weight='weight')[1:]
-                path_out = nx.shortest_path(self.G, pip[1], 't', weight='weight')[:-1]
-                self.pips_length_dict[pip] = len(path_in + path_out)
-            except:
-                continue
+        pips_length_dict, _ = self.get_pips_path_length(self.G, tile)
+        self.pips_length_dict.update(pips_length_dict)
+        self.length_tiles.add(tile)
 
         self.G.remove_nodes_from({'s', 't'})
 
+    def get_pips_path_length(self, G, tile: str, in_ports=None, out_ports=None):
+        """This function calculates the length of the shortest path covering each PIP of the specified INT tile and the tiles used by these paths.
+        A single forward search from the virtual source and a single reverse search to the virtual sink serve all PIPs.
+
+        :param G: Architecture graph including the virtual source and sink nodes
+        :type G: nx.DiGraph
+        :param tile: Desired INT tile
+        :type tile: str
+        :param in_ports: Pipjuncs to be reached from the source, defaults to None (all pipjuncs)
+        :type in_ports: Set[str], optional
+        :param out_ports: Pipjuncs from which the sink must be reached, defaults to None (all pipjuncs)
+        :type out_ports: Set[str], optional
+        :return: PIPs' path lengths and used tiles
+        :rtype: Tuple[dict, Set[str]]
+        """
+        pipjuncs = self.pip_template.get_pipjuncs(tile)
+        in_ports = pipjuncs if in_ports is None else in_ports
+        out_ports = pipjuncs if out_ports is None else out_ports
+
+        _, parents_in, hops_in = dijkstra_tree(G, 's', weight='weight')
+        _, parents_out, hops_out = dijkstra_tree(G, 't', weight='weight', reverse=True)
+
+        # tiles of the nodes on the shortest paths (walks stop at the first node already visited)
+        used_tiles = set()
+        for parents, ports, root in ((parents_in, in_ports, 's'), (parents_out, out_ports, 't')):
+            visited = {root}
+            for node in filter(lambda port: port in parents, ports):
+                while node not in visited:
+                    visited.add(node)
+                    used_tiles.add(nd.get_tile(node))
+                    node = parents[node]
+
+        pips_length_dict = {}
+        for pip in self.pip_template.iter_pips(tile):
+            if pip[0] in in_ports and pip[1] in out_ports and pip[0] in hops_in and pip[1] in hops_out:
+                pips_length_dict[pip] = hops_in[pip[0]] + hops_out[pip[1]]
+
+        return pips_length_dict, used_tiles
+
+    def prepare(self, origin, use_prepared=True):
+        """This function prepares the light architecture graph and the PIP length table of the specified origin for path finding.
+        Data prepared in advance (prepare_graphs.py) is loaded when available.
+
+        :param origin: Desired origin
+        :type origin: str
+        :param use_prepared: Load the prepared data if available, defaults to True
+        :type use_prepared: bool, optional
+        """
+        desired_tile = f'{cfg.INT_label}_{origin}'
+        prepared = self.get_graph_cache().load_prepared(desired_tile) if use_prepared else None
+        if prepared is None:
+            self.set_compressed_graph(desired_tile)
+            self.reform_cost()
+            self.remove_untested_edges()
+            self.set_pips_length_dict(desired_tile)
+        else:
+            self.G = self.get_sorted_graph(prepared['G'])
+            self.pips_length_dict = prepared['pips_length_dict']
+            self.length_tiles.add(desired_tile)
+            nd.preload(self.G)
+            EdgeWeights.attach(self.G)
+
+        self.weight = weight_function(self.G, 'weight')
+
+    def store_prepared(self, origin) -> dict:
+        """This function stores the prepared graph and PIP length table of the specified origin in the graph cache
+
+        :param origin: Desired origin
+        :type origin: str
+        :return: Manifest entry of the prepared data
+        :rtype: dict
+        """
+        desired_tile = f'{cfg.INT_label}_{origin}'
+        return self.get_graph_cache().store_prepared(desired_tile, self.G, self.pips_length_dict)
+
     def remove_untested_edges(self):
         """This function removees all edges which cannot be covered from the light architecture graph of the device under test
         """
@@ -378,46 +501,29 @@ class Arch:
         :return: Local PIPs
         :rtype: Set[Tuple[str, str]]
         """
-        G = copy.deepcopy(self.G)
-        invalid_nodes = set(filter(lambda node: nd.get_coordinate(node) != nd.get_coordinate(desired_tile), self.G))
-        G.remove_nodes_from(invalid_nodes)
-        G_copy = copy.deepcopy(G)
+        coordinate = nd.get_coordinate(desired_tile)
+        local_nodes = {node for node in self.G if nd.get_coordinate(node) == coordinate}
 
         pips = self.gen_pips(desired_tile)
-        all_sources = list(filter(cfg.Source_pattern.match, G))
-        all_sinks = list(filter(cfg.Sink_pattern.match, G))
+        all_sources = list(filter(cfg.Source_pattern.match, local_nodes))
+        all_sinks = list(filter(cfg.Sink_pattern.match, local_nodes))
         covered_pips = set()
 
         for group, conflict_group in cfg.clock_groups.items():
             sources = set(filter(lambda node: nd.get_clock_group(node) == group, all_sources))
             sinks = set(filter(lambda node: nd.get_clock_group(node) == conflict_group, all_sinks))
-
-            # remove CLB nodes whose directions are different from the group and conflict_group
-            forbidden_nodes = {node for node in G if (nd.get_clock_group(node) is not None) and nd.get_clock_group(node) not in {group, conflict_group}}
-            G.remove_nodes_from(forbidden_nodes)
-
-            edges = set(product({cfg.virtual_source_node}, sources))
-            for edge in edges:
-                G.add_edge(*edge, weight=0)
-
-            edges = set(product(sinks, {cfg.virtual_sink_node}))
-            for edge in edges:
-                G.add_edge(*edge, weight=0)
-
             if not (sources and sinks):
                 continue
 
-            pip_u = {pip[0] for pip in pips}
-            pip_v = {pip[1] for pip in pips}
-
+            # exclude CLB nodes whose directions are different from the group and conflict_group
+            valid_nodes = {node for node in local_nodes if nd.get_clock_group(node) in {None, group, conflict_group}}
+            G = nx.subgraph_view(self.G, filter_node=valid_nodes.__contains__)
 
-            no_path_ports = set(filter(lambda node: not nx.has_path(G, cfg.virtual_source_node, node), pip_u))
-            no_path_ports.update(filter(lambda node: not nx.has_path(G, node, cfg.virtual_sink_node), pip_v))
+            # nodes reachable from the sources and nodes reaching the sinks
+            reached_nodes = get_reachable_nodes(G, sources)
+            reaching_nodes = get_reachable_nodes(G, sinks, reverse=True)
 
-            covered_pips.update(set(filter(lambda pip: pip[0] not in no_path_ports and pip[1] not in no_path_ports, pips)))
-            pips -= covered_pips
-
-            G = copy.deepcopy(G_copy)
+            covered_pips.update(set(filter(lambda pip: pip[0] in reached_nodes and pip[1] in reaching_nodes, pips)))
 
         return covered_pips
 
@@ -435,7 +541,8 @@ class Arch:
         if not self.G:
             self.set_compressed_graph(desired_tile)
 
-        self.set_pips_length_dict(desired_tile)
+        if desired_tile not in self.length_tiles:
+            self.set_pips_length_dict(desired_tile)
 
         if local:
             pips = self.get_local_pips(desired_tile)
@@ -443,6 +550,7 @@ class Arch:
             # remove nodes whose coordinates are different from desired_tile
             invalid_nodes = set(filter(lambda node: nd.get_coordinate(node) != nd.get_coordinate(desired_tile), self.G))
             self.G.remove_nodes_from(invalid_nodes)
+            self.blocking_candidates = None
         else:
             pips = set(self.pips_length_dict.keys())
 
@@ -467,21 +575,30 @@ class Arch:
     def reform_cost(self):
         """This function modifies the initial weights of various edges in the light architecture graph
         """
-        for edge in self.G.edges():
-            if nd.get_tile(edge[0]) == nd.get_tile(edge[1]):
-                if nd.get_tile_type(edge[0]) =='CLB':
-                    if any(map(lambda node: cfg.MUXED_CLB_out_pattern.match(node), edge)):
-                        weight = 100
-                    elif cfg.LUT_in6_pattern.match(edge[0]):
-                        weight = 50
-                    else:
-                        weight = 25  # CLB_Route_Thru
+        weights = EdgeWeights.attach(self.G)
+        costs = weights.get_mask('reform_cost', self.get_reform_cost)
+        reformed = ~np.isnan(costs)
+        weights.array[reformed] = costs[reformed]
+
+    @staticmethod
+    def get_reform_cost(edge: Tuple[str, str]) -> float:
+        """This function returns the initial weight of the specified edge if it must be reformed
+
+        :param edge: Edge
+        :type edge: Tuple[str, str]
+        :return: Weight or NaN if the weight is kept
+        :rtype: float
+        """
+        if nd.get_tile(edge[0]) == nd.get_tile(edge[1]):
+            if nd.get_tile_type(edge[0]) =='CLB':
+                if any(map(lambda node: cfg.MUXED_CLB_out_pattern.match(node), edge)):
+                    return 100
+                elif cfg.LUT_in6_pattern.match(edge[0]):
+                    return 50
                 else:
-                    continue
-            else:
-                continue
+                    return 25  # CLB_Route_Thru
 
-            self.G.get_edge_data(*edge)['weight'] = weight
+        return np.nan
 
     def reset_costs(self, test_collection):
         """This function resets the weights of the architecture graph's edges
@@ -490,12 +607,10 @@ class Arch:
         :type test_collection: TestCollection
         """
         desired_tile, queue = test_collection.origin, test_collection.queue
-        for edge in self.G.edges:
-            weight = self.weight(*edge, self.G.get_edge_data(*edge))
-            if Edge(edge).get_type() == 'pip' and nd.get_tile(edge[0]) == desired_tile and edge not in queue:
-                weight += 0.5
-
-            self.G.get_edge_data(*edge)['weight'] = weight
+        weights = EdgeWeights.attach(self.G)
+        covered_pips = weights.get_pip_mask(desired_tile).copy()
+        covered_pips[EdgeWeights.get_ids(self.G, queue)] = False
+        weights.array[covered_pips] += 0.5
 
     def get_tile_map_type(self, coordinate):
         """This function determines at wich directions the specified coordinate has a CLB
@@ -560,6 +675,6 @@ class Arch:
         :rtype: List
         """
         model_dir = Path(__file__).parent.parent.parent / 'models'
-        models = [model.stem.split('_')[-1] for model in model_dir.iterdir()]
+        models = list(dict.fromkeys(model.stem.split('_')[-1] for model in model_dir.iterdir()))
 
         return models
\ No newline at end of file
@@ -0,0 +1,86 @@
+import os
+import multiprocessing as mp
+from tqdm import tqdm
+
+# TC and test collection of a worker, with the number of rounds it has applied (see CandidatePool)
+worker_state = None
+
+class CandidatePool:
+    """
+    This class routes the CUTs of candidate PIPs in worker processes forked once per TC. The workers follow the state of
+    the TC by applying the rounds of add_speculative_CUT (the failed candidates and the committed CUT) that they have not
+    seen yet, and roll back each candidate they route.
+    """
+    __slots__ = ('pool', 'rounds', 'synced', 'n_workers')
+    def __init__(self, TC, test_collection, n_workers: int):
+        global worker_state
+        self.rounds     = []
+        self.synced     = {}
+        self.n_workers  = n_workers
+
+        # the workers are forked in the constructor of the pool and keep their copy of the state
+        worker_state = {'TC': TC, 'test_collection': test_collection, 'n_rounds': 0, 'prepared': False}
+        try:
+            self.pool = mp.get_context('fork').Pool(n_workers, initializer=init_worker)
+        finally:
+            worker_state = None
+
+    def __repr__(self):
+        return f'CandidatePool({self.n_workers} workers, {len(self.rounds)} rounds)'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.pool.terminate()
+        self.pool.join()
+
+    def add_round(self, entry: dict):
+        """This function records a round applied to the TC, so that the workers apply it before their next candidate
+
+        :param entry: Failed candidates and the committed CUT (see MinConfig.apply_round)
+        :type entry: dict
+        """
+        self.rounds.append(entry)
+
+    def map(self, heads):
+        """This function routes a CUT for each of the specified PIP heads
+
+        :param heads: Heads of the candidate PIPs
+        :type heads: List[str]
+        :return: Result of MinConfig.route_candidate for each head
+        :rtype: List[tuple]
+        """
+        # only the rounds that a worker may not have applied yet are sent
+        start = min(self.synced.values()) if len(self.synced) == self.n_workers else 0
+        tasks = [(start, self.rounds[start:], head) for head in heads]
+        results = self.pool.map(route_candidate, tasks, chunksize=1)
+        for pid, n_rounds, *_ in results:
+            self.synced[pid] = n_rounds
+
+        return [result[2:] for result in results]
+
+def init_worker():
+    # the progress bar is only shown by the main process
+    worker_state['test_collection'].pbar = tqdm(disable=True)
+
+def route_candidate(task):
+    start, rounds, head = task
+    TC, test_collection = worker_state['TC'], worker_state['test_collection']
+    if worker_state['n_rounds'] < start:
+        raise RuntimeError(f'Worker {os.getpid()} has missed rounds {worker_state["n_rounds"]}-{start} of the TC')
+
+    # the worker repeats the steps of fill_CUTs that changed the TC since its last candidate
+    for entry in rounds[worker_state['n_rounds'] - start:]:
+        if not worker_state['prepared']:
+            TC.prepare_pips(test_collection)
+
+        TC.apply_round(test_collection, entry)
+        worker_state['n_rounds'] += 1
+        worker_state['prepared'] = False
+
+    if not worker_state['prepared']:
+        TC.prepare_pips(test_collection)
+        worker_state['prepared'] = True
+
+    return (os.getpid(), worker_state['n_rounds'], *TC.route_candidate(test_collection, head))
@@ -62,7 +62,7 @@ class ClockDomain:
         if self.type == 'sink':
             edges = set(product(pred_neigh_nodes, {self.src_sink_node}))
 
-        G.add_edges_from(edges, weight=0)
+        G.add_edges_from(sorted(edges), weight=0)
 
     def get_virtual_edges(self, *FF_nodes) -> Set[Tuple[str, str]] | Set:
         """Returns a set of edges between the specified clock domain's source/sink node and specified FF nodes
@@ -195,7 +195,7 @@ class ClockGroup:
         conflicting_FF_nodes = self.get_conflicting_FF_nodes(test_collection)
         switched_conflicting_FF_nodes = self.switch_FF_nodes(*conflicting_FF_nodes)
         edges = self.CD.get_virtual_edges(*switched_conflicting_FF_nodes)
-        test_collection.TC.G.remove_edges_from(edges)
+        test_collection.TC.G.remove_edges_from(sorted(edges))
 
         # block nodes
         #test_collection.TC.blocked_nodes.update(switched_conflicting_FF_nodes)
@@ -229,7 +229,7 @@ class ClockGroup:
             switched_FF_nodes = self.switch_FF_nodes(*self.FFs)
             edges.update(other_CD.get_virtual_edges(*switched_FF_nodes))
 
-        G.remove_edges_from(edges)
+        G.remove_edges_from(sorted(edges))
 
         # block nodes
         #test_collection.TC.blocked_nodes.update(switched_FF_nodes)
@@ -0,0 +1,134 @@
+import numpy as np
+import networkx as nx
+from typing import Callable, Iterable, Tuple
+from xil_res.node import Node as nd
+
+class EdgeWeights:
+    """
+    This class stores the weights of the edges of an architecture graph in a contiguous float array indexed by edge ID.
+    The ID of an edge is kept in its attribute dictionary ('id') and replaces its 'weight' attribute.
+    Edges to or from virtual nodes (without a tile) keep their 'weight' attribute.
+    Static per-edge data (e.g., masks of PIPs) is computed once and shared by the copies of the graph.
+    """
+    __slots__ = ('edges', 'array', 'cache')
+    def __init__(self, G: nx.DiGraph, default_weight=1):
+        self.edges  = []
+        weights     = []
+        for u, v, data in G.edges(data=True):
+            if '/' not in u or '/' not in v:
+                continue
+
+            data['id'] = len(self.edges)
+            self.edges.append((u, v))
+            weights.append(data.pop('weight', default_weight))
+
+        self.array  = np.array(weights, dtype=np.float64)
+        self.cache  = {}
+
+    def __repr__(self):
+        return f'EdgeWeights({len(self)} edges)'
+
+    def __len__(self):
+        return len(self.edges)
+
+    def __deepcopy__(self, memo):
+        # only the weights belong to a copy of the graph
+        weights = EdgeWeights.__new__(EdgeWeights)
+        weights.edges = self.edges
+        weights.array = self.array.copy()
+        weights.cache = self.cache
+        return weights
+
+    @staticmethod
+    def attach(G: nx.DiGraph) -> 'EdgeWeights':
+        """This function stores the edge weights of the specified graph in an array if it has not been done yet
+
+        :param G: Architecture graph
+        :type G: nx.DiGraph
+        :return: Edge weights of the graph
+        :rtype: EdgeWeights
+        """
+        if 'weights' not in G.graph:
+            G.graph['weights'] = EdgeWeights(G)
+
+        return G.graph['weights']
+
+    @staticmethod
+    def get_ids(G: nx.DiGraph, edges: Iterable[Tuple[str, str]]) -> np.ndarray:
+        """This function returns the IDs of the specified edges. Edges without an ID are skipped.
+
+        :param G: Architecture graph
+        :type G: nx.DiGraph
+        :param edges: Edges
+        :type edges: Iterable[Tuple[str, str]]
+        :return: Edge IDs
+        :rtype: np.ndarray
+        """
+        succ = G._succ
+        ids = (succ[u][v].get('id') for u, v in edges if u in succ and v in succ[u])
+        return np.fromiter((edge_id for edge_id in ids if edge_id is not None), dtype=np.int64)
+
+    def get_mask(self, name: str, func: Callable) -> np.ndarray:
+        """This function returns a cached per-edge array computed by applying the function to every edge
+
+        :param name: Cache key
+        :type name: str
+        :param func: Function of an edge (u, v)
+        :type func: Callable
+        :return: Per-edge values
+        :rtype: np.ndarray
+        """
+        if name not in self.cache:
+            self.cache[name] = np.array([func(edge) for edge in self.edges])
+
+        return self.cache[name]
+
+    def get_pip_mask(self, tile: str) -> np.ndarray:
+        """This function returns the mask of the PIPs of the specified tile
+
+        :param tile: Tile
+        :type tile: str
+        :return: Boolean mask
+        :rtype: np.ndarray
+        """
+        return self.get_mask(f'pips_{tile}', lambda edge: nd.get_tile(edge[0]) == tile == nd.get_tile(edge[1]))
+
+    def get_state(self) -> dict:
+        """This function returns the weights together with the edges they belong to
+
+        :return: Edges and weights
+        :rtype: dict
+        """
+        return {'edges': self.edges, 'array': self.array.copy()}
+
+    def set_state(self, state: dict):
+        """This function restores the weights returned by get_state. The edge IDs of the graph may differ from the ones
+        of the stored weights (e.g., when the graph is prepared by another version), so the weights are matched by edge.
+
+        :param state: Edges and weights
+        :type state: dict
+        :raises ValueError: When a stored edge is not in the graph
+        """
+        if state['edges'] == self.edges:
+            self.array[:] = state['array']
+            return
+
+        ids = {edge: edge_id for edge_id, edge in enumerate(self.edges)}
+        missing = [edge for edge in state['edges'] if edge not in ids]
+        if missing or len(state['edges']) != len(self.edges):
+            raise ValueError(f'The stored weights do not match the graph: {len(missing)} missing edges, {len(state["edges"])} stored and {len(self.edges)} current edges')
+
+        self.array[[ids[edge] for edge in state['edges']]] = state['array']
+
+    def get(self, G: nx.DiGraph, edge: Tuple[str, str]) -> float:
+        """This function returns the weight of the specified edge
+
+        :param G: Architecture graph
+        :type G: nx.DiGraph
+        :param edge: Edge
+        :type edge: Tuple[str, str]
+        :return: Weight
+        :rtype: float
+        """
+        data = G.get_edge_data(*edge)
+        return float(self.array[data['id']]) if 'id' in data else data.get('weight', 1)
@@ -0,0 +1,81 @@
+import re
+from typing import Iterable, Set, Tuple
+import utility.config as cfg
+from xil_res.node import Node as nd
+
+class GlobalIndex:
+    """
+    This class indexes the nodes of a graph by their class (INT, East CLB or West CLB tile) and port, so that the
+    global nodes of a node (see Node.get_global_pattern) are retrieved without matching every node of the graph.
+    """
+    def __init__(self, nodes: Iterable[str]):
+        self.ports      = {}
+        self.samples    = {}
+        self.matches    = {}
+        self.add_nodes(nodes)
+
+    def __repr__(self):
+        return f'GlobalIndex({sum(len(ports) for ports in self.ports.values())} ports)'
+
+    @staticmethod
+    def get_class(node: str) -> str | None:
+        if node.startswith(f'{cfg.INT_label}_X'):
+            return cfg.INT_label
+        elif cfg.East_CLB.match(node):
+            return 'E'
+        elif cfg.West_CLB.match(node):
+            return 'W'
+        else:
+            return None
+
+    @staticmethod
+    def get_key(node: str) -> Tuple[str, str]:
+        """This function returns the class and the port (INT node) or port suffix (CLB node) that the global nodes of the specified node match
+
+        :param node: Node name
+        :type node: str
+        :return: Class and port (INT node) or port suffix (CLB node)
+        :rtype: Tuple[str, str]
+        """
+        if nd.get_tile_type(node) == cfg.INT_label:
+            return cfg.INT_label, nd.get_port(node)
+        else:
+            return ('E' if nd.get_direction(node) == 'E' else 'W'), nd.get_port_suffix(node)
+
+    def add_nodes(self, nodes: Iterable[str]):
+        for node in nodes:
+            node_class = self.get_class(node)
+            if node_class is None:
+                continue
+
+            port = nd.get_port(node)
+            ports = self.ports.setdefault(node_class, {})
+            if port not in ports:
+                ports[port] = set()
+                self.samples[node_class, port] = node
+                self.matches = {}
+
+            ports[port].add(node)
+
+    def remove_nodes(self, nodes: Iterable[str]):
+        for node in nodes:
+            node_class = self.get_class(node)
+            if node_class is not None:
+                self.ports[node_class].get(nd.get_port(node), set()).discard(node)
+
+    def get_nodes(self, node: str) -> Set[str]:
+        """This function returns the indexed nodes matching the global pattern of the specified node
+
+        :param node: Node name
+        :type node: str
+        :return: Global nodes
+        :rtype: Set[str]
+        """
+        key = self.get_key(node)
+        if key not in self.matches:
+            # the global pattern is matched from the start of a node name, so it is matched against a sample node of each port
+            node_class, pattern = key[0], re.compile(nd.get_global_pattern(node))
+            self.matches[key] = [port for port in self.ports.get(node_class, ()) if pattern.match(self.samples[node_class, port])]
+
+        ports = self.ports.get(key[0], {})
+        return {global_node for port in self.matches[key] for global_node in ports[port]}
@@ -0,0 +1,202 @@
+import os, json, hashlib, time
+import networkx as nx
+import utility.utility_functions as util
+import utility.config as cfg
+from xil_res.node import Node as nd
+
+class GraphCache:
+    """
+    This class indexes the compressed graphs stored in cfg.graph_path by the signature of their window.
+    Origins with identical windows (tile types and relative wires) share one stored graph, which is relocated to the requested origin.
+    It also keeps the manifest of the origins prepared in advance for path finding.
+    """
+    def __init__(self, device, radius=16):
+        self.device         = device
+        self.radius         = radius
+        self.tile_hashes    = {}
+        self.signatures     = {}
+        self.index_file     = f'graph_index_{device.name}.json'
+        self.manifest_file  = f'manifest_{device.name}.json'
+        self.index          = self.load_index()
+
+    def __repr__(self):
+        return f'GraphCache({self.device.name}, {len(self.index)} signatures)'
+
+    def load_index(self) -> dict:
+        return self.load_json(self.index_file)
+
+    def store_index(self):
+        # entries added by concurrent processes are kept
+        index = self.load_index()
+        index.update(self.index)
+        self.index = index
+        self.store_json(self.index_file, self.index)
+
+    def load_manifest(self) -> dict:
+        return self.load_json(self.manifest_file)
+
+    def update_manifest(self, entries: dict):
+        """This function adds the specified entries to the manifest of prepared origins
+
+        :param entries: Manifest entries (INT tile -> description of the prepared data)
+        :type entries: dict
+        """
+        manifest = self.load_manifest()
+        manifest.update(entries)
+        self.store_json(self.manifest_file, manifest)
+
+    @staticmethod
+    def load_json(file_name) -> dict:
+        file_path = os.path.join(cfg.graph_path, file_name)
+        if not os.path.exists(file_path):
+            return {}
+
+        with open(file_path) as file:
+            return json.load(file)
+
+    @staticmethod
+    def store_json(file_name, data):
+        file_path = os.path.join(cfg.graph_path, file_name)
+        with open(f'{file_path}.{os.getpid()}.tmp', 'w') as file:
+            json.dump(data, file, indent=0)
+
+        os.replace(f'{file_path}.{os.getpid()}.tmp', file_path)
+
+    @staticmethod
+    def get_file_name(device_name: str, tile: str) -> str:
+        return f'G_{device_name}_{tile}.data'
+
+    @staticmethod
+    def get_prepared_file_name(device_name: str, tile: str) -> str:
+        return f'P_{device_name}_{tile}.data'
+
+    def get_tile_hash(self, tile: str) -> str:
+        """This function hashes the exact type and the wires of the specified tile relative to its own coordinate
+
+        :param tile: Tile name
+        :type tile: str
+        :return: Hash of the tile
+        :rtype: str
+        """
+        if tile not in self.tile_hashes:
+            coord = nd.get_coordinate(tile)
+            rloc_wires = sorted(f'{nd.get_RLOC_node(u, coord)}->{nd.get_RLOC_node(v, coord)}' for u, v in self.device.wires_dict.get(tile, ()))
+            content = '\n'.join([nd.get_tile_type(tile, exact=True)] + rloc_wires)
+            self.tile_hashes[tile] = hashlib.sha1(content.encode()).hexdigest()
+
+        return self.tile_hashes[tile]
+
+    def get_signature(self, tile: str) -> str:
+        """This function computes the signature of the window around the specified INT tile
+
+        :param tile: INT tile
+        :type tile: str
+        :return: Signature of the window
+        :rtype: str
+        """
+        if tile in self.signatures:
+            return self.signatures[tile]
+
+        x, y = nd.get_x_coord(tile), nd.get_y_coord(tile)
+        signature = hashlib.sha1()
+        for dx in range(-self.radius, self.radius + 1):
+            for dy in range(-self.radius, self.radius + 1):
+                tiles = self.device.tiles_map.get(f'X{x + dx}Y{y + dy}')
+                if tiles is None:
+                    entry = f'{dx},{dy}:None'
+                else:
+                    entry = f'{dx},{dy}:' + ','.join(self.get_tile_hash(tiles[key]) if tiles[key] else 'None' for key in sorted(tiles))
+
+                signature.update(entry.encode())
+
+        self.signatures[tile] = signature.hexdigest()
+        return self.signatures[tile]
+
+    def has_graph(self, tile: str) -> bool:
+        return os.path.exists(os.path.join(cfg.graph_path, self.get_file_name(self.device.name, tile)))
+
+    def get_graph(self, tile: str) -> nx.DiGraph | None:
+        """This function returns the cached graph of the specified INT tile, relocating the graph of an identical window if needed
+
+        :param tile: INT tile
+        :type tile: str
+        :return: The compressed graph or None if no matching graph is cached
+        :rtype: nx.DiGraph | None
+        """
+        if self.has_graph(tile):
+            return util.load_data(cfg.graph_path, self.get_file_name(self.device.name, tile))
+
+        cached_tile = self.index.get(self.get_signature(tile))
+        if cached_tile is None or not self.has_graph(cached_tile):
+            return None
+
+        G = util.load_data(cfg.graph_path, self.get_file_name(self.device.name, cached_tile))
+        return self.relocate(G, cached_tile, tile)
+
+    def relocate(self, G: nx.DiGraph, origin_tile: str, target_tile: str) -> nx.DiGraph | None:
+        """This function relocates a compressed graph from its origin to the target origin
+
+        :param G: Compressed graph
+        :type G: nx.DiGraph
+        :param origin_tile: INT tile of the cached graph
+        :type origin_tile: str
+        :param target_tile: INT tile of the requested graph
+        :type target_tile: str
+        :return: The relocated graph or None if a node cannot be dislocated
+        :rtype: nx.DiGraph | None
+        """
+        origin, target_origin = nd.get_coordinate(origin_tile), nd.get_coordinate(target_tile)
+        mapping = {}
+        for node in G:
+            D_node = nd.dislocate_node(self.device.tiles_map, node, target_origin, origin=origin)
+            if D_node is None:
+                return None
+
+            mapping[node] = D_node
+
+        return nx.relabel_nodes(G, mapping, copy=True)
+
+    def add_graph(self, tile: str, G: nx.DiGraph):
+        """This function stores the compressed graph of the specified INT tile and indexes its signature. The signature
+        keeps pointing to the first stored tile, and graphs relocated from it are stored under their own tile.
+
+        :param tile: INT tile
+        :type tile: str
+        :param G: Compressed graph
+        :type G: nx.DiGraph
+        """
+        util.store_data(cfg.graph_path, self.get_file_name(self.device.name, tile), G)
+        self.index.setdefault(self.get_signature(tile), tile)
+        self.store_index()
+
+    def store_prepared(self, tile: str, G: nx.DiGraph, pips_length_dict: dict) -> dict:
+        """This function stores the prepared graph and PIP length table of the specified INT tile
+
+        :param tile: INT tile
+        :type tile: str
+        :param G: Prepared graph (compressed, cost-reformed and without untested edges)
+        :type G: nx.DiGraph
+        :param pips_length_dict: PIP length table
+        :type pips_length_dict: dict
+        :return: Manifest entry of the prepared data
+        :rtype: dict
+        """
+        file_name = self.get_prepared_file_name(self.device.name, tile)
+        util.store_data(cfg.graph_path, file_name, {'G': G, 'pips_length_dict': pips_length_dict})
+
+        return {'file': file_name, 'n_nodes': G.number_of_nodes(), 'n_edges': G.number_of_edges(),
+                'n_pips': len(pips_length_dict), 'created': time.strftime('%Y-%m-%d %H:%M:%S')}
+
+    def load_prepared(self, tile: str) -> dict | None:
+        """This function loads the prepared data of the specified INT tile if it is listed in the manifest
+
+        :param tile: INT tile
+        :type tile: str
+        :return: The prepared graph and PIP length table or None
+        :rtype: dict | None
+        """
+        entry = self.load_manifest().get(tile)
+        if entry is None or not os.path.exists(os.path.join(cfg.graph_path, entry['file'])):
+            return None
+
+        return util.load_data(cfg.graph_path, entry['file'])
@@ -1,6 +1,8 @@
-import copy, time, sys
+import time, sys
+import multiprocessing as mp
 import re
 from itertools import product
+import numpy as np
 import networkx as nx
 #sys.path.insert(0, r'..\utility')
 import utility.config as cfg
@@ -9,19 +11,28 @@ from xil_res.clock_domain import ClockGroup, ClockDomain
 from xil_res.node import Node as nd
 from xil_res.edge import Edge
 from xil_res.architecture import Arch
-from xil_res.path import PathIn, PathOut, MainPath, NotPath
+from xil_res.path import Path, PathIn, PathOut, MainPath, NotPath
 from xil_res.cut import CUT
+from xil_res.node_bitmap import NodeIndex, NodeBitmap
+from xil_res.edge_weights import EdgeWeights
+from xil_res.overlay_graph import OverlayGraph
+from xil_res.global_index import GlobalIndex
+from xil_res.undo_log import UndoLog
+from xil_res.reachability import Reachability
+from xil_res.candidate_pool import CandidatePool
 from xil_res.edge import PIP
 #from joblib import Parallel, delayed
+from joblib import effective_n_jobs
 
 class MinConfig:
 
-    __slots__ = ('G', 'TC_idx', 'G_TC', 'blocked_nodes', 'reconst_blocked_nodes', 'FFs', 'LUTs', 'subLUTs', 'CD', 'CUTs', 'tried_pips', 'start_TC_time')
+    __slots__ = ('G', 'TC_idx', 'G_TC', 'blocked_nodes', 'reconst_blocked_nodes', 'FFs', 'LUTs', 'subLUTs', 'CD', 'CUTs', 'tried_pips', 'start_TC_time',
+                 'start_TC_work', 'generation', 'unreachable', 'global_index', 'undo_log')
     def __init__(self, device, TC_idx, prev_TC=None):
-        self.G                      = copy.deepcopy(device.G)
+        self.G                      = OverlayGraph(device.G)
         self.TC_idx                 = TC_idx
         self.G_TC                   = nx.DiGraph()
-        self.blocked_nodes          = set()
+        self.blocked_nodes          = NodeBitmap(NodeIndex(self.G))
         self.reconst_blocked_nodes  = set()
         self.FFs                    = self.create_FFs(device, prev_TC)
         self.LUTs                   = self.create_LUTs(device, prev_TC)
@@ -30,6 +41,11 @@ class MinConfig:
         self.CUTs                   = []
         self.tried_pips             = set()
         self.start_TC_time          = time.time()
+        self.start_TC_work          = dict(Path.search_stats)
+        self.generation             = 0
+        self.unreachable            = {}
+        self.global_index           = None
+        self.undo_log               = UndoLog()
         self.get_reconst_blocked_nodes(prev_TC)
         if len(set(self.filter_subLUTs(usage='used'))) > 1:
             breakpoint()
@@ -39,6 +55,14 @@ class MinConfig:
     def __repr__(self):
         return f'TC{self.TC_idx}'
 
+    def get_work(self):
+        """This function returns the path searches and the expanded nodes spent on the TC since it is created
+
+        :return: Number of path searches, expanded nodes, and cached failures of the TC
+        :rtype: dict
+        """
+        return {key: value - self.start_TC_work[key] for key, value in Path.search_stats.items()}
+
     def validate(self):
         FF_nodes = list(filter(lambda node: nd.get_clb_node_type(node) in {'FF_in', 'FF_out'}, self.G))
         for node in FF_nodes:
@@ -63,13 +87,15 @@ class MinConfig:
         return (FF_obj for FF_obj in self.FFs.values() if all(getattr(FF_obj, attr) == value for attr, value in attributes.items()))
 
     def get_global_nodes(self, node: str):
-        pattern = nd.get_global_pattern(node)
-        return set(filter(lambda node: re.match(pattern, node), self.G))
+        if self.global_index is None:
+            self.global_index = GlobalIndex(self.G)
+
+        return {global_node for global_node in self.global_index.get_nodes(node) if global_node in self.G}
 
     def get_global_edges(self, edge):
-        pattern_u = nd.get_global_pattern(edge[0])
-        pattern_v = nd.get_global_pattern(edge[1])
-        return set(filter(lambda e: re.match(pattern_u, e[0]) and re.match(pattern_v, e[1]), self.G.edges))
+        global_nodes_u = self.get_global_nodes(edge[0])
+        global_nodes_v = self.get_global_nodes(edge[1])
+        return {(u, v) for u in global_nodes_u for v in self.G._succ[u] if v in global_nodes_v}
 
     ########## CUT ###############
     def create_CUT(self, coord):
@@ -83,6 +109,18 @@ class MinConfig:
         if not nx.is_tree(cut.G):
             breakpoint()
 
+        # the mutations are recorded in the undo log until the CUT is finalized or removed
+        self.G.undo_log = self.undo_log
+        try:
+            self.fill_path(test_collection, path)
+        finally:
+            self.G.undo_log = None
+
+        self.test_CD()
+
+    def fill_path(self, test_collection, path):
+        cut = self.CUTs[-1]
+
         # 1- set CD
         self.set_CGs(test_collection, path)
         # 3- specify subluts & update path subluts. it also adds the sublut into LUT
@@ -99,39 +137,26 @@ class MinConfig:
         # 8- block source & sink
         #self.block_LUTs()
         self.block_source_sink(path)
-        self.test_CD()
 
     def remove_CUT(self, test_collection):
         cut = self.CUTs[-1]
-        '''CD = copy.deepcopy(self.CD)
-        srcs = list(self.G.neighbors(cfg.virtual_source_node))
-        sinks = list(self.G.predecessors(cfg.virtual_sink_node))'''
-        # remove cfg.pip_v
-        #pip_v = cut.main_path.pip[1]
-        #self.G.remove_edge(cfg.pip_v, pip_v)
-
-        for path in reversed(cut.paths):
-            # 8- restore source & sink **** always before reset_CD
-            #self.restore_source_sink(path)
-            # 1- reset CD
-            self.restore_CGs(test_collection, path)
-
-            # 3- remove  sublut from LUT
-            self.empty_LUTs(path.subLUTs)
-            self.empty_FFs(path.FFs)
-            # 7- reset FFs & SubLUTs usage
-            if cfg.block_mode == 'global':
-                self.reset_global_subLUTs(path.subLUTs)
-                self.reset_global_FFs(path.FFs)
-            # 2- unblock path
-            self.unblock_path(path, test_collection.device)
+        # undo the clock groups, primitives, blocked nodes and edges changed by filling the paths of the CUT
+        if self.undo_log.rollback():
+            self.invalidate_routes()
 
         self.test_CD()
         self.CUTs.remove(cut)
         if len(set(self.filter_subLUTs(usage='used'))) > 1:
             breakpoint()
 
-    def finalize_CUT(self, test_collection):
+    def finalize_CUT(self, test_collection, update_search=True):
+        """This function blocks the primitives and nodes of the last CUT
+
+        :param test_collection: Test collection
+        :type test_collection: TestCollection
+        :param update_search: Increase the costs of the main path and update the queue of the search, defaults to True
+        :type update_search: bool, optional
+        """
         cut = self.CUTs[-1]
 
         # check for internal collision
@@ -157,17 +182,23 @@ class MinConfig:
             lut.block_usage()
         #Parallel(n_jobs=cfg.n_jobs, require='sharedmem')(delayed(lut.block_usage()) for lut in self.LUTs.values())
 
-        # increase cost
-        main_path = cut.main_path
-        desired_pip_weight = 1 / len(main_path)
-        self.inc_cost(test_collection, main_path, desired_pip_weight, default_weight=0.5)
+        if update_search:
+            # increase cost
+            main_path = cut.main_path
+            desired_pip_weight = 1 / len(main_path)
+            self.inc_cost(test_collection, main_path, desired_pip_weight, default_weight=0.5)
 
-        # update the queue and pbar
-        test_collection.update_coverage()
+            # update the queue and pbar
+            test_collection.update_coverage()
 
         #remove used nodes
         self.G.remove_nodes_from(self.blocked_nodes)
-        self.blocked_nodes = set()
+        if self.global_index is not None:
+            self.global_index.remove_nodes(self.blocked_nodes)
+
+        self.blocked_nodes.clear()
+        self.invalidate_routes()
+        self.undo_log.commit()
 
     ########## Primitives ############################
     def create_FFs(self, device, prev_TC=None):
@@ -257,15 +288,11 @@ class MinConfig:
     def fill_LUTs(self, path):
         cut = self.CUTs[-1]
         for subLUT in path.get_subLUTs(self):
+            self.undo_log.save(self.LUTs[subLUT.get_LUT_name()])
             subLUT.add_to_LUT(self)
             path.subLUTs.add(subLUT)
             cut.subLUTs.add(subLUT)
 
-    def empty_LUTs(self, subLUTs):
-        for subLUT in subLUTs:
-            subLUT.remove_from_LUT(self)
-            subLUT.empty()
-
     def block_subLUTs(self, path):
         for subLUT in path.subLUTs:
             subLUT.block_usage()
@@ -279,14 +306,11 @@ class MinConfig:
             except:
                 breakpoint()
 
+            self.undo_log.save(FF_primitive)
             FF_primitive.set_usage(ff_node)
             path.FFs.add(FF_primitive)
             cut.FFs.add(FF_primitive)
 
-    def empty_FFs(self, FFs):
-        for FF_primitive in FFs:
-            FF_primitive.free_usage()
-
     def block_FFs(self, path):
         for FF_primitive in path.FFs:
             FF_primitive.block_usage()
@@ -327,22 +351,13 @@ class MinConfig:
             global_subLUTs = {sublut for sublut in global_subLUTs if sublut.name != subLUT.name}
             #Parallel(n_jobs=-1, require='sharedmem')(delayed(global_subLUT.global_set)(tiles_map, subLUT) for global_subLUT in global_subLUTs)
             for global_subLUT in global_subLUTs:
+                self.undo_log.save(global_subLUT)
                 global_subLUT.global_set(tiles_map, subLUT)
             #Parallel(n_jobs=-1, require='sharedmem')(delayed(global_subLUT.add_to_LUT)(self) for global_subLUT in global_subLUTs)
             for global_subLUT in global_subLUTs:
+                self.undo_log.save(self.LUTs[global_subLUT.get_LUT_name()])
                 global_subLUT.add_to_LUT(self)
 
-    def reset_global_subLUTs(self, subLUTs):
-        for subLUT in subLUTs:
-            #global_subLUTs = self.get_global_subLUTs(subLUT)
-            attr_dict = {'direction': subLUT.direction, 'label': subLUT.label, 'usage': 'used'}
-            global_subLUTs = set(self.filter_subLUTs(**attr_dict))
-            global_subLUTs = {sublut for sublut in global_subLUTs if sublut.name != subLUT.name}
-            #Parallel(n_jobs=-1, require='sharedmem')(delayed(global_subLUT.global_reset)(self) for global_subLUT in global_subLUTs)
-            for global_subLUT in global_subLUTs:
-                global_subLUT.remove_from_LUT(self)
-                global_subLUT.empty()
-
     def block_global_subLUTs(self, subLUTs):
         #global_subLUTs = self.get_global_subLUTs(*subLUTs)
         global_subLUTs = set()
@@ -361,16 +376,9 @@ class MinConfig:
             global_FFs = {global_FF for global_FF in global_FFs if global_FF.name != ff.name}
             #Parallel(n_jobs=-1, require='sharedmem')(delayed(global_FF.global_set)(tiles_map, ff) for global_FF in global_FFs)
             for global_FF in global_FFs:
+                self.undo_log.save(global_FF)
                 global_FF.global_set(tiles_map, ff)
 
-    def reset_global_FFs(self, FFs):
-        for ff in FFs:
-            global_FFs = self.get_global_FFs(ff)
-            global_FFs = {global_FF for global_FF in global_FFs if global_FF.name != ff.name}
-            #Parallel(n_jobs=-1, require='sharedmem')(delayed(global_FF.free_usage)() for global_FF in global_FFs)
-            for global_FF in global_FFs:
-                global_FF.free_usage()
-
     def block_global_FFs(self, FFs):
         global_FFs = self.get_global_FFs(*FFs)
         #Parallel(n_jobs=-1, require='sharedmem')(delayed(global_FF.block_usage)() for global_FF in global_FFs)
@@ -382,29 +390,7 @@ class MinConfig:
         for occupied_LUT in occupied_LUTs:
             tile, label = occupied_LUT.tile, occupied_LUT.label
             LUT_inputs = {nd.get_LUT_input(tile, label, idx) for idx in range(1, 6)}
-            self.blocked_nodes.update(LUT_inputs)
-
-    def unblock_LUTs(self):
-        freed_LUTs = self.filter_LUTs(has_freed=True)
-        edges = set()
-        for freed_LUT in freed_LUTs:
-            tile, label = freed_LUT.tile, freed_LUT.label
-            occupied_LUT_in = {input for subLUT in freed_LUT.subLUTs for input in subLUT.inputs}
-            LUT_inputs = {nd.get_LUT_input(tile, label, idx) for idx in range(1, 6)} - occupied_LUT_in
-            self.blocked_nodes -= LUT_inputs
-
-            # unblock LUT_in6 and MUXED_CLB_out if the LUT has gotten empty
-            if freed_LUT.has_emptied:
-                self.blocked_nodes -= {nd.get_MUXED_CLB_out(tile, label), nd.get_LUT_input(tile, label, 6)}
-
-            # restore free FFs in front of freed LUTs
-            sources = {node for node in self.G.neighbors(cfg.virtual_source_node)
-                       if nd.get_tile(node) == freed_LUT.tile
-                       and nd.get_label(node) == freed_LUT.label
-                       and self.FFs[nd.get_bel(node)].usage == 'free'}
-            edges.update(set(product({cfg.virtual_source_node}, sources)))
-
-        self.add_edges(*edges, weight=0)
+            self.block_nodes(LUT_inputs)
 
     ########## Block nodes & edges ####################
     def get_reconst_blocked_nodes(self, prev_TC=None):
@@ -428,7 +414,13 @@ class MinConfig:
             self.reconst_blocked_nodes.update(node for ff in invalid_FFs for node in ff.get_nodes(index=1))
             self.reconst_blocked_nodes.update(node for ff in invalid_FFs for node in ff.get_nodes(index=2))'''
 
-            self.G.remove_nodes_from(self.reconst_blocked_nodes)
+            self.G.remove_nodes_from(sorted(self.reconst_blocked_nodes))
+
+    def block_nodes(self, nodes):
+        nodes = {node for node in nodes if node not in self.blocked_nodes}
+        if nodes:
+            self.undo_log.record(self.blocked_nodes.difference_update, nodes)
+            self.blocked_nodes.update(nodes)
 
     def block_path(self, path):
         nodes = set(path)
@@ -436,27 +428,15 @@ class MinConfig:
             for node in path:
                 nodes.update(self.get_global_nodes(node))
 
-        self.blocked_nodes.update(nodes)
+        self.block_nodes(nodes)
 
         if any(map(lambda node: nd.get_clb_node_type(node) == 'LUT_in', path)):
             for LUT_in in filter(lambda node: nd.get_clb_node_type(node) == 'LUT_in', path):
                 tile, label = nd.get_tile(LUT_in), nd.get_label(LUT_in)
-                self.blocked_nodes.update(self.get_global_nodes(nd.get_LUT_input(tile, label, 6)))
-                self.blocked_nodes.update(self.get_global_nodes(nd.get_MUXED_CLB_out(tile, label)))
+                self.block_nodes(self.get_global_nodes(nd.get_LUT_input(tile, label, 6)))
+                self.block_nodes(self.get_global_nodes(nd.get_MUXED_CLB_out(tile, label)))
                 self.block_LUTs()
 
-    def unblock_path(self, path, device):
-        # MUXED_CLB_out and LUT_in6 must be unblocked in unblock_LUTs
-        nodes = {node for node in path if not (cfg.LUT_in6_pattern.match(node) and cfg.MUXED_CLB_out_pattern.match(node))}
-        if cfg.block_mode == 'global':
-            for node in path:
-                nodes.update(self.get_global_nodes(node))
-
-        self.blocked_nodes -= nodes
-
-        if any(map(lambda node: nd.get_clb_node_type(node) == 'LUT_in', path)):
-            self.unblock_LUTs()
-
     def block_source_sink(self, path):
         if path.type == 'path_not':
             return
@@ -471,7 +451,7 @@ class MinConfig:
                     if CD.type == 'sink':
                         edges.update(set(product(self.get_global_nodes(node), {CD.src_sink_node})))
 
-        self.G.remove_edges_from(edges)
+        self.G.remove_edges_from(sorted(edges))
 
 
         '''edges = set()
@@ -497,51 +477,20 @@ class MinConfig:
 
         self.G.remove_edges_from(edges)'''
 
-    def restore_source_sink(self, path):
-        if path.type == 'path_not':
-            return
-
-        edges = set()
-        CDs = {CG.CD for CG in self.CD if CG.CD != ClockDomain()}
-        for CD in CDs:
-            for node in path:
-                if CD.pattern.match(node):
-                    if CD.type == 'source':
-                        srcs = self.get_global_nodes(node)
-                        for src in srcs.copy():
-                            LUT_name = re.sub('FF2*$', 'LUT', nd.get_bel(src))
-                            try:
-                                if self.LUTs[LUT_name].capacity == 0:
-                                    srcs.remove(src)
-                            except:
-                                breakpoint()
-
-                        edges.update(set(product({CD.src_sink_node}, srcs)))
-                    if CD.type == 'sink':
-                        edges.update(set(product(self.get_global_nodes(node), {CD.src_sink_node})))
-
-        self.add_edges(*edges, weight=0)
-
-
-        '''edges = set()
-        #clock_domains = [CD for _, CD in self.CD.items() if CD.name != 'None']
-        #clock_domains = [CG.CD for CG in self.CD if CG.CD.name != 'None']
-        clock_domains = [CG.CD for CG in self.CD if path.get_prev_CD(CG).CD == ClockDomain() and CG.CD != ClockDomain()]
-        for CD in clock_domains:
-            matched_preds_neighs = set(filter(lambda node: CD.pattern.match(node), path))
-            if cfg.block_mode == 'global':
-                for pred_neigh in matched_preds_neighs.copy():
-                    matched_preds_neighs.update(self.get_global_nodes(pred_neigh))
-
-            if CD.type == 'source':
-                edges.update(set(product({CD.src_sink_node}, matched_preds_neighs)))
-            if CD.type == 'sink':
-                edges.update(set(product(matched_preds_neighs, {CD.src_sink_node})))
-
-        self.G.add_edges_from(edges)'''
-
     def add_edges(self, *edges, device=None, weight=None):
-        for edge in edges:
+        """This function adds the specified edges to the graph of the TC unless their nodes are used or blocked.
+        Edges of the architecture are copied from the graph of the device with their IDs (see EdgeWeights), while a
+        weight can only be specified for edges to or from virtual nodes.
+
+        :param edges: Edges to be added
+        :type edges: Tuple[str, str]
+        :param device: Device whose graph holds the edges of the architecture, defaults to None
+        :type device: Arch, optional
+        :param weight: Weight of virtual edges, defaults to None
+        :type weight: float, optional
+        :raises ValueError: If an edge of the architecture is not in the graph of the device or is given a weight
+        """
+        for edge in sorted(edges):
             if edge[1] in self.G_TC:
                 continue
 
@@ -559,12 +508,56 @@ class MinConfig:
                         continue
 
             if weight is None:
-                try:
-                    weight = device.G.get_edge_data(*edge)['weight']
-                except:
-                    breakpoint()
+                data = device.G.get_edge_data(*edge) if device is not None else None
+                if data is None:
+                    raise ValueError(f'edge {edge} is not in the architecture graph')
+            elif '/' in edge[0] and '/' in edge[1]:
+                raise ValueError(f'edge {edge} of the architecture must keep its ID instead of weight {weight}')
+            else:
+                data = {'weight': weight}
+
+            self.invalidate_routes()
+            self.G.add_edge(*edge, **data)
+
+    ########## Route cache ####################
+    def invalidate_routes(self):
+        """This function starts a new generation of the unreachable-route cache. It must be called whenever nodes or edges
+        are added to the graph.
+        """
+        self.generation += 1
+        self.unreachable.clear()
+
+    def get_route_key(self, source, target, blocked_nodes):
+        # the state of a bitmap only selects a bucket of failures, whose blocked nodes are compared on lookup; other blocked sets are not cached
+        if not isinstance(blocked_nodes, NodeBitmap):
+            return None
 
-            self.G.add_edge(*edge, weight=weight)
+        return source, target, self.generation, blocked_nodes.state
+
+    def is_unreachable(self, source, target, blocked_nodes) -> bool:
+        """This function determines if a route query is certain to fail in the current generation of the graph.
+        Only relaxed failures are cached: they only depend on the graph and the blocked nodes, while a conflict-free
+        failure depends on the path and therefore on the weights. A relaxed failure also fails the conflict-free query.
+
+        :param source: Source node
+        :type source: str
+        :param target: Target node
+        :type target: str
+        :param blocked_nodes: Nodes excluded from routing
+        :type blocked_nodes: NodeBitmap|Set[str]
+        :return: True if the query fails
+        :rtype: bool
+        """
+        key = self.get_route_key(source, target, blocked_nodes)
+        if key is None or key not in self.unreachable:
+            return False
+
+        return frozenset(blocked_nodes) in self.unreachable[key]
+
+    def add_unreachable(self, source, target, blocked_nodes):
+        key = self.get_route_key(source, target, blocked_nodes)
+        if key is not None:
+            self.unreachable.setdefault(key, set()).add(frozenset(blocked_nodes))
 
     ########## CG & CD ####################
     def set_CGs(self, test_collection, path):
@@ -572,14 +565,10 @@ class MinConfig:
         for ff_node in ff_nodes:
             clock_group_name = nd.get_clock_group(ff_node)
             CG = next(clock_group for clock_group in self.CD if clock_group.name == clock_group_name)
+            conflict_CGs = [test_collection.get_clock_group(conflict_CG) for conflict_CG in CG.conflict]
+            self.undo_log.save(CG, CG.CD, *conflict_CGs)
             CG.set(ff_node, test_collection)
 
-    def restore_CGs(self, test_collection, path):
-        #restored_CGs = [CG for CG in self.CD if path.prev_CD[CG].name == 'None' and path.prev_CD[CG] != self.CD[CG]]
-        restore_CGs = ClockGroup.get_changed_CGs(self.CD, path.prev_CD)
-        for CG in restore_CGs:
-            CG.restore(test_collection)
-
     def get_clock_domain(self, node: str) -> ClockDomain:
         clock_group = nd.get_clock_group(node)
         if clock_group is None:
@@ -623,6 +612,7 @@ class MinConfig:
         path_in = PathIn(sink)
         path_in.route(self, pips, path_out)
         if path_in.error:
+            test_collection.record_failure(sink)
             return None
 
         path_in.nodes.pop()
@@ -644,52 +634,320 @@ class MinConfig:
 
         return result
 
+    def add_CUT(self, test_collection):
+        """This function creates a CUT and routes its paths. The CUT must be finalized or removed afterwards.
+
+        :param test_collection: Test collection
+        :type test_collection: TestCollection
+        :return: None if the CUT is valid, otherwise the failed step (pip|main_path|length|path_not)
+        :rtype: str|None
+        """
+        # create a CUT
+        coord = nd.get_coordinate(test_collection.origin)
+        self.create_CUT(coord)
+
+        # pick a pip
+        pip = self.pick_pip(test_collection)
+        if pip is None:
+            return 'pip'
+
+        # find the main path
+        main_path = self.CUTs[-1].main_path
+        main_path.route(test_collection)
+        if main_path.error:
+            return 'main_path'
+
+        # validate main_path length
+        if not self.validate_main_path_length(test_collection):
+            # inc cost
+            desired_pip_weight = 1 / len(main_path)
+            self.inc_cost(test_collection, main_path, desired_pip_weight, default_weight=desired_pip_weight)
+            return 'length'
+
+        path_not = NotPath()
+        path_not.route(test_collection)
+        if path_not.error:
+            return 'path_not'
+
+        return None
+
     def fill(self, test_collection):
-        #device = test_collection.device
-        while not test_collection.finish_TC(self):
-            # clean out excess pip_v nodes
-            test_collection.clean_pip_v_node(self.G)
+        # the workers of the candidates are forked from the TC, so the CUTs are routed one by one where fork is unavailable
+        n_candidates = cfg.n_candidates if 'fork' in mp.get_all_start_methods() else 1
+        # the nodes reachable from the virtual source node are kept up to date while the TC is filled
+        self.G.reachability = Reachability(self.G, cfg.virtual_source_node)
+        try:
+            if n_candidates > 1:
+                with CandidatePool(self, test_collection, min(n_candidates, effective_n_jobs(cfg.n_jobs))) as pool:
+                    self.fill_CUTs(test_collection, n_candidates, pool)
+            else:
+                self.fill_CUTs(test_collection, n_candidates)
+        finally:
+            self.G.reachability = None
 
-            # create a CUT
-            coord = nd.get_coordinate(test_collection.origin)
-            self.create_CUT(coord)
+    def prepare_pips(self, test_collection):
+        # clean out excess pip_v nodes
+        test_collection.clean_pip_v_node(self.G)
+        test_collection.clean_unreachable_pips(self.G)
+        test_collection.set_pip_priorities(self.G)
 
-            # pick a pip
-            pip = self.pick_pip(test_collection)
-            if pip is None:
-                self.remove_CUT(test_collection)
-                #print('no pip')
-                continue
+    def fill_CUTs(self, test_collection, n_candidates, pool=None):
+        while not test_collection.finish_TC(self):
+            self.prepare_pips(test_collection)
 
-            # find the main path
-            main_path = self.CUTs[-1].main_path
-            main_path.route(test_collection)
-            if main_path.error:
-                # unblock
-                self.remove_CUT(test_collection)
-                #print('no main_path')
-                continue
+            if pool is not None:
+                if not self.add_speculative_CUT(test_collection, n_candidates, pool):
+                    break
 
-            # validate main_path length
-            if not self.validate_main_path_length(test_collection):
-                # inc cost
-                desired_pip_weight = 1 / len(main_path)
-                self.inc_cost(test_collection, main_path, desired_pip_weight, default_weight=desired_pip_weight)
-                self.remove_CUT(test_collection)
-                #print('long main_path')
+                test_collection.store_checkpoint()
                 continue
 
-            path_not = NotPath()
-            path_not.route(test_collection)
-            if path_not.error:
+            n_pips = self.G.out_degree(cfg.pip_v)
+            error = self.add_CUT(test_collection)
+            if error is None:
+                self.finalize_CUT(test_collection)
+                test_collection.store_checkpoint()
+            else:
+                if error != 'pip':
+                    test_collection.record_failure(self.CUTs[-1].main_path.pip[1])
+
                 # unblock
                 self.remove_CUT(test_collection)
-                #print('no path_not')
+                # no PIP has been tried, so the rolled back TC would fail again
+                if error == 'pip' and self.G.out_degree(cfg.pip_v) == n_pips:
+                    break
+
+    ########## Speculative CUTs ####################
+    def get_candidate_heads(self, test_collection, n_candidates):
+        """This function returns the heads of the PIPs that pick_pip would try next, in the same order
+
+        :param test_collection: Test collection
+        :type test_collection: TestCollection
+        :param n_candidates: Maximum number of candidates
+        :type n_candidates: int
+        :return: Candidate PIP heads
+        :rtype: List[str]
+        """
+        heads = []
+        # the edges of the found heads are removed temporarily to find the next ones
+        self.G.undo_log = self.undo_log
+        try:
+            while len(heads) < n_candidates:
+                path_out = PathOut()
+                path_out.route(self, test_collection.queue, first_order=True)
+                if path_out.error:
+                    break
+
+                heads.append(path_out[0])
+                self.G.remove_edge(cfg.pip_v, path_out[0])
+        finally:
+            self.G.undo_log = None
+
+        if self.undo_log.rollback():
+            self.invalidate_routes()
+
+        return heads
+
+    def route_candidate(self, test_collection, head):
+        """This function routes a CUT for the specified PIP head in a worker process (see CandidatePool) and rolls the TC
+        back afterwards
+
+        :param test_collection: Test collection
+        :type test_collection: TestCollection
+        :param head: Head of the candidate PIP
+        :type head: str
+        :return: Failed step (None if the CUT is valid), the CUT, changes of the edge weights, and search statistics
+        :rtype: Tuple[str|None, CUT|None, List[Tuple[np.ndarray, np.ndarray]], dict]
+        """
+        weights = self.get_weights(test_collection)
+        prev_weights = [edge_weights.array.copy() for edge_weights in weights]
+        prev_failures = test_collection.pip_failures.copy()
+        prev_stats = dict(Path.search_stats)
+        pip_v_edges = list(self.G.out_edges(cfg.pip_v, data=True))
+
+        # only the candidate is left to pick_pip
+        self.G.remove_edges_from([(cfg.pip_v, node) for node in list(self.G.successors(cfg.pip_v)) if node != head])
+        error = self.add_CUT(test_collection)
+        cut = self.CUTs[-1] if error is None else None
+
+        weight_changes = []
+        for edge_weights, prev_array in zip(weights, prev_weights):
+            edge_ids = np.flatnonzero(edge_weights.array != prev_array)
+            weight_changes.append((edge_ids, edge_weights.array[edge_ids] - prev_array[edge_ids]))
+            edge_weights.array[:] = prev_array
+
+        stats = {key: value - prev_stats[key] for key, value in Path.search_stats.items()}
+
+        # the CUT is rolled back like a failed one and the edges of the other candidates are restored
+        self.remove_CUT(test_collection)
+        self.G.remove_edges_from(list(self.G.out_edges(cfg.pip_v)))
+        self.G.add_edges_from(pip_v_edges)
+        test_collection.pip_failures = prev_failures
+
+        return error, cut, weight_changes, stats
+
+    def get_weights(self, test_collection):
+        return [EdgeWeights.attach(self.G), EdgeWeights.attach(test_collection.device.G)]
+
+    def apply_weight_changes(self, test_collection, weight_changes):
+        for edge_weights, (edge_ids, changes) in zip(self.get_weights(test_collection), weight_changes):
+            edge_weights.array[edge_ids] += changes
+
+    def add_speculative_CUT(self, test_collection, n_candidates, pool):
+        """This function routes CUTs for several candidate PIPs in parallel against the current state of the TC and commits
+        the best one. Failed candidates are dropped like in pick_pip and the other valid ones are tried again against the
+        new state, so only the weight changes of the committed and the failed candidates are applied.
+
+        :param test_collection: Test collection
+        :type test_collection: TestCollection
+        :param n_candidates: Number of candidate PIPs
+        :type n_candidates: int
+        :param pool: Workers of the TC
+        :type pool: CandidatePool
+        :return: False if no PIP can be picked
+        :rtype: bool
+        """
+        heads = self.get_candidate_heads(test_collection, n_candidates)
+        if not heads:
+            return False
+
+        entry, best_n_pips = {'failed': [], 'committed': None}, 0
+        for head, (error, cut, weight_changes, stats) in zip(heads, pool.map(heads)):
+            for key, value in stats.items():
+                Path.search_stats[key] += value
+
+            if error is not None:
+                entry['failed'].append((head, weight_changes))
                 continue
 
-            ###
-            self.finalize_CUT(test_collection)
-
+            n_pips = len(cut.get_covered_pips() & test_collection.queue)
+            if n_pips > best_n_pips:
+                entry['committed'], best_n_pips = (head, cut, weight_changes), n_pips
+
+        self.apply_round(test_collection, entry)
+        pool.add_round(entry)
+        return True
+
+    def apply_round(self, test_collection, entry):
+        """This function drops the failed candidates of a round of add_speculative_CUT and commits its best CUT
+
+        :param test_collection: Test collection
+        :type test_collection: TestCollection
+        :param entry: Heads and weight changes of the failed candidates, and the head, CUT and weight changes of the committed one
+        :type entry: dict
+        """
+        for head, weight_changes in entry['failed']:
+            test_collection.record_failure(head)
+            self.G.remove_edge(cfg.pip_v, head)
+            self.apply_weight_changes(test_collection, weight_changes)
+
+        if entry['committed'] is not None:
+            head, cut, weight_changes = entry['committed']
+            self.apply_weight_changes(test_collection, weight_changes)
+            self.commit_CUT(test_collection, head, cut)
+
+    def commit_CUT(self, test_collection, head, routed_cut, update_search=True):
+        """This function fills a CUT with the paths routed by a worker. The TC must be in the state the worker started from.
+
+        :param test_collection: Test collection
+        :type test_collection: TestCollection
+        :param head: Head of the covered PIP
+        :type head: str
+        :param routed_cut: CUT routed by the worker
+        :type routed_cut: CUT
+        :param update_search: Increase the costs of the main path and update the queue of the search, defaults to True
+        :type update_search: bool, optional
+        """
+        # repeat pick_pip
+        self.G.remove_edge(cfg.pip_v, head)
+        self.add_routed_CUT(test_collection, routed_cut)
+        self.finalize_CUT(test_collection, update_search)
+
+    def add_routed_CUT(self, test_collection, routed_cut):
+        """This function creates a CUT and fills it with the paths of a CUT routed elsewhere. The CUT must be finalized or removed afterwards.
+
+        :param test_collection: Test collection
+        :type test_collection: TestCollection
+        :param routed_cut: Routed CUT
+        :type routed_cut: CUT
+        """
+        self.create_CUT(routed_cut.origin)
+        cut = self.CUTs[-1]
+        cut.main_path = routed_cut.main_path
+        cut.G.add_edge(cut.main_path.pip[0], cut.main_path.pip[1])
+
+        # the primitives of the routed CUT are replaced by the ones of the TC
+        for path in routed_cut.paths:
+            path.subLUTs = set()
+            path.FFs = set()
+            self.fill_CUT(test_collection, path)
+
+    def check_CUT(self, test_collection, cut) -> bool:
+        """This function checks if a CUT of another TC at the same origin fits into the TC. The edges of its paths, including
+        the edges from the virtual source and to the virtual sink that encode the clock groups, must be in the graph (used
+        and blocked nodes are removed from it), its FFs and LUTs must not be utilized, and the clock domains of its FFs
+        must not conflict with the clock groups of the TC.
+
+        :param test_collection: Test collection whose clock groups are the ones of this TC
+        :type test_collection: TestCollection
+        :param cut: CUT of another TC
+        :type cut: CUT
+        :return: True|False
+        :rtype: bool
+        """
+        edges = {(cut.main_path.pip[0], cut.main_path.pip[1])}
+        for path in cut.paths:
+            edges.update(path.get_edges())
+            if path.type == 'path_in':
+                edges.add((cfg.virtual_source_node, path[0]))
+            elif path.type == 'path_out':
+                edges.add((path[-1], cfg.virtual_sink_node))
+
+        if not all(u in self.G._succ and v in self.G._succ[u] for u, v in edges):
+            return False
+
+        if any(self.FFs[ff.name].usage != 'free' for ff in cut.FFs):
+            return False
+
+        LUT_cap = {subLUT.get_LUT_name(): self.LUTs[subLUT.get_LUT_name()].capacity for subLUT in cut.subLUTs}
+        for subLUT in cut.subLUTs:
+            LUT_cap[subLUT.get_LUT_name()] -= subLUT.get_occupancy()
+
+        if not all(map(lambda cap: cap >= 0, LUT_cap.values())):
+            return False
+
+        # set_CGs would assign these clock domains, and test_CD stops at conflicting ones
+        CDs = {CG.name: CG.CD for CG in self.CD if not CG.is_free}
+        for ff_node in (node for path in cut.paths for node in path if nd.get_primitive(node) == 'FF'):
+            clock_domain = test_collection.get_clock_domain(ff_node)
+            if CDs.setdefault(nd.get_clock_group(ff_node), clock_domain) != clock_domain:
+                return False
+
+        return not any(CDs.get(conflict_CG) == CDs[CG.name] for CG in self.CD if CG.name in CDs for conflict_CG in CG.conflict)
+
+    def merge_CUT(self, test_collection, routed_cut) -> bool:
+        """This function moves a CUT of another TC at the same origin into the TC (see consolidate_TCs.py). Only the
+        clock groups, primitives and routes of the TC are updated; the costs and the queue of the search are not.
+
+        :param test_collection: Test collection whose TC and clock groups are the ones of this TC
+        :type test_collection: TestCollection
+        :param routed_cut: CUT of another TC
+        :type routed_cut: CUT
+        :return: True if the CUT is added
+        :rtype: bool
+        """
+        if not self.check_CUT(test_collection, routed_cut):
+            return False
+
+        try:
+            self.add_routed_CUT(test_collection, routed_cut)
+        except Exception:
+            # e.g., clock domain conflicts and over-utilized primitives
+            self.remove_CUT(test_collection)
+            return False
+
+        self.finalize_CUT(test_collection, update_search=False)
+        return True
 
     def inc_cost(self, test_collection, main_path, desired_pip_weight, default_weight=0.5):
         edges = set()
@@ -702,13 +960,9 @@ class MinConfig:
             else:
                 edges.add(edge)
 
-        for edge in edges:
-            if Edge(edge).get_type() == 'pip' and nd.get_tile(edge[0]) == desired_tile:
-                #self.G.get_edge_data(*edge)['weight'] += desired_pip_weight
-                device.G.get_edge_data(*edge)['weight'] += desired_pip_weight
-            else:
-                #self.G.get_edge_data(*edge)['weight'] += default_weight
-                device.G.get_edge_data(*edge)['weight'] += default_weight
+        weights = EdgeWeights.attach(device.G)
+        edge_ids = EdgeWeights.get_ids(device.G, edges)
+        weights.array[edge_ids] += np.where(weights.get_pip_mask(desired_tile)[edge_ids], desired_pip_weight, default_weight)
 
 if __name__ == '__main__':
     t1 = time.time()
@@ -1,13 +1,182 @@
 import re, sys, os
 from typing import Set
+from functools import lru_cache
 #sys.path.insert(0, r'..\utility')
 import networkx as nx
 import utility.config as cfg
 
+class NodeInfo:
+    """
+    This class holds the parsed attributes of a node name. Each attribute is parsed on first access and reused afterwards.
+    Attributes whose parsing fails (e.g., the coordinate of a virtual node) are not stored, so the error is raised again on the next access.
+    """
+    __slots__ = ('name', 'tile', 'tile_type', 'coordinate', 'x', 'y', 'direction', 'label', 'top_bottom', 'clb_node_type', 'bel', 'clock_group')
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return f'NodeInfo({self.name})'
+
+    def __getattr__(self, item):
+        # only called for unset slots
+        parser = parsers.get(item)
+        if parser is None:
+            raise AttributeError(item)
+
+        value = parser(self)
+        setattr(self, item, value)
+        return value
+
+    def parse_all(self):
+        """This function parses all attributes of the node
+        """
+        for item in parsers:
+            try:
+                getattr(self, item)
+            except (ValueError, IndexError):
+                pass
+
+    @staticmethod
+    def parse_tile_type(info) -> str | None:
+        if info.name.startswith(cfg.INT_label):
+            return cfg.INT_label
+        elif info.name.startswith(cfg.CLB_label):
+            return 'CLB'
+        else:
+            return None
+
+    @staticmethod
+    def parse_coordinate(info) -> str:
+        return re.findall('X-*\d+Y-*\d+', info.name)[0]
+
+    @staticmethod
+    def parse_direction(info) -> str:
+        if info.tile_type == cfg.INT_label:
+            return 'C'
+        elif info.tile_type == 'CLB':
+            return 'E' if re.match(cfg.East_CLB, info.name) else 'W'
+        else:
+            raise ValueError(f'Node: {info.name} is Invaild!')
+
+    @staticmethod
+    def parse_label(info) -> str | None:
+        if info.tile_type == cfg.INT_label:
+            return None
+        elif info.tile_type == 'CLB':
+            return info.name.split('_SITE_0_')[-1][0]
+        else:
+            raise ValueError(f'Node: {info.name} is Invaild!')
+
+    @staticmethod
+    def parse_top_bottom(info) -> str | None:
+        if info.label in {'A', 'B', 'C', 'D'}:
+            return 'B'
+        elif info.label in {'E', 'F', 'G', 'H'}:
+            return 'T'
+        else:
+            return None
+
+    @staticmethod
+    def parse_clb_node_type(info) -> str | None:
+        node = info.name
+        if re.match(cfg.LUT_in_pattern, node):
+            return 'LUT_in'
+        elif re.match(cfg.FF_in_pattern, node):
+            return 'FF_in'
+        elif re.match(cfg.FF_out_pattern, node):
+            return 'FF_out'
+        elif re.match(cfg.CLB_out_pattern, node):
+            return 'CLB_out'
+        elif re.match(cfg.MUXED_CLB_out_pattern, node):
+            return 'CLB_muxed'
+        else:
+            return None
+
+    @staticmethod
+    def parse_bel(info) -> str | None:
+        node = info.name
+        if info.clb_node_type == 'LUT_in' or re.match(cfg.Unregistered_CLB_out_pattern, node):
+            return f'{info.tile}/{info.label}LUT'
+        elif info.clb_node_type in {'FF_in', 'FF_out'}:
+            suffix = ['', '2']
+            return f'{info.tile}/{info.label}FF{suffix[Node.get_bel_index(node) - 1]}'
+        else:
+            return None
+
+    @staticmethod
+    def parse_clock_group(info) -> str | None:
+        if info.clb_node_type:
+            return f'{info.direction}_{info.top_bottom}'
+        else:
+            return None
+
+parsers = {
+    'tile'          : lambda info: info.name.split('/')[0],
+    'tile_type'     : NodeInfo.parse_tile_type,
+    'coordinate'    : NodeInfo.parse_coordinate,
+    'x'             : lambda info: int(re.findall('-*\d+', info.coordinate)[0]),
+    'y'             : lambda info: int(re.findall('-*\d+', info.coordinate)[1]),
+    'direction'     : NodeInfo.parse_direction,
+    'label'         : NodeInfo.parse_label,
+    'top_bottom'    : NodeInfo.parse_top_bottom,
+    'clb_node_type' : NodeInfo.parse_clb_node_type,
+    'bel'           : NodeInfo.parse_bel,
+    'clock_group'   : NodeInfo.parse_clock_group,
+}
+
 class Node:
     """
     This class facilitates processing nodes.
     """
+    # node names of the last loaded graph are interned in table, others are kept in a bounded LRU cache
+    table = {}
+
+    @staticmethod
+    @lru_cache(maxsize=cfg.node_cache_size)
+    def _get_cached_info(node: str) -> NodeInfo:
+        return NodeInfo(node)
+
+    @staticmethod
+    def get_info(node: str) -> NodeInfo:
+        """Retrieve the interned record of a node.
+
+        :param node: The node name
+        :type node: str
+        :return: The parsed node record
+        :rtype: NodeInfo
+        """
+        info = Node.table.get(node)
+        if info is None:
+            info = Node._get_cached_info(node)
+
+        return info
+
+    @staticmethod
+    def preload(nodes):
+        """Parse the given nodes once and replace the node table with their records. Records of nodes that are
+        still in the table are reused, so the table does not grow when graphs of several origins are loaded.
+
+        :param nodes: The node names (e.g., nodes of the architecture graph)
+        :type nodes: Iterable[str]
+        """
+        table = {}
+        for node in nodes:
+            info = Node.table.get(node)
+            if info is None:
+                info = NodeInfo(node)
+                info.parse_all()
+
+            table[node] = info
+
+        Node.table = table
+
+    @staticmethod
+    def clear_cache():
+        """Clear the node table and the LRU cache.
+        """
+        Node.table.clear()
+        Node._get_cached_info.cache_clear()
+
     ######### Tile Methods ##########
     @staticmethod
     def get_tile(node: str, delimiter='/') -> str:
@@ -36,12 +205,8 @@ class Node:
         if exact:
             end_idx = re.search('_X-*\d+Y-*\d+', node).regs[0][0]
             tile_type = Node.get_tile(node)[: end_idx]
-        elif node.startswith(cfg.INT_label):
-            tile_type = cfg.INT_label
-        elif node.startswith(cfg.CLB_label):
-            tile_type = 'CLB'
         else:
-            tile_type = None
+            tile_type = Node.get_info(node).tile_type
 
         return tile_type
 
@@ -75,18 +240,7 @@ class Node:
         :return: The direction of the node's tile in a coordinate or None
         :rtype: str
         """
-        if Node.get_tile_type(node) == cfg.INT_label:
-            direction = 'C'
-        elif Node.get_tile_type(node) == 'CLB':
-            if re.match(cfg.East_CLB, node):
-                direction = 'E'
-            else:
-                direction = 'W'
-        else:
-            raise ValueError(f'Node: {node} is Invaild!')
-
-
-        return direction
+        return Node.get_info(node).direction
 
     @staticmethod
     def get_top_bottom(node: str) -> str | None:
@@ -97,14 +251,7 @@ class Node:
         :return: The location of the node (CLB node) or None (invalid node)
         :rtype: str | None
         """
-        if Node.get_label(node) in {'A', 'B', 'C', 'D'}:
-            top_bottom = 'B'
-        elif Node.get_label(node) in {'E', 'F', 'G', 'H'}:
-            top_bottom = 'T'
-        else:
-            top_bottom = None
-
-        return top_bottom
+        return Node.get_info(node).top_bottom
 
     @staticmethod
     def get_clock_group(node: str) -> str | None:
@@ -115,10 +262,7 @@ class Node:
         :return: The clock group (CLB node) or None (other types of nodes)
         :rtype: str | None
         """
-        if Node.get_clb_node_type(node):
-            return f'{Node.get_direction(node)}_{Node.get_top_bottom(node)}'
-        else:
-            return None
+        return Node.get_info(node).clock_group
 
     @staticmethod
     def get_coordinate(node: str) -> str:
@@ -129,7 +273,7 @@ class Node:
         :return: The coordinate (X#Y#)
         :rtype: str
         """
-        return re.findall('X-*\d+Y-*\d+', node)[0]
+        return Node.get_info(node).coordinate
 
     @staticmethod
     def get_x_coord(node: str) -> int:
@@ -140,7 +284,7 @@ class Node:
         :return: The X coordinate
         :rtype: int
         """
-        return int(re.findall('-*\d+', Node.get_coordinate(node))[0])
+        return Node.get_info(node).x
 
     @staticmethod
     def get_y_coord(node: str) -> int:
@@ -151,7 +295,7 @@ class Node:
         :return: The Y coordinate
         :rtype: int
         """
-        return int(re.findall('-*\d+', Node.get_coordinate(node))[1])
+        return Node.get_info(node).y
 
     @staticmethod
     def get_borders_coords(*coords):
@@ -209,12 +353,7 @@ class Node:
         :return: The label (CLB node) or None (INT node)
         :rtype: str | None
         """
-        if Node.get_tile_type(node) == cfg.INT_label:
-            return None
-        elif Node.get_tile_type(node) == 'CLB':
-            return node.split('_SITE_0_')[-1][0]
-        else:
-            raise ValueError(f'Node: {node} is Invaild!')
+        return Node.get_info(node).label
 
     @staticmethod
     def get_port_suffix(node: str) -> str | None:
@@ -259,18 +398,7 @@ class Node:
         :return: The CLB node type (CLB node) or None(other types of nodes)
         :rtype: str | None
         """
-        if re.match(cfg.LUT_in_pattern, node):
-            return 'LUT_in'
-        elif re.match(cfg.FF_in_pattern, node):
-            return 'FF_in'
-        elif re.match(cfg.FF_out_pattern, node):
-            return 'FF_out'
-        elif re.match(cfg.CLB_out_pattern, node):
-            return 'CLB_out'
-        elif re.match(cfg.MUXED_CLB_out_pattern, node):
-            return 'CLB_muxed'
-        else:
-            return None
+        return Node.get_info(node).clb_node_type
 
     @staticmethod
     def get_primitive(node: str) -> str | None:
@@ -299,21 +427,7 @@ class Node:
         :return: The BEL name (CLB node) or None (other types of nodes)
         :rtype: str | None
         """
-        if re.match(cfg.LUT_in_pattern, node) or re.match(cfg.Unregistered_CLB_out_pattern, node):
-            key = Node.get_tile(node) + '/' + Node.get_label(node) + 'LUT'
-
-        elif re.match(cfg.FF_in_pattern, node):
-            suffix = ['', '2']
-            key = Node.get_tile(node) + '/' + Node.get_label(node) + 'FF' + suffix[Node.get_bel_index(node) - 1]
-
-        elif re.match(cfg.FF_out_pattern, node):
-            suffix = ['', '2']
-            key = Node.get_tile(node) + '/' + Node.get_label(node) + 'FF' + suffix[Node.get_bel_index(node) - 1]
-
-        else:
-            key = None
-
-        return key
+        return Node.get_info(node).bel
 
     @staticmethod
     def get_bel_index(node: str) -> int:
@@ -0,0 +1,180 @@
+from itertools import compress
+from typing import Iterable, Tuple
+
+class NodeIndex:
+    """
+    This class interns node names into consecutive integer IDs. ID 0 is reserved for nodes that are not interned.
+    """
+    __slots__ = ('nodes', 'ids')
+    def __init__(self, nodes: Iterable[str] = ()):
+        self.nodes  = [None]
+        self.ids    = {}
+        for node in nodes:
+            self.get_id(node)
+
+    def __repr__(self):
+        return f'NodeIndex({len(self)} nodes)'
+
+    def __len__(self):
+        return len(self.nodes) - 1
+
+    def get_id(self, node: str) -> int:
+        """This function returns the ID of the specified node and interns it if necessary
+
+        :param node: Node name
+        :type node: str
+        :return: Node ID
+        :rtype: int
+        """
+        node_id = self.ids.get(node)
+        if node_id is None:
+            node_id = len(self.nodes)
+            self.ids[node] = node_id
+            self.nodes.append(node)
+
+        return node_id
+
+class NodeBitmap:
+    """
+    This class keeps a set of nodes as a bitmap (one byte per node) over the IDs of a node index.
+    Copies share their bitmap until one of them is modified (copy-on-write), so per-route layers on top of the
+    blocked nodes of a TC only cost a memory copy when they add or remove nodes.
+    The state is the XOR of the hashes of the members. It is updated with each added or removed node, so that equal
+    sets of members have equal states. Different sets may share a state as well, so it is not an identity.
+    """
+    __slots__ = ('index', 'bits', 'shared', 'state')
+    def __init__(self, index: NodeIndex, nodes: Iterable[str] = ()):
+        self.index  = index
+        self.bits   = bytearray(len(index.nodes))
+        self.shared = False
+        self.state  = 0
+        self.update(nodes)
+
+    def __repr__(self):
+        return f'NodeBitmap({len(self)} nodes)'
+
+    def __reduce__(self):
+        # only the members are stored; the index is rebuilt from them
+        nodes = list(self)
+        return (self.__class__, (NodeIndex(nodes), nodes))
+
+    def __contains__(self, node):
+        node_id = self.index.ids.get(node, 0)
+        return node_id < len(self.bits) and self.bits[node_id] == 1
+
+    def __iter__(self):
+        return compress(self.index.nodes, self.bits)
+
+    def __len__(self):
+        return self.bits.count(1)
+
+    def __bool__(self):
+        return 1 in self.bits
+
+    def __ior__(self, nodes):
+        self.update(nodes)
+        return self
+
+    def __isub__(self, nodes):
+        self.difference_update(nodes)
+        return self
+
+    def __or__(self, nodes):
+        return self.union(nodes)
+
+    def __sub__(self, nodes):
+        return self.difference(nodes)
+
+    def get_bits(self) -> bytearray:
+        """This function returns the writable bitmap, detaching it from the copies that share it
+
+        :return: Bitmap
+        :rtype: bytearray
+        """
+        if self.shared:
+            self.bits = bytearray(self.bits)
+            self.shared = False
+
+        return self.get_flags()[1]
+
+    def add(self, node: str):
+        self.update((node,))
+
+    def discard(self, node: str):
+        self.difference_update((node,))
+
+    def update(self, *others: Iterable[str]):
+        members = [(self.index.get_id(node), node) for nodes in others for node in nodes]
+        if members:
+            bits, state = self.get_bits(), self.state
+            for node_id, node in members:
+                if not bits[node_id]:
+                    bits[node_id] = 1
+                    state ^= hash(node)
+
+            self.state = state
+
+    def difference_update(self, *others: Iterable[str]):
+        members = [(self.index.ids[node], node) for nodes in others for node in nodes if node in self]
+        if members:
+            bits, state = self.get_bits(), self.state
+            for node_id, node in members:
+                if bits[node_id]:
+                    bits[node_id] = 0
+                    state ^= hash(node)
+
+            self.state = state
+
+    def clear(self):
+        self.bits = bytearray(len(self.index.nodes))
+        self.shared = False
+        self.state = 0
+
+    def copy(self) -> 'NodeBitmap':
+        """This function returns a copy-on-write layer of the bitmap
+
+        :return: The copy
+        :rtype: NodeBitmap
+        """
+        bitmap = NodeBitmap.__new__(NodeBitmap)
+        bitmap.index = self.index
+        bitmap.bits = self.bits
+        bitmap.shared = self.shared = True
+        bitmap.state = self.state
+        return bitmap
+
+    def union(self, *others: Iterable[str]) -> 'NodeBitmap':
+        bitmap = self.copy()
+        bitmap.update(*others)
+        return bitmap
+
+    def difference(self, *others: Iterable[str]) -> 'NodeBitmap':
+        bitmap = self.copy()
+        bitmap.difference_update(*others)
+        return bitmap
+
+    def get_flags(self) -> Tuple[dict, bytearray]:
+        """This function returns the node IDs and the bitmap, so that a membership test is a lookup of
+        flags[ids.get(node, 0)]. The bitmap must not be modified during the lookups.
+
+        :return: Node IDs and bitmap
+        :rtype: Tuple[dict, bytearray]
+        """
+        # trailing zeros do not change the members of the copies sharing the bitmap
+        if len(self.bits) < len(self.index.nodes):
+            self.bits.extend(bytes(len(self.index.nodes) - len(self.bits)))
+
+        return self.index.ids, self.bits
+
+def get_flags(blocked_nodes) -> Tuple[dict, bytes]:
+    """This function returns the membership lookup of the specified blocked nodes for the router
+
+    :param blocked_nodes: Blocked nodes
+    :type blocked_nodes: NodeBitmap|Set[str]
+    :return: Node IDs and flags (flags[ids.get(node, 0)] is 1 for blocked nodes)
+    :rtype: Tuple[dict, bytes]
+    """
+    if isinstance(blocked_nodes, NodeBitmap):
+        return blocked_nodes.get_flags()
+
+    return dict.fromkeys(blocked_nodes, 1), b'\x00\x01'
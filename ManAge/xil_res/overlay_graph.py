@@ -0,0 +1,180 @@
+import copy
+import networkx as nx
+
+class OverlayGraph(nx.DiGraph):
+    """
+    This class is a copy-on-write view of a directed graph. The adjacency rows and edge attribute dictionaries of the
+    base graph are shared until a row is modified; only the rows touched by additions and deletions are copied.
+    The graph stays a regular nx.DiGraph for the readers, so the router can still access _succ and _pred directly.
+    The base graph must not be modified while overlays of it are in use.
+    While an undo log is attached, the inverse of each node and edge mutation is recorded in it. While a reachability
+    tracker is attached, each node and edge mutation is reported to it.
+    """
+    reachability = None
+
+    def __init__(self, base: nx.DiGraph = None, **attr):
+        super().__init__(**attr)
+        self.owned_succ = set()
+        self.owned_pred = set()
+        self.undo_log   = None
+        self.reachability = None
+        if base is not None:
+            self._node.update(base._node)
+            self._succ.update(base._succ)
+            self._pred.update(base._pred)
+            self.graph.update(copy.deepcopy(base.graph))
+
+    def own_succ(self, node):
+        if node not in self.owned_succ:
+            self._succ[node] = dict(self._succ[node])
+            self.owned_succ.add(node)
+
+    def own_pred(self, node):
+        if node not in self.owned_pred:
+            self._pred[node] = dict(self._pred[node])
+            self.owned_pred.add(node)
+
+    def add_node(self, node_for_adding, **attr):
+        if node_for_adding not in self._succ:
+            self.owned_succ.add(node_for_adding)
+            self.owned_pred.add(node_for_adding)
+            super().add_node(node_for_adding, **attr)
+            if self.undo_log is not None:
+                self.undo_log.record(self.remove_node, node_for_adding)
+        elif attr:
+            if self.undo_log is not None:
+                self.undo_log.record(self._node.__setitem__, node_for_adding, self._node[node_for_adding])
+
+            self._node[node_for_adding] = {**self._node[node_for_adding], **attr}
+
+    def add_nodes_from(self, nodes_for_adding, **attr):
+        for node in nodes_for_adding:
+            if isinstance(node, tuple):
+                self.add_node(node[0], **{**attr, **node[1]})
+            else:
+                self.add_node(node, **attr)
+
+    def add_edge(self, u_of_edge, v_of_edge, **attr):
+        u, v = u_of_edge, v_of_edge
+        for node in (u, v):
+            if node not in self._succ:
+                self.add_node(node)
+
+        self.own_succ(u)
+        self.own_pred(v)
+        if self.undo_log is not None:
+            if v in self._succ[u]:
+                self.undo_log.record(self.restore_edge, u, v, self._succ[u][v])
+            else:
+                self.undo_log.record(self.remove_edge, u, v)
+
+        # the attribute dictionary of an existing edge may be shared with the base graph
+        datadict = dict(self._succ[u].get(v, ()))
+        datadict.update(attr)
+        self._succ[u][v] = datadict
+        self._pred[v][u] = datadict
+        if self.reachability is not None:
+            self.reachability.add_edge(u, v)
+
+    def add_edges_from(self, ebunch_to_add, **attr):
+        for e in ebunch_to_add:
+            if len(e) == 3:
+                u, v, dd = e
+            elif len(e) == 2:
+                u, v = e
+                dd = {}
+            else:
+                raise nx.NetworkXError(f"Edge tuple {e} must be a 2-tuple or 3-tuple.")
+
+            self.add_edge(u, v, **{**attr, **dd})
+
+    def remove_edge(self, u, v):
+        if u not in self._succ or v not in self._succ[u]:
+            raise nx.NetworkXError(f"The edge {u}-{v} not in graph.")
+
+        self.own_succ(u)
+        self.own_pred(v)
+        if self.undo_log is not None:
+            self.undo_log.record(self.restore_edge, u, v, self._succ[u][v])
+
+        if self.reachability is not None:
+            self.reachability.remove_edge(u, v)
+
+        del self._succ[u][v]
+        del self._pred[v][u]
+
+    def restore_edge(self, u, v, datadict: dict):
+        """This function puts back an edge with its attribute dictionary. It is not recorded in the undo log.
+
+        :param u: Source node
+        :type u: str
+        :param v: Target node
+        :type v: str
+        :param datadict: Attribute dictionary of the edge
+        :type datadict: dict
+        """
+        self.own_succ(u)
+        self.own_pred(v)
+        self._succ[u][v] = datadict
+        self._pred[v][u] = datadict
+        if self.reachability is not None:
+            self.reachability.add_edge(u, v)
+
+    def remove_edges_from(self, ebunch):
+        for e in ebunch:
+            u, v = e[:2]
+            if u in self._succ and v in self._succ[u]:
+                self.remove_edge(u, v)
+
+    def remove_node(self, n):
+        if n not in self._succ:
+            raise nx.NetworkXError(f"The node {n} is not in the digraph.")
+
+        if self.reachability is not None:
+            self.reachability.remove_node(n)
+
+        if self.undo_log is not None:
+            # the edges are removed one by one, so that they are recorded before the node
+            for v in list(self._succ[n]):
+                self.remove_edge(n, v)
+
+            for u in list(self._pred[n]):
+                self.remove_edge(u, n)
+
+            self.undo_log.record(self.add_nodes_from, [(n, self._node[n])])
+
+        for u in self._succ[n]:
+            self.own_pred(u)
+            del self._pred[u][n]
+
+        for u in self._pred[n]:
+            self.own_succ(u)
+            del self._succ[u][n]
+
+        del self._node[n]
+        del self._succ[n]
+        del self._pred[n]
+        self.owned_succ.discard(n)
+        self.owned_pred.discard(n)
+
+    def remove_nodes_from(self, nodes):
+        for n in nodes:
+            if n in self._succ:
+                self.remove_node(n)
+
+    def clear(self):
+        super().clear()
+        self.owned_succ.clear()
+        self.owned_pred.clear()
+        if self.reachability is not None:
+            self.reachability.remove_node(self.reachability.source)
+
+    def clear_edges(self):
+        if self.reachability is not None:
+            self.reachability.remove_node(self.reachability.source)
+
+        for node in self._succ:
+            self._succ[node] = {}
+            self._pred[node] = {}
+            self.owned_succ.add(node)
+            self.owned_pred.add(node)
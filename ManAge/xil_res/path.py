@@ -1,13 +1,15 @@
-import copy
-from heapq import heappush, heappop
-from itertools import count, product
+from itertools import product
 import networkx as nx
 from typing import List, Set, Tuple
 from xil_res.node import Node as nd
 from xil_res.edge import PIP
 import utility.config as cfg
+from xil_res.router import path_finder
+from xil_res.edge_weights import EdgeWeights
 
 class Path:
+    # number of searches and expanded nodes of all path searches
+    search_stats = {'searches': 0, 'expanded': 0, 'cached': 0}
 
     def __init__(self):
         self.src        = None
@@ -17,7 +19,6 @@ class Path:
         self._nodes     = []
         self.subLUTs    = set()
         self.FFs        = set()
-        self.prev_CD = []
 
     def __repr__(self):
         if self.nodes:
@@ -159,6 +160,7 @@ class Path:
 
             sublut_name = f'{nd.get_tile(LUT_in)}/{nd.get_label(LUT_in)}{TC.get_subLUT_bel(LUT_output, LUT_in)}'
             subLUT = TC.subLUTs[sublut_name]
+            TC.undo_log.save(subLUT)
             subLUT.fill(LUT_output, LUT_func, LUT_in)
             subLUTs.add(subLUT)
 
@@ -174,95 +176,36 @@ class Path:
 
     @staticmethod
     def path_finder(G, source, target, weight="weight", conflict_free=True, delimiter='/', dummy_nodes=[],
-                    blocked_nodes=set()):
-        if {source, target} & blocked_nodes:
+                    blocked_nodes=set(), method='dijkstra', stats=None):
+        path = path_finder(G, source, target, weight, conflict_free, delimiter, dummy_nodes, blocked_nodes, method, stats)
+        return [node for node in path if node not in dummy_nodes]
+
+    def find_path(self, TC, source, target, **attr):
+        """This function finds a path in the graph of the TC. Queries that have already failed under the same
+        graph state and blocked nodes fail immediately.
+
+        :param TC: Minimal test configuration
+        :type TC: MinConfig
+        :param source: Source node
+        :type source: str
+        :param target: Target node
+        :type target: str
+        :raises nx.NetworkXNoPath: When no path exists
+        :return: The path
+        :rtype: List[str]
+        """
+        blocked_nodes, conflict_free = attr.get('blocked_nodes', set()), attr.get('conflict_free', True)
+        if TC.is_unreachable(source, target, blocked_nodes):
+            Path.search_stats['cached'] += 1
             raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
 
-        if source not in G or target not in G:
-            msg = f"Either source {source} or target {target} is not in G"
-            raise nx.NodeNotFound(msg)
-
-        if source == target:
-            return [source]
-
-        weight = Path.weight_function(G, weight)
-        push = heappush
-        pop = heappop
-        # Init:  [Forward, Backward]
-        dists = [{}, {}]  # dictionary of final distances
-        paths = [{source: [source]}, {target: [target]}]  # dictionary of paths
-        fringe = [[], []]  # heap of (distance, node) for choosing node to expand
-        seen = [{source: 0}, {target: 0}]  # dict of distances to seen nodes
-        c = count()
-        # initialize fringe heap
-        push(fringe[0], (0, next(c), source))
-        push(fringe[1], (0, next(c), target))
-        # neighs for extracting correct neighbor information
-        if G.is_directed():
-            neighs = [G._succ, G._pred]
-        else:
-            neighs = [G._adj, G._adj]
-        # variables to hold shortest discovered path
-        # finaldist = 1e30000
-        finalpath = []
-        finaldist = 0
-        dir = 1
-        while fringe[0] and fringe[1]:
-            # choose direction
-            # dir == 0 is forward direction and dir == 1 is back
-            dir = 1 - dir
-            # extract closest to expand
-            (dist, _, v) = pop(fringe[dir])
-            if v in dists[dir]:
-                # Shortest path to v has already been found
-                continue
-            # update distance
-            dists[dir][v] = dist  # equal to seen[dir][v]
-            if v in dists[1 - dir]:
-                # if we have scanned v in both directions we are done
-                # we have now discovered the shortest path
-                if not finalpath:
-                    raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
-                else:
-                    finalpath = [node for node in finalpath if node not in dummy_nodes]
-                    return finalpath
+        try:
+            return self.path_finder(TC.G, source, target, **attr)
+        except nx.NetworkXNoPath:
+            if not conflict_free:
+                TC.add_unreachable(source, target, blocked_nodes)
 
-            for w, d in neighs[dir][v].items():
-                # weight(v, w, d) for forward and weight(w, v, d) for back direction
-                if w in blocked_nodes:
-                    cost = None
-                else:
-                    cost = weight(v, w, d) if dir == 0 else weight(w, v, d)
-
-                if cost is None:
-                    continue
-                vwLength = dists[dir][v] + cost
-                if w in dists[dir]:
-                    if vwLength < dists[dir][w]:
-                        raise ValueError("Contradictory paths found: negative weights?")
-                elif w not in seen[dir] or vwLength < seen[dir][w]:
-                    # relaxing
-                    seen[dir][w] = vwLength
-                    push(fringe[dir], (vwLength, next(c), w))
-                    paths[dir][w] = paths[dir][v] + [w]
-                    if w in seen[0] and w in seen[1]:
-                        # see if this path is better than the already
-                        # discovered shortest path
-                        totaldist = seen[0][w] + seen[1][w]
-                        if finalpath == [] or finaldist > totaldist:
-                            finaldist_prev = finaldist
-                            finaldist = totaldist
-                            revpath = paths[1][w][:]
-                            revpath.reverse()
-                            finalpath_prev = finalpath[:]
-                            finalpath = paths[0][w] + revpath[1:]
-                            if conflict_free:
-                                ports_only = [node.split(delimiter)[1] for node in finalpath if (delimiter in node) and (node not in dummy_nodes)]
-                                if len(ports_only) != len(set(ports_only)):
-                                    finalpath = finalpath_prev
-                                    finaldist = finaldist_prev
-
-        raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+            raise
 
     @staticmethod
     def weight_function(G, weight):
@@ -325,7 +268,7 @@ class PathOut(Path):
         :param main_path: The path for covering a PIP (in the phase of choosing the PIP that routing is done for estimation purpose this path is None), defaults to None
         :type main_path: MainPath|None
         :return: Set of nodes to be excluded from routing   
-        :rtype: Set[str]
+        :rtype: NodeBitmap
         """
         blocked_nodes = TC.blocked_nodes.copy()
         if main_path is not None:
@@ -358,16 +301,16 @@ class PathOut(Path):
         path = []
         dummy_nodes = [self.src, self.sink] if self.estimation else [self.sink]
         blocked_nodes = self.get_blocked_nodes(TC, pips, first_order, main_path)
-        attr = {'conflict_free': True, 'dummy_nodes': dummy_nodes, 'blocked_nodes': blocked_nodes}
+        attr = {'conflict_free': True, 'dummy_nodes': dummy_nodes, 'blocked_nodes': blocked_nodes, 'method': cfg.search_method, 'stats': Path.search_stats}
         try:
-            path = self.path_finder(TC.G, self.src, self.sink, **attr)
+            path = self.find_path(TC, self.src, self.sink, **attr)
             # uncovered predecessors of the pip_v (pip_u) mustn't show up in path_out
             uncovered_pips_u = {pip[0] for pip in TC.G.in_edges(path[0]) if pip in pips}
             if uncovered_pips_u & set(path):
                 blocked_nodes.update(uncovered_pips_u)
 
                 try:
-                    path = self.path_finder(TC.G, path[0], self.sink, **attr)
+                    path = self.find_path(TC, path[0], self.sink, **attr)
                     #self.nodes = path
                 except nx.NetworkXNoPath:
                     path = []
@@ -375,7 +318,7 @@ class PathOut(Path):
         except nx.NetworkXNoPath:
             try:
                 attr['conflict_free'] = False
-                path = self.path_finder(TC.G, self.src, self.sink, **attr)
+                path = self.find_path(TC, self.src, self.sink, **attr)
             except nx.NetworkXNoPath:
                 pass
 
@@ -409,7 +352,7 @@ class PathIn(Path):
         :param main_path: The path for covering a PIP (in the phase of choosing the PIP that routing is done for estimation purpose this path is None), defaults to None
         :type main_path: MainPath|None, optional
         :return: Set of nodes to be excluded from routing   
-        :rtype: Set[str]
+        :rtype: NodeBitmap
         """
         blocked_nodes = TC.blocked_nodes.copy()
         if self.estimation:
@@ -443,15 +386,15 @@ class PathIn(Path):
         """
         dummy_nodes = [self.src]
         blocked_nodes = self.get_blocked_nodes(TC, pips, path_out, first_order, main_path)
-        attr = {'conflict_free': True, 'dummy_nodes': dummy_nodes, 'blocked_nodes': blocked_nodes}
+        attr = {'conflict_free': True, 'dummy_nodes': dummy_nodes, 'blocked_nodes': blocked_nodes, 'method': cfg.search_method, 'stats': Path.search_stats}
 
         try:
-            path = self.path_finder(TC.G, self.src, self.sink, **attr)
+            path = self.find_path(TC, self.src, self.sink, **attr)
             self.nodes = path
         except nx.NetworkXNoPath:
             try:
                 attr['conflict_free'] = False
-                path = self.path_finder(TC.G, self.src, self.sink, **attr)
+                path = self.find_path(TC, self.src, self.sink, **attr)
                 self.nodes = path
             except nx.NetworkXNoPath:
                 self.error = True
@@ -527,7 +470,6 @@ class MainPath(Path):
 
         TC = test_collection.TC
         pips = test_collection.queue
-        self.prev_CD = copy.deepcopy(TC.CD)
         paths = self.sort_paths()
         for idx, path in enumerate(paths):
             if path.type == 'path_in':
@@ -539,7 +481,6 @@ class MainPath(Path):
                 self.error = True
                 return
 
-            path.prev_CD = copy.deepcopy(TC.CD)
             TC.fill_CUT(test_collection, path)
 
         self.path_in = next(path for path in paths if path.type == 'path_in')
@@ -560,8 +501,7 @@ class MainPath(Path):
             result = True
         else:
             edges = [edge for edge in self.get_edges() if any(map(lambda node: cfg.CLB_out_pattern.match(node), edge))]
-            for edge in edges:
-                TC.G.get_edge_data(*edge)['weight'] += 25
+            EdgeWeights.attach(TC.G).array[EdgeWeights.get_ids(TC.G, edges)] += 25
 
         return result
 
@@ -586,7 +526,7 @@ class NotPath(Path):
         sinks = (nd.get_LUT_input(tile, label, index) for index in range(6))
         edges = set(product({self.src}, sources))
         edges.update(set(product(sinks, {self.sink})))
-        G.add_edges_from(edges)
+        G.add_edges_from(sorted(edges))
 
     def remove_virtual_source_sink(self, G: nx.DiGraph):
         """This function removes the assigned virtual nodes from the architecture graph
@@ -594,7 +534,7 @@ class NotPath(Path):
         :param G: Architecture graph
         :type G: nx.DiGraph
         """
-        G.remove_nodes_from({self.src, self.sink})
+        G.remove_nodes_from(sorted({self.src, self.sink}))
 
     def get_blocked_nodes(self, test_collection):
         """This function decides on the nodes to be excluded from the routing of the Not path
@@ -602,7 +542,7 @@ class NotPath(Path):
         :param test_collection: Test collection
         :type test_collection: TestCollection
         :return: A set of nodes to be excluded from routing
-        :rtype: Set[str]
+        :rtype: NodeBitmap
         """
         device = test_collection.device
         TC = test_collection.TC
@@ -614,7 +554,7 @@ class NotPath(Path):
         # sharing the LUT_in is not allowed
         main_path_nodes = {node for node in cut.main_path if nd.get_clb_node_type(node) != 'LUT_in'}
 
-        blocked_nodes = device.blocking_nodes(TC).union(TC.blocked_nodes) - main_path_nodes
+        blocked_nodes = TC.blocked_nodes.union(device.blocking_nodes(TC)) - main_path_nodes
         blocked_nodes.update(route_thrus)
         return blocked_nodes
 
@@ -628,19 +568,19 @@ class NotPath(Path):
         device = test_collection.device
         TC = test_collection.TC
         cut = TC.CUTs[-1]
-        self.prev_CD = copy.deepcopy(TC.CD)
         self.assign_virtual_source_sink(TC.G, cut.main_path)
+        TC.invalidate_routes()
         dummy_nodes = [self.src, self.sink]
         blocked_nodes = self.get_blocked_nodes(test_collection)
-        attr = {'weight': device.weight,'conflict_free': True, 'dummy_nodes': dummy_nodes, 'blocked_nodes': blocked_nodes}
+        attr = {'conflict_free': True, 'dummy_nodes': dummy_nodes, 'blocked_nodes': blocked_nodes, 'method': cfg.search_method, 'stats': Path.search_stats}
         try:
-            path = self.path_finder(TC.G, self.src, self.sink, **attr)
+            path = self.find_path(TC, self.src, self.sink, **attr)
             self.nodes = path
         except nx.NetworkXNoPath:
             try:
                 if len(TC.CUTs) < (cfg.max_capacity / 8):
                     blocked_nodes -= device.blocking_nodes(TC)
-                    path = self.path_finder(TC.G, self.src, self.sink, **attr)
+                    path = self.find_path(TC, self.src, self.sink, **attr)
                     self.nodes = path
                 else:
                     raise nx.NetworkXNoPath
@@ -648,7 +588,7 @@ class NotPath(Path):
             except nx.NetworkXNoPath:
                 try:
                     attr['conflict_free'] = False
-                    path = self.path_finder(TC.G, self.src, self.sink, **attr)
+                    path = self.find_path(TC, self.src, self.sink, **attr)
                     self.nodes = path
                 except nx.NetworkXNoPath:
                     self.error = True
@@ -0,0 +1,86 @@
+import numpy as np
+from typing import Callable
+import utility.config as cfg
+from xil_res.edge_weights import EdgeWeights
+
+class PIPOrder:
+    """
+    This class describes a strategy for the order in which pick_pip tries the uncovered PIPs. The strategy returns a weight
+    for the edge between the virtual node pip_v and the head of each uncovered PIP, so the path_out estimation of pick_pip
+    prefers the heads with the lowest weights. None keeps all weights at 0 (the cheapest PIP is picked).
+    """
+    __slots__ = ('name', 'get_weights')
+    def __init__(self, name: str, get_weights: Callable):
+        self.name           = name
+        self.get_weights    = get_weights
+
+    def __repr__(self):
+        return self.name
+
+orders = {}
+
+def register_order(order: PIPOrder):
+    """This function registers a PIP order under its name
+
+    :param order: The PIP order
+    :type order: PIPOrder
+    """
+    orders[order.name] = order
+
+def get_order(name: str | None = None) -> PIPOrder:
+    """This function returns the specified PIP order or the configured default one
+
+    :param name: Name of the PIP order, defaults to None
+    :type name: str | None, optional
+    :raises ValueError: When the PIP order is not registered
+    :return: The PIP order
+    :rtype: PIPOrder
+    """
+    name = cfg.pip_order if name is None else name
+    if name not in orders:
+        raise ValueError(f'Unsupported PIP order: {name}! Available orders: {list(orders)}')
+
+    return orders[name]
+
+def get_difficulties(test_collection) -> dict:
+    """This function rates the difficulty of the uncovered PIPs of each head by the length of the shortest path through
+    the PIP (pips_length_dict), the failed attempts at the head, and the congestion (cost) of the PIP. Each term is
+    normalized to [0, 1] over the queue.
+
+    :param test_collection: Test collection
+    :type test_collection: TestCollection
+    :return: Difficulty of the hardest uncovered PIP of each head
+    :rtype: dict
+    """
+    device = test_collection.device
+    pips = list(test_collection.queue)
+    if not pips:
+        return {}
+
+    lengths = np.array([device.pips_length_dict.get(pip, 0) for pip in pips], dtype=np.float64)
+    failures = np.array([test_collection.pip_failures[pip[1]] for pip in pips], dtype=np.float64)
+    weights = EdgeWeights.attach(device.G)
+    costs = np.array([weights.get(device.G, pip) if device.G.has_edge(*pip) else 0 for pip in pips], dtype=np.float64)
+
+    difficulties = sum(values / values.max() for values in (lengths, failures, costs) if values.max() > 0)
+    head_difficulties = {}
+    for pip, difficulty in zip(pips, np.broadcast_to(difficulties, len(pips))):
+        head_difficulties[pip[1]] = max(difficulty, head_difficulties.get(pip[1], 0))
+
+    return head_difficulties
+
+def get_hardest_weights(test_collection, TC) -> dict:
+    difficulties = get_difficulties(test_collection)
+    max_difficulty = max(difficulties.values(), default=0)
+    if max_difficulty == 0:
+        return None
+
+    return {head: cfg.pip_order_weight * (1 - difficulty / max_difficulty) for head, difficulty in difficulties.items()}
+
+def get_interleaved_weights(test_collection, TC) -> dict:
+    # the hardest PIPs are preferred for the even CUTs and the cheapest ones for the odd CUTs
+    return get_hardest_weights(test_collection, TC) if len(TC.CUTs) % 2 == 0 else None
+
+register_order(PIPOrder('cheapest', lambda test_collection, TC: None))
+register_order(PIPOrder('hardest', get_hardest_weights))
+register_order(PIPOrder('interleaved', get_interleaved_weights))
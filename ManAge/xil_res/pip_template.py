@@ -0,0 +1,61 @@
+from typing import Set, Tuple, List, Iterator
+
+class PipTemplate:
+    """
+    This class stores the PIPs shared by all INT tiles once, as pairs of port indices. The PIPs of a tile are expanded
+    from the template on demand instead of being kept as node name pairs for every tile.
+    """
+    __slots__ = ('ports', 'port_ids', 'pips')
+    def __init__(self, pips: Set[Tuple[str, str]]):
+        self.ports      = sorted({port for pip in pips for port in pip})
+        self.port_ids   = {port: idx for idx, port in enumerate(self.ports)}
+        self.pips       = sorted((self.port_ids[u], self.port_ids[v]) for u, v in pips)
+
+    def __repr__(self):
+        return f'PipTemplate(ports={len(self.ports)}, pips={len(self.pips)})'
+
+    def __len__(self):
+        return len(self.pips)
+
+    def get_node_names(self, tile: str) -> List[str]:
+        """This function expands the names of all pipjuncs of the specified tile, indexed by port ID.
+        Each name is created once, so all PIPs of the tile share the same string objects.
+
+        :param tile: INT tile
+        :type tile: str
+        :return: Node names
+        :rtype: List[str]
+        """
+        return [f'{tile}/{port}' for port in self.ports]
+
+    def iter_pips(self, tile: str) -> Iterator[Tuple[str, str]]:
+        """This function lazily yields the PIPs of the specified tile
+
+        :param tile: INT tile
+        :type tile: str
+        :return: PIPs
+        :rtype: Iterator[Tuple[str, str]]
+        """
+        names = self.get_node_names(tile)
+        return ((names[u], names[v]) for u, v in self.pips)
+
+    def get_pipjuncs(self, tile: str) -> Set[str]:
+        """This function returns the pipjuncs of the specified tile
+
+        :param tile: INT tile
+        :type tile: str
+        :return: Pipjuncs
+        :rtype: Set[str]
+        """
+        return set(self.get_node_names(tile))
+
+    def add_to_graph(self, G, tiles, **attr):
+        """This function expands the template over the specified tiles into the graph
+
+        :param G: Graph
+        :type G: nx.DiGraph
+        :param tiles: INT tiles
+        :type tiles: Iterable[str]
+        """
+        for tile in tiles:
+            G.add_edges_from(self.iter_pips(tile), **attr)
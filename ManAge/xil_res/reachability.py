@@ -0,0 +1,115 @@
+from collections import deque
+from typing import Iterable, Set, Tuple
+import networkx as nx
+
+class Reachability:
+    """
+    This class keeps the nodes reachable from a source node of a graph (the virtual source node of a TC) as a BFS tree.
+    The graph reports its edge and node mutations (see OverlayGraph), which only mark the touched tree edges and the
+    added edges leaving the tree. The tree is repaired at the next query: the subtrees under removed tree edges are
+    detached and regrown from their remaining reachable predecessors, so a query costs O(1) between mutations.
+    """
+    __slots__ = ('G', 'source', 'parent', 'children', 'removed', 'added')
+    def __init__(self, G: nx.DiGraph, source: str):
+        self.G          = G
+        self.source     = source
+        self.parent     = {}
+        self.children   = {}
+        self.removed    = set()
+        self.added      = set()
+        self.grow([(source, None)])
+
+    def __repr__(self):
+        return f'Reachability({len(self.parent)} nodes from {self.source})'
+
+    def grow(self, seeds: Iterable[Tuple[str, str]]):
+        """This function adds the nodes reachable from the specified seeds to the tree
+
+        :param seeds: Pairs of a node and its parent in the tree
+        :type seeds: Iterable[Tuple[str, str]]
+        """
+        succ = self.G._succ
+        queue = deque(seeds)
+        while queue:
+            node, parent = queue.popleft()
+            if node in self.parent or node not in succ:
+                continue
+
+            self.parent[node] = parent
+            self.children[node] = set()
+            if parent is not None:
+                self.children[parent].add(node)
+
+            queue.extend((neigh, node) for neigh in succ[node] if neigh not in self.parent)
+
+    def remove_edge(self, u: str, v: str):
+        if v in self.parent and self.parent[v] == u:
+            self.removed.add(v)
+
+    def remove_node(self, node: str):
+        if node in self.parent:
+            self.removed.add(node)
+
+    def add_edge(self, u: str, v: str):
+        if u in self.parent and v not in self.parent:
+            self.added.add((u, v))
+
+    def update(self):
+        """This function repairs the tree after the reported mutations
+        """
+        if not (self.removed or self.added):
+            return
+
+        # the subtrees under the removed tree edges and nodes are detached
+        detached = set()
+        stack = [node for node in self.removed if node in self.parent]
+        while stack:
+            node = stack.pop()
+            if node not in detached:
+                detached.add(node)
+                stack.extend(self.children[node])
+
+        for node in detached:
+            parent = self.parent.pop(node)
+            del self.children[node]
+            if parent is not None and parent not in detached:
+                self.children[parent].discard(node)
+
+        # the detached nodes are regrown from the remaining tree, which is intact, and from the added edges
+        succ, pred = self.G._succ, self.G._pred
+        seeds = [(v, u) for u, v in self.added if u in self.parent and v in succ.get(u, ())]
+        for node in detached:
+            if node == self.source:
+                seeds.append((node, None))
+            elif node in pred:
+                parent = next((u for u in pred[node] if u in self.parent), None)
+                if parent is not None:
+                    seeds.append((node, parent))
+
+        self.removed.clear()
+        self.added.clear()
+        self.grow(seeds)
+
+    def is_reachable(self, node: str) -> bool:
+        """This function determines if there is a path from the source node to the specified node
+
+        :param node: Target node
+        :type node: str
+        :return: True|False
+        :rtype: bool
+        """
+        self.update()
+        return node in self.parent
+
+    def get_unreachable_pips(self, pips: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """This function returns the PIPs that no path from the source node can pass, since their tail is not reachable
+        or the PIP is not in the graph anymore
+
+        :param pips: PIPs
+        :type pips: Iterable[Tuple[str, str]]
+        :return: Unreachable PIPs
+        :rtype: Set[Tuple[str, str]]
+        """
+        self.update()
+        succ = self.G._succ
+        return {pip for pip in pips if pip[0] not in self.parent or pip[1] not in succ[pip[0]]}
@@ -1,12 +1,23 @@
 import re, sys
+from collections import deque
 from heapq import heappush, heappop
 from itertools import count
 import networkx as nx
+from xil_res.node import Node as nd
+from xil_res.node_bitmap import get_flags
 
-def path_finder(G, source, target, weight="weight", conflict_free=True, delimiter='/', dummy_nodes=[], blocked_nodes=set()):
-    if {source, target} & blocked_nodes:
+def path_finder(G, source, target, weight="weight", conflict_free=True, delimiter='/', dummy_nodes=[], blocked_nodes=set(), method='dijkstra', stats=None):
+    if method == 'astar':
+        return astar_path_finder(G, source, target, weight, conflict_free, delimiter, dummy_nodes, blocked_nodes, stats)
+
+    if stats is not None:
+        stats['searches'] += 1
+
+    if source in blocked_nodes or target in blocked_nodes:
         raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
 
+    blocked_ids, blocked_flags = get_flags(blocked_nodes)
+
     if source not in G or target not in G:
         msg = f"Either source {source} or target {target} is not in G"
         raise nx.NodeNotFound(msg)
@@ -14,12 +25,16 @@ def path_finder(G, source, target, weight="weight", conflict_free=True, delimite
     if source == target:
         return [source]
 
+    costs = get_edge_costs(G, weight)
     weight = weight_function(G, weight)
     push = heappush
     pop = heappop
+    get_bit = get_bit_function(G, set(dummy_nodes), delimiter)
     # Init:  [Forward, Backward]
     dists = [{}, {}]  # dictionary of final distances
-    paths = [{source: [source]}, {target: [target]}]  # dictionary of paths
+    parents = [{source: None}, {target: None}]  # dictionary of parent pointers
+    masks = [{source: get_bit(source)}, {target: get_bit(target)}]  # port masks of the partial paths
+    conflicts = [{source: False}, {target: False}]  # partial paths with repeated ports
     fringe = [[], []]  # heap of (distance, node) for choosing node to expand
     seen = [{source: 0}, {target: 0}]  # dict of distances to seen nodes
     c = count()
@@ -31,9 +46,9 @@ def path_finder(G, source, target, weight="weight", conflict_free=True, delimite
         neighs = [G._succ, G._pred]
     else:
         neighs = [G._adj, G._adj]
-    # variables to hold shortest discovered path
+    # variables to hold shortest discovered path as (meeting node, forward parent, backward parent)
     # finaldist = 1e30000
-    finalpath = []
+    finalnode = None
     finaldist = 0
     dir = 1
     while fringe[0] and fringe[1]:
@@ -47,19 +62,23 @@ def path_finder(G, source, target, weight="weight", conflict_free=True, delimite
             continue
         # update distance
         dists[dir][v] = dist  # equal to seen[dir][v]
+        if stats is not None:
+            stats['expanded'] += 1
+
         if v in dists[1 - dir]:
             # if we have scanned v in both directions we are done
             # we have now discovered the shortest path
-            if not finalpath:
+            if finalnode is None:
                 raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
             else:
-                # finalpath = [node for node in finalpath if node not in dummy_nodes]
-                return finalpath
+                return get_meeting_path(parents, *finalnode)
 
         for w, d in neighs[dir][v].items():
             # weight(v, w, d) for forward and weight(w, v, d) for back direction
-            if w in blocked_nodes:
+            if blocked_flags[blocked_ids.get(w, 0)]:
                 cost = None
+            elif costs is not None and 'id' in d:
+                cost = costs[d['id']]
             else:
                 cost = weight(v, w, d) if dir == 0 else weight(w, v, d)
 
@@ -73,26 +92,323 @@ def path_finder(G, source, target, weight="weight", conflict_free=True, delimite
                 # relaxing
                 seen[dir][w] = vwLength
                 push(fringe[dir], (vwLength, next(c), w))
-                paths[dir][w] = paths[dir][v] + [w]
+                parents[dir][w] = v
+                if conflict_free:
+                    bit = get_bit(w)
+                    conflicts[dir][w] = conflicts[dir][v] or bool(masks[dir][v] & bit)
+                    masks[dir][w] = masks[dir][v] | bit
+
                 if w in seen[0] and w in seen[1]:
                     # see if this path is better than the already
                     # discovered shortest path
                     totaldist = seen[0][w] + seen[1][w]
-                    if finalpath == [] or finaldist > totaldist:
-                        finaldist_prev = finaldist
-                        finaldist = totaldist
-                        revpath = paths[1][w][:]
-                        revpath.reverse()
-                        finalpath_prev = finalpath[:]
-                        finalpath = paths[0][w] + revpath[1:]
-                        if conflict_free:
-                            ports_only = [node.split(delimiter)[1] for node in finalpath if node not in dummy_nodes]
-                            if len(ports_only) != len(set(ports_only)):
-                                finalpath = finalpath_prev
-                                finaldist = finaldist_prev
+                    if finalnode is None or finaldist > totaldist:
+                        # only the port of w may appear in both halves
+                        if not (conflict_free and (conflicts[0][w] or conflicts[1][w] or (masks[0][w] & masks[1][w]) != get_bit(w))):
+                            finaldist = totaldist
+                            finalnode = (w, parents[0][w], parents[1][w])
+
+    raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+
+def get_bit_function(G, dummy_nodes, delimiter='/'):
+    """This function returns a function giving the bit of the port of a node in the port masks of conflict-free searches.
+    Port IDs are interned in the graph attributes, so they are released with the graph and bounded by its ports.
+    Node bits are only memoized for the current search.
+
+    :param G: Graph
+    :type G: nx.DiGraph
+    :param dummy_nodes: Nodes without a port bit
+    :type dummy_nodes: Set[str]
+    :param delimiter: Delimiter between tile and port names, defaults to '/'
+    :type delimiter: str, optional
+    :return: Function returning the port bit of a node (0 for nodes without a port)
+    :rtype: Callable
+    """
+    port_bits = G.graph.setdefault('port_bits', {})
+    node_bits = {}
+
+    def get_bit(node):
+        bit = node_bits.get(node)
+        if bit is None:
+            if node in dummy_nodes or delimiter not in node:
+                bit = 0
+            else:
+                port = node.split(delimiter)[1]
+                bit = port_bits.get(port)
+                if bit is None:
+                    bit = port_bits[port] = 1 << len(port_bits)
+
+            node_bits[node] = bit
+
+        return bit
+
+    return get_bit
+
+def get_meeting_path(parents, node, forward_parent, backward_parent):
+    """This function rebuilds the path of a bidirectional search from the parent pointers of both directions
+
+    :param parents: Forward and backward parent pointers
+    :type parents: List[dict]
+    :param node: Meeting node
+    :type node: str
+    :param forward_parent: Forward parent of the meeting node
+    :type forward_parent: str|None
+    :param backward_parent: Backward parent of the meeting node
+    :type backward_parent: str|None
+    :return: The path
+    :rtype: List[str]
+    """
+    path = [node]
+    while forward_parent is not None:
+        path.append(forward_parent)
+        forward_parent = parents[0][forward_parent]
+
+    path.reverse()
+    while backward_parent is not None:
+        path.append(backward_parent)
+        backward_parent = parents[1][backward_parent]
+
+    return path
+
+def get_parent_path(parents, node):
+    """This function rebuilds the path to the specified node from the parent pointers of a unidirectional search
+
+    :param parents: Parent pointers
+    :type parents: dict
+    :param node: Last node of the path
+    :type node: str
+    :return: The path
+    :rtype: List[str]
+    """
+    path = []
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+
+    path.reverse()
+    return path
+
+def astar_path_finder(G, source, target, weight="weight", conflict_free=True, delimiter='/', dummy_nodes=[], blocked_nodes=set(), stats=None):
+    """This function finds a path with the A* algorithm. The heuristic is the tile distance (X/Y) to the target
+    multiplied by the minimum wire cost per tile hop, so it never overestimates the remaining cost.
+    Virtual targets are located at the coordinates of their predecessors. With conflict_free=True,
+    nodes whose ports already exist in the partial path are not expanded.
+
+    :param G: Graph
+    :type G: nx.DiGraph
+    :param source: Source node
+    :type source: str
+    :param target: Target node
+    :type target: str
+    :param weight: Edge weight attribute or function, defaults to "weight"
+    :type weight: str|Callable, optional
+    :param conflict_free: Avoid paths with repeated ports, defaults to True
+    :type conflict_free: bool, optional
+    :param delimiter: Delimiter between tile and port names, defaults to '/'
+    :type delimiter: str, optional
+    :param dummy_nodes: Virtual nodes ignored in the conflict check, defaults to []
+    :type dummy_nodes: List[str], optional
+    :param blocked_nodes: Nodes excluded from the search, defaults to set()
+    :type blocked_nodes: NodeBitmap|Set[str], optional
+    :param stats: Counters updated with the number of searches and expanded nodes, defaults to None
+    :type stats: dict, optional
+    :raises nx.NetworkXNoPath: When no path exists
+    :return: The path
+    :rtype: List[str]
+    """
+    if stats is not None:
+        stats['searches'] += 1
+
+    if source in blocked_nodes or target in blocked_nodes:
+        raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+
+    blocked_ids, blocked_flags = get_flags(blocked_nodes)
+
+    if source not in G or target not in G:
+        msg = f"Either source {source} or target {target} is not in G"
+        raise nx.NodeNotFound(msg)
+
+    if source == target:
+        return [source]
+
+    heuristic = get_heuristic(G, target)
+    costs = get_edge_costs(G, weight)
+    weight = weight_function(G, weight)
+    get_bit = get_bit_function(G, set(dummy_nodes), delimiter)
+    parents = {source: None}
+    masks = {source: get_bit(source)}
+    seen = {source: 0}
+    dists = {}
+    c = count()
+    fringe = [(heuristic(source), next(c), 0, source)]
+    while fringe:
+        (_, _, dist, v) = heappop(fringe)
+        if v in dists:
+            continue
+
+        dists[v] = dist
+        if stats is not None:
+            stats['expanded'] += 1
+
+        if v == target:
+            return get_parent_path(parents, v)
+
+        for w, d in G._succ[v].items():
+            if blocked_flags[blocked_ids.get(w, 0)] or w in dists:
+                continue
+
+            cost = costs[d['id']] if (costs is not None and 'id' in d) else weight(v, w, d)
+            if cost is None:
+                continue
+
+            vwLength = dist + cost
+            if w not in seen or vwLength < seen[w]:
+                bit = get_bit(w)
+                if conflict_free and masks[v] & bit:
+                    continue
+
+                seen[w] = vwLength
+                parents[w] = v
+                masks[w] = masks[v] | bit
+                heappush(fringe, (vwLength + heuristic(w), next(c), vwLength, w))
 
     raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
 
+def get_min_hop_cost(G, weight="weight"):
+    """This function calculates the minimum cost of a wire per tile hop (Manhattan distance) in the graph.
+    The result is cached in the graph attributes; edge weights of the flow only increase, so it remains a lower bound.
+
+    :param G: Graph
+    :type G: nx.DiGraph
+    :param weight: Edge weight attribute, defaults to "weight"
+    :type weight: str, optional
+    :return: Minimum cost per tile hop
+    :rtype: float
+    """
+    if 'min_hop_cost' not in G.graph:
+        weight = weight_function(G, weight)
+        min_hop_cost = float('inf')
+        for u, v, d in G.edges(data=True):
+            if '/' not in u or '/' not in v:
+                continue
+
+            span = abs(nd.get_x_coord(u) - nd.get_x_coord(v)) + abs(nd.get_y_coord(u) - nd.get_y_coord(v))
+            if span:
+                min_hop_cost = min(min_hop_cost, weight(u, v, d) / span)
+
+        G.graph['min_hop_cost'] = 0 if min_hop_cost == float('inf') else min_hop_cost
+
+    return G.graph['min_hop_cost']
+
+def get_heuristic(G, target):
+    """This function creates the A* heuristic for the specified target
+
+    :param G: Graph
+    :type G: nx.DiGraph
+    :param target: Target node
+    :type target: str
+    :return: A function returning the lower bound of the cost from a node to the target
+    :rtype: Callable
+    """
+    target_nodes = [target] if '/' in target else list(G._pred[target])
+    min_hop_cost = get_min_hop_cost(G)
+    if not target_nodes or not min_hop_cost or any('/' not in node for node in target_nodes):
+        return lambda node: 0
+
+    # bounding box of the target coordinates
+    xs = [nd.get_x_coord(node) for node in target_nodes]
+    ys = [nd.get_y_coord(node) for node in target_nodes]
+    x_min, x_max, y_min, y_max = min(xs), max(xs), min(ys), max(ys)
+
+    def heuristic(node):
+        if '/' not in node:
+            return 0
+
+        x, y = nd.get_x_coord(node), nd.get_y_coord(node)
+        return min_hop_cost * (max(x_min - x, 0, x - x_max) + max(y_min - y, 0, y - y_max))
+
+    return heuristic
+
+def dijkstra_tree(G, source, weight="weight", reverse=False, blocked_nodes=set()):
+    """This function runs a single-source Dijkstra search and returns the shortest path tree.
+    With reverse=True the search follows the predecessors, i.e., it computes the shortest paths from all nodes to the source.
+
+    :param G: Graph
+    :type G: nx.DiGraph
+    :param source: Root of the tree
+    :type source: str
+    :param weight: Edge weight attribute or function, defaults to "weight"
+    :type weight: str|Callable, optional
+    :param reverse: Search on the reversed graph, defaults to False
+    :type reverse: bool, optional
+    :param blocked_nodes: Nodes excluded from the search, defaults to set()
+    :type blocked_nodes: NodeBitmap|Set[str], optional
+    :return: Distances, parents and number of hops of the settled nodes
+    :rtype: Tuple[dict, dict, dict]
+    """
+    if source not in G:
+        raise nx.NodeNotFound(f"Source {source} is not in G")
+
+    costs = get_edge_costs(G, weight)
+    weight = weight_function(G, weight)
+    blocked_ids, blocked_flags = get_flags(blocked_nodes)
+    neighs = G._pred if reverse else G._succ
+    dists, parents, hops = {}, {source: None}, {source: 0}
+    seen = {source: 0}
+    c = count()
+    fringe = [(0, next(c), source)]
+    while fringe:
+        (dist, _, v) = heappop(fringe)
+        if v in dists:
+            continue
+
+        dists[v] = dist
+        for w, d in neighs[v].items():
+            if blocked_flags[blocked_ids.get(w, 0)]:
+                continue
+
+            if costs is not None and 'id' in d:
+                cost = costs[d['id']]
+            else:
+                cost = weight(w, v, d) if reverse else weight(v, w, d)
+
+            if cost is None:
+                continue
+
+            vwLength = dist + cost
+            if w not in dists and (w not in seen or vwLength < seen[w]):
+                seen[w] = vwLength
+                parents[w] = v
+                hops[w] = hops[v] + 1
+                heappush(fringe, (vwLength, next(c), w))
+
+    return dists, parents, hops
+
+def get_reachable_nodes(G, sources, reverse=False):
+    """This function runs a multi-source breadth-first search and returns all reachable nodes.
+    With reverse=True the search follows the predecessors, i.e., it returns the nodes from which any of the sources is reachable.
+
+    :param G: Graph or graph view
+    :type G: nx.DiGraph
+    :param sources: Start nodes
+    :type sources: Iterable[str]
+    :param reverse: Search on the reversed graph, defaults to False
+    :type reverse: bool, optional
+    :return: Reachable nodes including the sources
+    :rtype: Set[str]
+    """
+    neighs = G._pred if reverse else G._succ
+    reachable = {source for source in sources if source in G}
+    queue = deque(reachable)
+    while queue:
+        v = queue.popleft()
+        for w in neighs[v]:
+            if w not in reachable:
+                reachable.add(w)
+                queue.append(w)
+
+    return reachable
+
 def weight_function(G, weight):
     """Returns a function that returns the weight of an edge.
 
@@ -130,8 +446,27 @@ def weight_function(G, weight):
     # the edge.
     if G.is_multigraph():
         return lambda u, v, d: min(attr.get(weight, 1) for attr in d.values())
+    costs = get_edge_costs(G, weight)
+    if costs is not None:
+        return lambda u, v, data: costs[data['id']] if 'id' in data else data.get(weight, 1)
     return lambda u, v, data: data.get(weight, 1)
 
+def get_edge_costs(G, weight):
+    """This function returns the edge weight array of the graph (see EdgeWeights) as a memoryview,
+    whose items are read as Python floats. Edges without an 'id' attribute keep their weight attribute.
+
+    :param G: Graph
+    :type G: nx.DiGraph
+    :param weight: Edge weight attribute or function
+    :type weight: str|Callable
+    :return: Edge weights indexed by edge ID or None if the weights are not stored in an array
+    :rtype: memoryview|None
+    """
+    if weight != 'weight' or 'weights' not in G.graph:
+        return None
+
+    return memoryview(G.graph['weights'].array)
+
 def extract_node_disjoint_paths(G, source_sink_pairs):
     # Create a directed copy of the original graph
     G_copy = G.copy()
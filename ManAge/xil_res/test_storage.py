@@ -1,10 +1,11 @@
-import time
+import os, time
 import re
 from pathlib import Path
 import networkx as nx
 from dataclasses import dataclass, field
 from itertools import product
 from typing import List, Set
+from collections import Counter
 from tqdm import tqdm
 from joblib import Parallel, delayed
 
@@ -12,8 +13,11 @@ from xil_res.architecture import Arch
 from xil_res.node import Node as nd
 from xil_res.minimal_config import MinConfig
 from xil_res.clock_domain import ClockDomain, ClockGroup
+from xil_res.edge_weights import EdgeWeights
+from xil_res.pip_order import get_order
 import utility.config as cfg
 import utility.utility_functions as util
+import utility.tc_index as tc_index
 
 @dataclass
 class TestCollection:
@@ -33,6 +37,12 @@ class TestCollection:
     pbar                :   tqdm            = field(default = None)
     n_pips              :   int             = field(default = 0)
     TC_idx              :   int             = field(default=0)
+    resume              :   bool            = field(default=False)
+    prev_config_file    :   Path            = field(default=None)
+    removed_pips        :   set             = field(default_factory = set)
+    empty_TC            :   bool            = field(default=False)
+    checkpoint_time     :   float           = field(default=0)
+    pip_failures        :   Counter         = field(default_factory = Counter)
 
     def __post_init__(self):
         if self.prev_config_dir is not None:
@@ -50,10 +60,16 @@ class TestCollection:
 
             self.max_capacity = cfg.max_capacity
             self.long_TC_process_time = cfg.long_TC_process_time
+            self.long_TC_process_work = cfg.long_TC_process_work
 
             self.TC_idx = len(config_files) - 1 # it is incremented in store_TC at the storing of the last config_file
 
-        util.create_folder(self.minimal_config_dir)
+        # the stored minimal configurations are kept when the search is resumed
+        if self.resume:
+            Path(self.minimal_config_dir).mkdir(parents=True, exist_ok=True)
+        else:
+            util.create_folder(self.minimal_config_dir)
+
         self.create_clock_domains()
         self.create_pbar()
         self.n_pips = len(self.queue)
@@ -61,8 +77,8 @@ class TestCollection:
     def __getstate__(self):
         state = self.__dict__.copy()  # Copy the dict to avoid modifying the original
         # Remove the attribute that should not be pickled
-        del state['pbar']
-        del state['device']
+        state.pop('pbar', None)
+        state.pop('device', None)
         #del state['TC']
         return state
 
@@ -122,8 +138,8 @@ class TestCollection:
         :return: A tuple including the specified config_file and the number of occupied CUTs at the current origin
         :rtype: Tuple
         """
-        TC = util.load_data(str(config_file.parent), config_file.name)
-        num_CUTs = len([cut for cut in TC.D_CUTs if cut.origin == self.origin])
+        index = tc_index.load_index(config_file.parent, config_file.name)
+        num_CUTs = index['origins'].get(self.origin, 0)
 
         return (config_file, num_CUTs)
 
@@ -149,6 +165,7 @@ class TestCollection:
             # Modify long_TC_process_time & max_capacity
             num_existing_CUTs = len([cut for cut in prev_TC.D_CUTs if cut.origin == self.origin])
             cfg.long_TC_process_time = self.long_TC_process_time - num_existing_CUTs * (cfg.long_TC_process_time / self.max_capacity)
+            cfg.long_TC_process_work = self.long_TC_process_work - num_existing_CUTs * (cfg.long_TC_process_work // self.max_capacity)
             cfg.max_capacity = self.max_capacity - num_existing_CUTs
 
             #Modify TC_idx
@@ -158,10 +175,13 @@ class TestCollection:
             if self.prev_config_dir:
                 cfg.max_capacity = self.max_capacity
                 cfg.long_TC_process_time = self.long_TC_process_time
+                cfg.long_TC_process_work = self.long_TC_process_work
 
+            prev_config_file = None
             prev_TC = None
             TC_idx = self.TC_idx
 
+        self.prev_config_file = prev_config_file
         self.TC = MinConfig(device, TC_idx, prev_TC)
         self.device = device
 
@@ -207,7 +227,7 @@ class TestCollection:
         :type G: nx.DiGraph
         """
         pip_v_nodes = {pip[1] for pip in self.queue}
-        edges = set(product({cfg.pip_v}, pip_v_nodes))
+        edges = sorted(product({cfg.pip_v}, pip_v_nodes))
         G.add_edges_from(edges, weight=0)
 
     def clean_pip_v_node(self, G: nx.DiGraph):
@@ -219,7 +239,60 @@ class TestCollection:
         pip_v_nodes = {pip[1] for pip in self.queue}
         excess_out_nodes = set(G.neighbors(cfg.pip_v)) - pip_v_nodes
         excess_out_node_edges = set(product({cfg.pip_v}, excess_out_nodes))
-        G.remove_edges_from(excess_out_node_edges)
+        G.remove_edges_from(sorted(excess_out_node_edges))
+
+    def clean_unreachable_pips(self, G: nx.DiGraph):
+        """This function removes the edge between the virtual node and the heads whose uncovered PIPs cannot be reached
+        from the virtual source node anymore, so that pick_pip does not try them
+
+        :param G: Architecture graph of the TC
+        :type G: OverlayGraph
+        """
+        if G.reachability is None:
+            return
+
+        heads = set(G.neighbors(cfg.pip_v))
+        pips = {pip for pip in self.queue if pip[1] in heads}
+        reachable_heads = {pip[1] for pip in pips - G.reachability.get_unreachable_pips(pips)}
+        G.remove_edges_from(sorted(product({cfg.pip_v}, heads - reachable_heads)))
+
+    def set_pip_priorities(self, G: nx.DiGraph):
+        """This function sets the weights of the edges between the virtual node and the head of uncovered PIPs according
+        to the configured PIP order (see pip_order.py)
+
+        :param G: Architecture graph
+        :type G: nx.DiGraph
+        """
+        weights = get_order().get_weights(self, self.TC) or {}
+        for head, data in G._succ[cfg.pip_v].items():
+            data['weight'] = weights.get(head, 0)
+
+    def record_failure(self, head: str):
+        """This function counts a failed CUT for the PIPs of the specified head
+
+        :param head: Head of the PIPs
+        :type head: str
+        """
+        self.pip_failures[head] += 1
+
+    def is_budget_spent(self, TC: MinConfig, coverage: float):
+        """This function determines if the budget of the minimal configuration is spent. The budget is the wall time or the
+        number of expanded nodes|path searches of the TC, which unlike the wall time does not depend on the load of the machine.
+        It is extended by a tenth for every 30% of the coverage.
+
+        :param TC: Minimal test configuration
+        :type TC: MinConfig
+        :param coverage: Ratio of the covered PIPs
+        :type coverage: float
+        :return: True|False
+        :rtype: bool
+        """
+        cond_time = time.time() - TC.start_TC_time > (cfg.long_TC_process_time + (cfg.long_TC_process_time // 10) * (coverage // 0.3))
+        if cfg.budget == 'time':
+            return cond_time
+
+        cond_work = TC.get_work()[cfg.budget] > (cfg.long_TC_process_work + (cfg.long_TC_process_work // 10) * (coverage // 0.3))
+        return cond_work or (cfg.wall_time_limit and cond_time)
 
     def finish_TC(self, TC: MinConfig):
         """This function determines if the the minimal configuration must be terminated or not
@@ -234,12 +307,17 @@ class TestCollection:
         source_node = {CD.src_sink_node for CD in self.clock_domains if CD.type == 'source'}.pop()
         sink_node = {CD.src_sink_node for CD in self.clock_domains if CD.type == 'sink'}.pop()
         cond_capacity = (cfg.max_capacity - len(TC.CUTs)) <= 0
-        cond_exec_time = time.time() - TC.start_TC_time > (cfg.long_TC_process_time + (cfg.long_TC_process_time // 10) * (coverage // 0.3))
+        cond_exec_time = self.is_budget_spent(TC, coverage)
         cond_empty_queue = not self.queue
-        try:
-            cond_path_existance = nx.has_path(TC.G, source_node, sink_node)
-        except nx.exception.NodeNotFound:
-            cond_path_existance = False
+        # pick_pip disconnects each tried PIP from pip_v, so no CUT can be created once all of them have been tried
+        cond_tried_pips = (cfg.pip_v not in TC.G) or (TC.G.out_degree(cfg.pip_v) == 0)
+        if TC.G.reachability is not None and TC.G.reachability.source == source_node:
+            cond_path_existance = TC.G.reachability.is_reachable(sink_node)
+        else:
+            try:
+                cond_path_existance = nx.has_path(TC.G, source_node, sink_node)
+            except nx.exception.NodeNotFound:
+                cond_path_existance = False
 
         if cond_capacity:
             self.pbar.set_postfix_str('Capacity is Full!')
@@ -247,6 +325,8 @@ class TestCollection:
             self.pbar.set_postfix_str('Long TC Process Time!')
         elif cond_empty_queue:
             self.pbar.set_postfix_str('Queue is empty!')
+        elif cond_tried_pips:
+            self.pbar.set_postfix_str('All PIPs are tried!')
         elif not cond_path_existance:
             self.pbar.set_postfix_str('No path between sourse and sink!')
         else:
@@ -259,6 +339,7 @@ class TestCollection:
         """
         cut = self.TC.CUTs[-1]
         prior_length = len(self.queue)
+        self.removed_pips.update(cut.get_covered_pips() & self.queue)
         self.queue -= cut.get_covered_pips()
         current_length = len(self.queue)
         self.pbar.set_description(f'TC{self.TC.TC_idx} >> CUT{len(self.TC.CUTs)} >> Remaining PIPs')
@@ -268,6 +349,92 @@ class TestCollection:
     def store_TC(self):
         """This function stores the created minimal test configuration
         """
-        util.store_data(self.minimal_config_dir, f'TC{self.TC.TC_idx}.data', self.TC)
+        tc_index.store_TC(self.minimal_config_dir, f'TC{self.TC.TC_idx}.data', self.TC)
         if not self.prev_config_files:
-            self.TC_idx += 1
\ No newline at end of file
+            self.TC_idx += 1
+
+    def store_checkpoint(self, finished=False, force=False):
+        """This function stores the progress of the search: the PIPs removed from the queue, the remaining configurations of
+        the previous iteration, the edge weights of the device, and the CUTs of the current TC. It is skipped if the last
+        checkpoint is more recent than the checkpoint interval.
+
+        :param finished: The current TC is stored or skipped, defaults to False
+        :type finished: bool, optional
+        :param force: Store regardless of the checkpoint interval, defaults to False
+        :type force: bool, optional
+        """
+        if not force and time.time() - self.checkpoint_time < cfg.checkpoint_interval:
+            return
+
+        checkpoint = {
+            'TC_idx'            : self.TC_idx,
+            'prev_config_files' : self.prev_config_files.copy(),
+            'removed_pips'      : self.removed_pips,
+            'empty_TC'          : self.empty_TC,
+            'pip_failures'      : self.pip_failures,
+            'weights'           : EdgeWeights.attach(self.device.G).get_state(),
+            'TC'                : None
+        }
+
+        if not finished:
+            TC = self.TC
+            if self.prev_config_file is not None:
+                checkpoint['prev_config_files'].insert(0, self.prev_config_file)
+
+            checkpoint['TC'] = {
+                'CUTs'      : TC.CUTs,
+                'heads'     : set(TC.G.successors(cfg.pip_v)) if cfg.pip_v in TC.G else set(),
+                'weights'   : EdgeWeights.attach(TC.G).get_state(),
+                'elapsed'   : time.time() - TC.start_TC_time,
+                'work'      : TC.get_work()
+            }
+
+        # the checkpoint is replaced at once, so that an interruption never leaves a partial checkpoint
+        util.store_data(self.minimal_config_dir, 'checkpoint.data.tmp', checkpoint)
+        os.replace(os.path.join(self.minimal_config_dir, 'checkpoint.data.tmp'), os.path.join(self.minimal_config_dir, 'checkpoint.data'))
+        self.checkpoint_time = time.time()
+
+    def load_checkpoint(self, device: Arch):
+        """This function restores the progress of the search from the last checkpoint. The CUTs of the interrupted TC
+        are filled again in the order they were created, while the queue and the costs are restored from the checkpoint.
+
+        :param device: Device under test
+        :type device: Arch
+        :return: True if an interrupted TC is restored to self.TC
+        :rtype: bool
+        """
+        if not os.path.exists(os.path.join(self.minimal_config_dir, 'checkpoint.data')):
+            return False
+
+        checkpoint = util.load_data(str(self.minimal_config_dir), 'checkpoint.data')
+        self.TC_idx = checkpoint['TC_idx']
+        self.prev_config_files = checkpoint['prev_config_files']
+        self.removed_pips = checkpoint['removed_pips']
+        self.empty_TC = checkpoint['empty_TC']
+        self.pip_failures = checkpoint['pip_failures']
+        self.checkpoint_time = time.time()
+
+        self.queue -= self.removed_pips
+        self.pbar.update(self.n_pips - len(self.queue))
+
+        if checkpoint['TC'] is not None:
+            self.create_TC(device)
+            TC = self.TC
+
+            # the PIPs covered by the CUTs were still in the queue when the TC was created, so their heads are assigned again
+            heads = {cut.main_path.pip[1] for cut in checkpoint['TC']['CUTs']}
+            TC.G.add_edges_from(sorted(product({cfg.pip_v}, heads)), weight=0)
+            for cut in checkpoint['TC']['CUTs']:
+                TC.commit_CUT(self, cut.main_path.pip[1], cut, update_search=False)
+
+            # PIPs tried without success are not picked again
+            heads = checkpoint['TC']['heads']
+            TC.G.remove_edges_from([(cfg.pip_v, node) for node in list(TC.G.successors(cfg.pip_v)) if node not in heads])
+            EdgeWeights.attach(TC.G).set_state(checkpoint['TC']['weights'])
+            TC.start_TC_time = time.time() - checkpoint['TC']['elapsed']
+            TC.start_TC_work = {key: value - checkpoint['TC']['work'][key] for key, value in TC.start_TC_work.items()}
+
+        # the costs increased by the CUTs and the failed searches of the interrupted TC are restored as well
+        EdgeWeights.attach(device.G).set_state(checkpoint['weights'])
+
+        return checkpoint['TC'] is not None
\ No newline at end of file
@@ -0,0 +1,70 @@
+from typing import Callable
+
+class UndoLog:
+    """
+    This class records the inverse of the mutations made to a TC while a CUT is filled, so that a failed CUT is rolled back
+    in time proportional to what it changed. Each entry is a function with its arguments, and the entries are applied in
+    reverse order on rollback.
+    """
+    __slots__ = ('entries', )
+    def __init__(self):
+        self.entries = []
+
+    def __repr__(self):
+        return f'UndoLog({len(self)} entries)'
+
+    def __len__(self):
+        return len(self.entries)
+
+    def record(self, func: Callable, *args):
+        """This function records a function call that undoes a mutation
+
+        :param func: Inverse function
+        :type func: Callable
+        """
+        self.entries.append((func, args))
+
+    def save(self, *objs):
+        """This function records the current attributes of the specified objects, so that they are restored on rollback
+
+        :param objs: Objects with __slots__ (e.g., primitives and clock groups)
+        """
+        for obj in objs:
+            self.record(self.set_state, obj, self.get_state(obj))
+
+    @staticmethod
+    def get_state(obj) -> dict:
+        # containers are copied, their items are saved separately if they are mutated in place
+        state = {}
+        for attr in obj.__slots__:
+            if hasattr(obj, attr):
+                value = getattr(obj, attr)
+                state[attr] = value.copy() if isinstance(value, (set, list, dict)) else value
+
+        if hasattr(obj, '__dict__'):
+            state.update(obj.__dict__)
+
+        return state
+
+    @staticmethod
+    def set_state(obj, state: dict):
+        for attr, value in state.items():
+            setattr(obj, attr, value)
+
+    def commit(self):
+        """This function keeps the recorded mutations
+        """
+        self.entries.clear()
+
+    def rollback(self) -> int:
+        """This function undoes the recorded mutations in reverse order
+
+        :return: Number of undone mutations
+        :rtype: int
+        """
+        n_entries = len(self.entries)
+        while self.entries:
+            func, args = self.entries.pop()
+            func(*args)
+
+        return n_entries